@@ -16,7 +16,24 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from composite_lib import Laminate
+from composite_lib import Laminate, sweep, reduce_sweep, Collect
+
+
+def rotation_sweep(material, base_layup, rotation_angles, ply_thickness):
+    """
+    A matrix components of a laminate rotated by each angle
+
+    Returns:
+    --------
+    dict : 'A11', 'A12', ..., 'A66' -> ndarray (n_rotations,)
+    """
+    # Rotated layups, one row per rotation, angles adjusted to (-180, 180]
+    rotated = np.add.outer(rotation_angles, base_layup) % 360
+    rotated = np.where(rotated <= 180, rotated, rotated - 360)
+
+    A = reduce_sweep(sweep({'layups': [rotated], 'materials': material,
+                            'thicknesses': ply_thickness}), Collect('A'))[0]['A']
+    return {f'A{p}{q}': A[:, i, j] for i, p in enumerate('126') for j, q in enumerate('126')}
 
 
 def solve_problem1():
@@ -45,10 +62,6 @@ def solve_problem1():
     # Rotation angles to test
     rotation_angles = np.linspace(0, 360, 73)  # Every 5 degrees
 
-    # Storage for results
-    results1 = {f'A{i}{j}': [] for i in [1,2,6] for j in [1,2,6]}
-    results2 = {f'A{i}{j}': [] for i in [1,2,6] for j in [1,2,6]}
-
     print("\nMaterial Properties:")
     print(f"  E1  = {material['E1']:.1f} GPa")
     print(f"  E2  = {material['E2']:.1f} GPa")
@@ -60,21 +73,8 @@ def solve_problem1():
     print("LAMINATE 1: [-45/0/45/90]")
     print("-"*70)
 
-    for rotation in rotation_angles:
-        # Rotate laminate 1
-        rotated_seq1 = [(angle + rotation) % 360 for angle in laminate1_base]
-        # Adjust angles to -180 to 180 range
-        rotated_seq1 = [angle if angle <= 180 else angle - 360 for angle in rotated_seq1]
-
-        lam1 = Laminate(material, rotated_seq1, ply_thickness)
-
-        # Store A matrix components
-        results1['A11'].append(lam1.A[0, 0])
-        results1['A22'].append(lam1.A[1, 1])
-        results1['A12'].append(lam1.A[0, 1])
-        results1['A66'].append(lam1.A[2, 2])
-        results1['A16'].append(lam1.A[0, 2])
-        results1['A26'].append(lam1.A[1, 2])
+    # A matrix of every rotated laminate in one vectorized sweep
+    results1 = rotation_sweep(material, laminate1_base, rotation_angles, ply_thickness)
 
     print(f"\nRotating from 0° to 360°...")
     print(f"At 0° rotation: {laminate1_base}")
@@ -103,20 +103,7 @@ def solve_problem1():
     print("LAMINATE 2: [0/30/60/90]")
     print("-"*70)
 
-    for rotation in rotation_angles:
-        # Rotate laminate 2
-        rotated_seq2 = [(angle + rotation) % 360 for angle in laminate2_base]
-        rotated_seq2 = [angle if angle <= 180 else angle - 360 for angle in rotated_seq2]
-
-        lam2 = Laminate(material, rotated_seq2, ply_thickness)
-
-        # Store A matrix components
-        results2['A11'].append(lam2.A[0, 0])
-        results2['A22'].append(lam2.A[1, 1])
-        results2['A12'].append(lam2.A[0, 1])
-        results2['A66'].append(lam2.A[2, 2])
-        results2['A16'].append(lam2.A[0, 2])
-        results2['A26'].append(lam2.A[1, 2])
+    results2 = rotation_sweep(material, laminate2_base, rotation_angles, ply_thickness)
 
     print(f"\nRotating from 0° to 360°...")
     print(f"At 0° rotation: {laminate2_base}")
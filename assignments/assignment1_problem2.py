@@ -171,13 +171,13 @@ def solve_problem2():
 
     # For symmetric laminates, we can calculate effective properties
     h = laminate.total_thickness
-    a_star = laminate.abd[:3, :3]  # Extract compliance matrix a*
+    constants = laminate.get_engineering_constants()  # From compliance a*
 
-    E_x = 1 / (h * a_star[0, 0])
-    E_y = 1 / (h * a_star[1, 1])
-    G_xy = 1 / (h * a_star[2, 2])
-    nu_xy = -a_star[0, 1] / a_star[0, 0]
-    nu_yx = -a_star[1, 0] / a_star[1, 1]
+    E_x = constants['E_x']
+    E_y = constants['E_y']
+    G_xy = constants['G_xy']
+    nu_xy = constants['nu_xy']
+    nu_yx = constants['nu_yx']
 
     print(f"\nEffective In-Plane Moduli:")
     print(f"  E_x  = {E_x:.3f} GPa")
@@ -21,7 +21,7 @@ import os
 from scipy.optimize import fsolve
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from composite_lib import Laminate
+from composite_lib import Laminate, sweep, reduce_sweep, Collect
 
 
 def solve_problem3():
@@ -115,24 +115,14 @@ def solve_problem3():
 
     theta_range = np.linspace(-90, 90, 181)
 
-    strains_x = []
-    strains_y = []
-    strains_xy = []
-    curv_x = []
-    curv_y = []
-    curv_xy = []
+    # [30/θ/θ/30]_s for every θ in one vectorized sweep
+    layups = [[30, theta, theta, 30, 30, theta, theta, 30] for theta in theta_range]
+    results = reduce_sweep(sweep({'layups': layups, 'materials': material,
+                                   'thicknesses': t, 'loads': loads}),
+                           Collect('strains', 'curvatures'))[0]
 
-    for theta in theta_range:
-        stacking = [30, theta, theta, 30, 30, theta, theta, 30]
-        lam = Laminate(material, stacking, t)
-        strains, curvatures = lam.calculate_strains_curvatures(loads)
-
-        strains_x.append(strains[0] * 1e6)  # Convert to microstrain
-        strains_y.append(strains[1] * 1e6)
-        strains_xy.append(strains[2] * 1e6)
-        curv_x.append(curvatures[0])
-        curv_y.append(curvatures[1])
-        curv_xy.append(curvatures[2])
+    strains_x, strains_y, strains_xy = results['strains'].T * 1e6  # Convert to microstrain
+    curv_x, curv_y, curv_xy = results['curvatures'].T
 
     # Create plots
     create_plots(theta_range, theta_solution,
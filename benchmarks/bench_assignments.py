@@ -0,0 +1,61 @@
+"""
+Assignment Benchmarks
+Problem 1 rotation sweeps and Problem 3 theta sweep and root solve
+"""
+
+import os
+import sys
+
+import numpy as np
+from scipy.optimize import fsolve
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from composite_lib import Laminate, sweep, reduce_sweep, Collect
+from assignments.assignment1_problem1 import rotation_sweep
+from harness import benchmark
+
+
+# Inputs of solve_problem1
+PROBLEM1_MATERIAL = {'E1': 142.0, 'E2': 10.3, 'G12': 7.2, 'nu12': 0.27}
+PROBLEM1_LAYUPS = {'qi': [-45, 0, 45, 90], 'pi3': [0, 30, 60, 90]}
+PROBLEM1_ROTATIONS = np.linspace(0, 360, 73)
+
+# Inputs of solve_problem3
+PROBLEM3_MATERIAL = {'E1': 76.0, 'E2': 5.50, 'G12': 2.30, 'nu12': 0.34}
+PROBLEM3_THICKNESS = 1.25
+PROBLEM3_LOADS = np.array([1000, 1000, 0, 0, 50, 50])
+PROBLEM3_THETAS = np.linspace(-90, 90, 181)
+
+
+def problem3_layup(theta):
+    return [30, theta, theta, 30, 30, theta, theta, 30]
+
+
+@benchmark('problem1.rotation_sweep', params=tuple(PROBLEM1_LAYUPS))
+def problem1_rotation_sweep(layup):
+    base = PROBLEM1_LAYUPS[layup]
+    return lambda: rotation_sweep(PROBLEM1_MATERIAL, base, PROBLEM1_ROTATIONS, 0.125)
+
+
+@benchmark('problem3.theta_sweep')
+def problem3_theta_sweep():
+    def run():
+        layups = [problem3_layup(theta) for theta in PROBLEM3_THETAS]
+        return reduce_sweep(sweep({'layups': layups, 'materials': PROBLEM3_MATERIAL,
+                                   'thicknesses': PROBLEM3_THICKNESS,
+                                   'loads': PROBLEM3_LOADS}),
+                            Collect('strains', 'curvatures'))[0]
+    return run
+
+
+@benchmark('problem3.root_solve')
+def problem3_root_solve():
+    """fsolve on gamma_xy0(theta), one Laminate per evaluation"""
+    def shear_strain(theta):
+        theta = float(np.ravel(theta)[0])
+        lam = Laminate(PROBLEM3_MATERIAL, problem3_layup(theta), PROBLEM3_THICKNESS)
+        return lam.calculate_strains_curvatures(PROBLEM3_LOADS)[0][2]
+
+    return lambda: fsolve(shear_strain, 0)[0]
@@ -0,0 +1,95 @@
+"""
+Core Benchmarks
+Lamina, Laminate and Micromechanics hot paths
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import Lamina, Laminate, Micromechanics
+from harness import benchmark
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+LOADS = np.array([100.0, 50.0, 10.0, 5.0, 2.0, 1.0])
+PLY_COUNTS = (4, 16, 64, 250, 1000, 2000)
+
+# Glass fiber / epoxy constituents (GPa) of the micromechanics sweeps
+FIBER = {'E_f': 72.0, 'nu_f': 0.22}
+MATRIX = {'E_m': 3.5, 'nu_m': 0.35}
+FIBER_FRACTIONS = np.linspace(0.3, 0.7, 401)
+
+
+def layup(n_plies, seed=0):
+    """Reproducible ply angles drawn from the 15-degree grid"""
+    rng = np.random.default_rng(seed)
+    return rng.choice(np.arange(-75, 91, 15), size=n_plies).astype(float).tolist()
+
+
+@benchmark('lamina.construct')
+def lamina_construct():
+    return lambda: Lamina(MATERIAL['E1'], MATERIAL['E2'], MATERIAL['G12'],
+                          MATERIAL['nu12'], 0.125, 30.0)
+
+
+@benchmark('lamina.construct_qbar')
+def lamina_construct_qbar():
+    """Construction plus the transformed stiffness every laminate needs"""
+    def run():
+        return Lamina(MATERIAL['E1'], MATERIAL['E2'], MATERIAL['G12'],
+                      MATERIAL['nu12'], 0.125, 30.0).Qbar
+    return run
+
+
+@benchmark('laminate.construct', params=PLY_COUNTS)
+def laminate_construct(n_plies):
+    angles = layup(n_plies)
+    return lambda: Laminate(MATERIAL, angles, 0.125)
+
+
+@benchmark('laminate.construct_code', params=(8, 64, 2000))
+def laminate_construct_code(n_plies):
+    """Laminate code with repeats, e.g. [0/±45/90]_Ns"""
+    code = f"[0/±45/90]_{max(1, n_plies // 8)}s"
+    return lambda: Laminate(MATERIAL, code, 0.125)
+
+
+@benchmark('laminate.strains_curvatures', params=(4, 64, 2000))
+def laminate_strains(n_plies):
+    lam = Laminate(MATERIAL, layup(n_plies), 0.125)
+    return lambda: lam.calculate_strains_curvatures(LOADS)
+
+
+@benchmark('laminate.ply_stresses', params=(4, 64, 2000))
+def laminate_ply_stresses(n_plies):
+    """Bottom and top stresses of every ply, one call each"""
+    lam = Laminate(MATERIAL, layup(n_plies), 0.125)
+    strains, curvatures = lam.calculate_strains_curvatures(LOADS)
+
+    def run():
+        for k in range(n_plies):
+            lam.calculate_ply_stresses(strains, curvatures, k, 'bottom')
+            lam.calculate_ply_stresses(strains, curvatures, k, 'top')
+    return run
+
+
+@benchmark('micromechanics.sweep_objects')
+def micromechanics_objects():
+    """One Micromechanics object per fiber volume fraction"""
+    def run():
+        return [Micromechanics(FIBER['E_f'], FIBER['nu_f'], MATRIX['E_m'], MATRIX['nu_m'],
+                               v).get_engineering_constants()
+                for v in FIBER_FRACTIONS]
+    return run
+
+
+@benchmark('micromechanics.sweep_array')
+def micromechanics_array():
+    """All fiber volume fractions at once (the formulas broadcast)"""
+    micro = Micromechanics(FIBER['E_f'], FIBER['nu_f'], MATRIX['E_m'], MATRIX['nu_m'],
+                           FIBER_FRACTIONS)
+    return micro.get_engineering_constants
@@ -0,0 +1,84 @@
+"""
+Precision Benchmark
+Memory, throughput and accuracy of float32 vs float64 batch storage
+
+Usage:
+    python benchmarks/bench_precision.py [--layups N] [--plies n]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import batch_abd, batch_abd_inverse, batch_solve_strains
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+ANGLES = np.arange(-75, 91, 15)
+LOADS = np.array([100.0, 50.0, 10.0, 5.0, 2.0, 1.0])
+
+
+def random_layups(n_layups, n_plies, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = rng.choice(ANGLES, size=(n_layups, n_plies)).astype(float)
+    thicknesses = np.full(angles.shape, 0.125)
+    return angles, thicknesses
+
+
+def run(angles, thicknesses, dtype):
+    """Full batch pipeline; returns outputs, wall time and peak traced memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    A, B, D = batch_abd(MATERIAL, angles, thicknesses, dtype=dtype)
+    abd, _ = batch_abd_inverse(A, B, D)
+    strains, curvatures = batch_solve_strains(A, B, D, LOADS)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (A, B, D, abd, strains, curvatures), elapsed, peak
+
+
+def relative_error(values, reference):
+    """Max error per layup, relative to the largest entry of that layup"""
+    values = np.asarray(values, dtype=np.float64)
+    axes = tuple(range(1, reference.ndim))
+    scale = np.abs(reference).max(axis=axes, keepdims=True)
+    return float((np.abs(values - reference) / scale).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--layups', type=int, default=200_000)
+    parser.add_argument('--plies', type=int, default=24)
+    args = parser.parse_args()
+
+    angles, thicknesses = random_layups(args.layups, args.plies)
+    names = ('A', 'B', 'D', 'abd', 'strains', 'curvatures')
+
+    results = {}
+    for dtype in (np.float64, np.float32):
+        results[dtype] = run(angles, thicknesses, dtype)
+
+    print("=" * 60)
+    print(f"PRECISION BENCHMARK: {args.layups} layups x {args.plies} plies")
+    print("=" * 60)
+    print(f"{'dtype':<10}{'time (s)':>12}{'layups/s':>14}{'stored (MB)':>14}{'peak (MB)':>12}")
+    for dtype, (outputs, elapsed, peak) in results.items():
+        stored = sum(out.nbytes for out in outputs) / 1e6
+        print(f"{np.dtype(dtype).name:<10}{elapsed:>12.3f}{args.layups / elapsed:>14.0f}"
+              f"{stored:>14.1f}{peak / 1e6:>12.1f}")
+
+    print("\nfloat32 max relative error per layup (vs float64):")
+    reference = results[np.float64][0]
+    for name, value, ref in zip(names, results[np.float32][0], reference):
+        print(f"  {name:<12}{relative_error(value, ref):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Visualizer Benchmarks
+Data-producing parts of each visualizer mode (no Streamlit page is run)
+
+Skipped when streamlit or plotly is not installed.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from visualization import composite_visualizer as viz
+    from visualization.precompute import evaluate_laminates
+except ImportError:    # streamlit/plotly missing
+    viz = None
+
+from composite_lib import Laminate
+from harness import benchmark
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+STACKING = "[0/±45/90]_s"
+PLY_THICKNESS = 0.125
+LOADS = {'Nx': 1000.0, 'Ny': 1000.0, 'Nxy': 0.0, 'Mx': 0.0, 'My': 0.0, 'Mxy': 0.0}
+
+# Layups pasted into the layup comparison mode
+LAYUP_TEXT = "\n".join(f"[0/{a}/-{a}/90]_{n}s" for a in range(5, 90, 5) for n in (1, 2, 4))
+
+
+def rotation_cases(sequence, rotations, wrap=False):
+    """Cases as SweepPrecomputer.rotation_sweep builds them"""
+    cases = []
+    for rot in rotations:
+        rotated = [a + rot for a in sequence]
+        if wrap:
+            rotated = [a % 360 for a in rotated]
+            rotated = [a if a <= 180 else a - 360 for a in rotated]
+        cases.append((MATERIAL, tuple(rotated), PLY_THICKNESS))
+    return cases
+
+
+if viz is not None:
+
+    @benchmark('visualizer.structure_3d', params=(8, 2000))
+    def structure_3d(n_plies):
+        lam = Laminate(MATERIAL, [0, 45, -45, 90] * (n_plies // 4), PLY_THICKNESS)
+        return lambda: viz.create_3d_laminate_plot(lam)
+
+    @benchmark('visualizer.stiffness_rotations')
+    def stiffness_rotations():
+        sequence = Laminate(MATERIAL, STACKING, PLY_THICKNESS).stacking_sequence
+        cases = rotation_cases(sequence, viz.STIFFNESS_ROTATIONS)
+        return lambda: evaluate_laminates(cases)
+
+    @benchmark('visualizer.polar', params=(360, 3600))
+    def polar(n_directions):
+        lam = Laminate(MATERIAL, STACKING, PLY_THICKNESS)
+        directions = np.linspace(0, 360, n_directions + 1)
+        return lambda: lam.get_engineering_constants_polar(directions)
+
+    @benchmark('visualizer.quasi_isotropic')
+    def quasi_isotropic():
+        cases = [case for sequence in viz.QUASI_ISO_CANDIDATES.values()
+                 for case in rotation_cases(sequence, viz.QUASI_ISO_ROTATIONS, wrap=True)]
+        return lambda: evaluate_laminates(cases)
+
+    @benchmark('visualizer.layup_comparison')
+    def layup_comparison():
+        """Parse and batch-evaluate pasted layups, then build the table"""
+        material_items = tuple(sorted(MATERIAL.items()))
+        evaluate = viz.evaluate_layup_batch.__wrapped__    # bypass the Streamlit cache
+
+        def run():
+            batch, _ = evaluate(material_items, LAYUP_TEXT, PLY_THICKNESS)
+            return batch.metrics()
+        return run
+
+    @benchmark('visualizer.ply_angle_variation')
+    def ply_angle_variation():
+        """100 laminates with one ply angle varied, as the parametric mode does"""
+        base = Laminate(MATERIAL, STACKING, PLY_THICKNESS).stacking_sequence
+
+        def run():
+            A = []
+            for angle in np.linspace(-90, 90, 100):
+                seq = base.copy()
+                seq[0] = angle
+                A.append(Laminate(MATERIAL, seq, PLY_THICKNESS).A)
+            return A
+        return run
+
+    @benchmark('visualizer.material_sweeps')
+    def material_sweeps():
+        cases = []
+        for prop, (values, _) in viz.MATERIAL_SWEEP_RANGES.items():
+            for value in values:
+                cases.append((dict(MATERIAL, **{prop: float(value)}), STACKING, PLY_THICKNESS))
+        return lambda: evaluate_laminates(cases)
+
+    @benchmark('visualizer.stress_field', params=(8, 2000))
+    def stress_field(n_plies):
+        """Decimated through-thickness stresses and the ply boundary trace"""
+        lam = Laminate(MATERIAL, [0, 45, -45, 90] * (n_plies // 4), PLY_THICKNESS)
+        strains, curvatures = lam.calculate_strains_curvatures(LOADS)
+
+        def run():
+            z, stress_global, _ = viz.decimated_stress_field(lam, strains, curvatures)
+            return viz.create_ply_boundary_trace(lam.z_coords, stress_global)
+        return run
@@ -0,0 +1,252 @@
+"""
+Benchmark Harness
+Timing, peak-memory measurement and machine-tagged JSON results
+
+Benchmarks register with @benchmark; run_benchmarks.py runs them, stores
+the results under benchmarks/results/<machine>/ and compares them with
+the previous run on the same machine.
+"""
+
+import json
+import os
+import platform
+import re
+import socket
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+
+# Minimum seconds per timing sample (calls are batched up to this)
+MIN_SAMPLE_TIME = 0.2
+
+# Timing samples per benchmark
+REPEAT = 5
+
+# Slowdown (current / previous median) reported as a regression
+REGRESSION_RATIO = 1.25
+
+# Registered benchmarks: (name, params, setup)
+_REGISTRY = []
+
+
+def benchmark(name, params=(None,)):
+    """
+    Register a benchmark
+
+    The decorated setup function is called once per parameter value and
+    returns the zero-argument callable that is timed, so data preparation
+    is excluded from the timings.
+
+    Example:
+    --------
+    >>> @benchmark('laminate.construct', params=(4, 64, 2000))
+    ... def construct(n_plies):
+    ...     angles = layup(n_plies)
+    ...     return lambda: Laminate(MATERIAL, angles, 0.125)
+    """
+    def register(setup):
+        _REGISTRY.append((name, tuple(params), setup))
+        return setup
+    return register
+
+
+def registered(pattern=None):
+    """(name, params, setup) of the registered benchmarks matching a regex"""
+    return [entry for entry in _REGISTRY
+            if pattern is None or re.search(pattern, entry[0])]
+
+
+def measure(func, repeat=REPEAT, min_sample_time=MIN_SAMPLE_TIME):
+    """
+    Time a callable and trace its peak memory
+
+    Calls are batched so that each of the `repeat` samples lasts at least
+    min_sample_time; the peak of traced (Python and numpy) allocations is
+    taken from one extra, untimed call.
+
+    Returns:
+    --------
+    stats : dict
+        'median', 'min', 'mean', 'stdev' (seconds per call), 'number'
+        (calls per sample), 'repeat' and 'peak_memory' (bytes)
+    """
+    func()    # warm-up (imports, caches)
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_sample_time or number >= 10**6:
+            break
+        number *= 10 if elapsed < min_sample_time / 10 else 2
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'median': statistics.median(samples), 'min': min(samples),
+            'mean': statistics.fmean(samples),
+            'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'number': number, 'repeat': repeat, 'peak_memory': peak}
+
+
+def run(pattern=None, repeat=REPEAT, min_sample_time=MIN_SAMPLE_TIME, report=print):
+    """
+    Run the registered benchmarks matching pattern
+
+    Returns:
+    --------
+    results : list of dict
+        'name', 'param' and the measure() statistics, or 'error'
+    """
+    results = []
+    for name, params, setup in registered(pattern):
+        for param in params:
+            entry = {'name': name, 'param': param}
+            try:
+                entry.update(measure(setup() if param is None else setup(param),
+                                     repeat, min_sample_time))
+            except Exception as e:
+                entry['error'] = f"{type(e).__name__}: {e}"
+            results.append(entry)
+            if report is not None:
+                report(format_result(entry))
+    return results
+
+
+def format_result(entry):
+    label = entry['name'] if entry['param'] is None else f"{entry['name']}[{entry['param']}]"
+    if 'error' in entry:
+        return f"{label:<48}ERROR {entry['error']}"
+    return (f"{label:<48}{_format_time(entry['median']):>12}"
+            f"{'±' + _format_time(entry['stdev']):>12}"
+            f"{entry['peak_memory'] / 1e6:>11.2f} MB")
+
+
+def _format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+# ----------------------------------------------------------------------
+# Machine tags and result files
+# ----------------------------------------------------------------------
+
+def machine_info():
+    """Host, hardware, interpreter and library versions, and git revision"""
+    import scipy
+
+    def git(*args):
+        try:
+            return subprocess.run(('git',) + args, cwd=REPO_DIR, capture_output=True,
+                                  text=True, timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        'host': socket.gethostname(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpu_count': os.cpu_count(),
+        'system': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def machine_tag(info):
+    """Directory name grouping the results of one machine"""
+    tag = f"{info['host']}-{info['machine']}-{info['cpu_count']}cpu"
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', tag)
+
+
+def save(results, info, results_dir=RESULTS_DIR):
+    """
+    Write a result file; returns its path
+
+    Files are named <UTC timestamp>_<commit>.json under the machine tag,
+    so they sort by run time.
+    """
+    directory = os.path.join(results_dir, machine_tag(info))
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc)
+    path = os.path.join(directory, f"{stamp:%Y%m%dT%H%M%SZ}_{info['commit'] or 'nogit'}.json")
+    with open(path, 'w') as f:
+        json.dump({'timestamp': stamp.isoformat(), 'machine': info, 'results': results},
+                  f, indent=1)
+    return path
+
+
+def latest(info, exclude=None, results_dir=RESULTS_DIR):
+    """Most recent result file of this machine (other than exclude), or None"""
+    directory = os.path.join(results_dir, machine_tag(info))
+    if not os.path.isdir(directory):
+        return None
+    paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                   if name.endswith('.json'))
+    paths = [p for p in paths if exclude is None or os.path.abspath(p) != os.path.abspath(exclude)]
+    return paths[-1] if paths else None
+
+
+def compare(results, previous_path, threshold=REGRESSION_RATIO, report=print):
+    """
+    Compare medians with a previous result file
+
+    Returns:
+    --------
+    regressions : list of (label, ratio)
+        Benchmarks slower than threshold times their previous median
+    """
+    with open(previous_path) as f:
+        previous = json.load(f)
+    before = {(r['name'], _param_key(r['param'])): r for r in previous['results']
+              if 'error' not in r}
+
+    report(f"\nCompared with {os.path.basename(previous_path)} "
+           f"(commit {previous['machine'].get('commit')})")
+    report(f"{'benchmark':<48}{'time':>10}{'memory':>10}")
+    regressions = []
+    for entry in results:
+        old = before.get((entry['name'], _param_key(entry['param'])))
+        if old is None or 'error' in entry:
+            continue
+        ratio = entry['median'] / old['median']
+        memory = entry['peak_memory'] / old['peak_memory'] if old['peak_memory'] else 1.0
+        label = entry['name'] if entry['param'] is None else f"{entry['name']}[{entry['param']}]"
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append((label, ratio))
+        elif ratio < 1 / threshold:
+            flag = '  faster'
+        report(f"{label:<48}{ratio:>9.2f}x{memory:>9.2f}x{flag}")
+    return regressions
+
+
+def _param_key(param):
+    return json.dumps(param)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite, store machine-tagged results and compare them
+with the previous run on this machine
+Usage: python benchmarks/run_benchmarks.py [--filter REGEX] [--quick]
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+import harness
+import bench_core          # noqa: F401 (registers benchmarks)
+import bench_assignments   # noqa: F401
+import bench_visualizer    # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory benchmarks of composite_lib")
+    parser.add_argument('--filter', help="Only run benchmarks whose name matches this regex")
+    parser.add_argument('--list', action='store_true', help="List benchmarks and exit")
+    parser.add_argument('--quick', action='store_true',
+                        help="Fewer, shorter samples (smoke test; noisier timings)")
+    parser.add_argument('--repeat', type=int, default=harness.REPEAT,
+                        help="Timing samples per benchmark")
+    parser.add_argument('--no-save', action='store_true', help="Do not write a result file")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="Result file to compare with (default: previous run on this machine)")
+    parser.add_argument('--threshold', type=float, default=harness.REGRESSION_RATIO,
+                        help="Median slowdown ratio reported as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit with status 1 if any benchmark regressed")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, params, _ in harness.registered(args.filter):
+            print(name if params == (None,) else f"{name} {list(params)}")
+        return
+
+    info = harness.machine_info()
+    print(f"Machine: {harness.machine_tag(info)} (Python {info['python']}, "
+          f"numpy {info['numpy']}, commit {info['commit']}{' dirty' if info['dirty'] else ''})")
+    print(f"{'benchmark':<48}{'median':>12}{'stdev':>12}{'peak mem':>14}")
+
+    repeat, min_sample_time = args.repeat, harness.MIN_SAMPLE_TIME
+    if args.quick:
+        repeat, min_sample_time = min(repeat, 2), 0.02
+    results = harness.run(args.filter, repeat, min_sample_time)
+
+    path = None
+    if not args.no_save:
+        path = harness.save(results, info)
+        print(f"\nSaved {os.path.relpath(path)}")
+
+    previous = args.compare or harness.latest(info, exclude=path)
+    regressions = []
+    if previous is not None:
+        regressions = harness.compare(results, previous, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x")
+
+    if any('error' in r for r in results) or (args.fail_on_regression and regressions):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
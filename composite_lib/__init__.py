@@ -5,7 +5,40 @@ Classical Laminated Plate Theory (CLPT) Implementation
 
 from .micromechanics import Micromechanics
 from .lamina import Lamina
+from .stacking import (StackingBlocks, parse_layup, compile_layup,
+                       parse_layups, load_layup_file)
 from .laminate import Laminate
+from .batch import (LayupBatch, batch_abd, abd_from_qbar, batch_is_symmetric,
+                    batch_is_balanced)
+from .compliance import batch_abd_inverse, batch_solve_strains
+from .enumeration import LayupEnumerator, enumerate_layups
+from .angle_table import AngleTable
+from .lamination import (lamination_parameters, abd_from_lamination_parameters,
+                         lamination_parameters_from_abd, material_invariants)
+from .catalog import LayupCatalog
+from .layup_search import LaminationIndex, lamination_target
+from .results import SweepResults, sweep_schema
+from .sweeps import (sweep, reduce_sweep, Collect, Extrema, Moments, Histogram,
+                     ParetoFront)
+from .parallel import parallel_sweep
+from .distributed import SweepCoordinator, run_worker, start_local_workers
+from .service import LaminateService, run_service
+from .failure import max_stress_index, tsai_wu_index
+from .batch_files import run_batch_job
+from .checkpoint import Checkpoint, resumable_sweep, monte_carlo
 
 __version__ = "1.0.0"
-__all__ = ['Micromechanics', 'Lamina', 'Laminate']
+__all__ = ['Micromechanics', 'Lamina', 'Laminate', 'StackingBlocks',
+           'LayupBatch', 'batch_abd', 'abd_from_qbar', 'batch_is_symmetric',
+           'batch_is_balanced',
+           'batch_abd_inverse', 'batch_solve_strains',
+           'LayupEnumerator', 'enumerate_layups', 'AngleTable', 'LayupCatalog',
+           'lamination_parameters', 'abd_from_lamination_parameters',
+           'lamination_parameters_from_abd', 'material_invariants',
+           'LaminationIndex', 'lamination_target', 'SweepResults', 'sweep_schema',
+           'sweep', 'reduce_sweep', 'Collect', 'Extrema', 'Moments', 'Histogram',
+           'ParetoFront',
+           'parallel_sweep', 'SweepCoordinator', 'run_worker', 'start_local_workers',
+           'LaminateService', 'run_service', 'max_stress_index', 'tsai_wu_index',
+           'run_batch_job', 'Checkpoint', 'resumable_sweep', 'monte_carlo',
+           'parse_layup', 'compile_layup', 'parse_layups', 'load_layup_file']
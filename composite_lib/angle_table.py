@@ -0,0 +1,138 @@
+"""
+Angle Table Module
+Precomputed ply matrices for a material over a discrete angle set
+"""
+
+import numpy as np
+from .lamina import qbar_stack
+from .laminate import Laminate
+from .batch import ANGLE_TOL, batch_z_coordinates
+from .compliance import row_chunks
+
+
+class AngleTable:
+    """
+    Q-bar and stress transformation matrices of one material, tabulated
+    once for every admissible ply angle
+
+    Layups are encoded as integer index arrays into the table, so that
+    evaluating a layup needs no trigonometry: Q-bar and T are gathered and
+    ABD is a weighted sum over the distinct angles.
+
+    Example:
+    --------
+    >>> table = AngleTable(material, np.arange(-75, 91, 15))
+    >>> idx = table.encode([[0, 45, -45, 90, 90, -45, 45, 0]])
+    >>> A, B, D = table.abd(idx, 0.125)
+    """
+
+    def __init__(self, material_props, angles):
+        """
+        Tabulate the material over an angle set
+
+        Parameters:
+        -----------
+        material_props : dict
+            Dictionary with E1, E2, G12, nu12
+        angles : array_like
+            Admissible ply angles (degrees); duplicates are dropped
+        """
+        self.material_props = material_props
+        self.angles = np.unique(np.asarray(angles, dtype=float))
+        self.Qbar = qbar_stack(material_props, self.angles)
+        self.T = Laminate._stress_transformation_matrices(self.angles)
+
+        # Table rows as flat 9-vectors for the weighted sums in abd()
+        self._Qbar_flat = self.Qbar.reshape(len(self.angles), 9)
+
+    def __len__(self):
+        return len(self.angles)
+
+    def __repr__(self):
+        return f"AngleTable({len(self)} angles: {self.angles.tolist()})"
+
+    def encode(self, angles, atol=ANGLE_TOL):
+        """
+        Convert ply angles into table indices
+
+        Parameters:
+        -----------
+        angles : array_like
+            Ply angles (degrees), any shape
+        atol : float
+            Allowed distance (degrees) to the nearest tabulated angle
+
+        Returns:
+        --------
+        indices : ndarray of int16, same shape as angles
+        """
+        angles = np.asarray(angles, dtype=float)
+
+        # Nearest tabulated angle: the insertion point or its left neighbour
+        pos = np.clip(np.searchsorted(self.angles, angles), 1, max(len(self) - 1, 1))
+        left = np.maximum(pos - 1, 0)
+        pos = np.where(np.abs(angles - self.angles[left])
+                       <= np.abs(angles - self.angles[np.minimum(pos, len(self) - 1)]),
+                       left, pos)
+
+        error = np.abs(self.angles[pos] - angles)
+        if np.any(error > atol):
+            raise ValueError(f"Angles not in table: {np.unique(angles[error > atol]).tolist()}")
+        return pos.astype(np.int16)
+
+    def decode(self, indices):
+        """Table indices -> ply angles (degrees)"""
+        return self.angles[indices]
+
+    def qbar(self, indices):
+        """Gathered Q-bar matrices, shape indices.shape + (3, 3)"""
+        return self.Qbar[indices]
+
+    def stress_transformation(self, indices):
+        """Gathered global-to-material stress transformations T(θ)"""
+        return self.T[indices]
+
+    def abd(self, indices, thicknesses, dtype=np.float64):
+        """
+        A, B, D matrices of a batch of index-encoded layups
+
+        The z-integrals of every ply are summed per table angle first, so the
+        matrix work is one (N, K) x (K, 9) product per matrix regardless of
+        the number of plies. Sums run in float64; results are stored in dtype.
+
+        Parameters:
+        -----------
+        indices : ndarray (N, n) of int
+            Table indices of the plies
+        thicknesses : float or ndarray (N, n)
+            Ply thicknesses (mm)
+        dtype : dtype
+            Storage dtype of A, B, D
+
+        Returns:
+        --------
+        A, B, D : ndarray (N, 3, 3)
+        """
+        indices = np.atleast_2d(indices)
+        N, n = indices.shape
+        K = len(self.angles)
+        thicknesses = np.broadcast_to(np.asarray(thicknesses), (N, n))
+        A, B, D = (np.empty((N, 3, 3), dtype=dtype) for _ in range(3))
+
+        for rows in row_chunks(N):
+            z = batch_z_coordinates(np.asarray(thicknesses[rows], dtype=np.float64))
+            z_k, z_k1 = z[:, :-1], z[:, 1:]
+            m = len(z)
+
+            # Flat (layup, angle) bins of the per-ply weights
+            bins = (np.arange(m)[:, None] * K + indices[rows]).ravel()
+
+            def weighted_sum(weights):
+                per_angle = np.bincount(bins, weights=weights.ravel(), minlength=m * K)
+                return (per_angle.reshape(m, K) @ self._Qbar_flat).reshape(m, 3, 3)
+
+            A[rows] = weighted_sum(z_k1 - z_k)
+            B[rows] = 0.5 * weighted_sum(z_k1**2 - z_k**2)
+            D[rows] = (1/3) * weighted_sum(z_k1**3 - z_k**3)
+
+        return A, B, D
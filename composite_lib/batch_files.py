@@ -0,0 +1,411 @@
+"""
+Batch Files Module
+Streaming evaluation of layup, material and load-case files
+"""
+
+import csv
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .failure import STRENGTH_KEYS, max_stress_index, tsai_wu_index
+from .sweeps import MATERIAL_KEYS, SWEEP_CHUNK_ROWS, _Study, _layup_groups
+
+
+# Output formats by file extension
+OUTPUT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+# Load components of a load-case record (missing components are zero)
+LOAD_KEYS = ('Nx', 'Ny', 'Nxy', 'Mx', 'My', 'Mxy')
+
+# Tasks submitted per worker ahead of the one being written; bounds memory
+TASKS_IN_FLIGHT = 2
+
+# Unique entries of the symmetric 3x3 stiffness matrices, as output columns
+_MATRIX_ENTRIES = ((0, 0, '11'), (0, 1, '12'), (0, 2, '16'),
+                   (1, 1, '22'), (1, 2, '26'), (2, 2, '66'))
+
+_STRAIN_COLUMNS = ('eps_x0', 'eps_y0', 'gamma_xy0', 'kappa_x', 'kappa_y', 'kappa_xy')
+_STRESS_COLUMNS = ('sigma1_max', 'sigma1_min', 'sigma2_max', 'sigma2_min', 'tau12_max')
+_FAILURE_COLUMNS = ('max_stress_index', 'tsai_wu_index', 'critical_ply')
+
+# Per-process state set by _init_worker
+_worker = {}
+
+
+def read_records(path):
+    """
+    Stream the records of a CSV, JSONL or plain-text file
+
+    CSV files need a header row; JSONL files hold one object per line.
+    In plain-text files every line is one laminate code ('layup'). Blank
+    lines and lines starting with '#' are skipped in JSONL and text files.
+
+    Yields:
+    -------
+    record : dict
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8', newline='') as f:
+        if ext == '.csv':
+            for record in csv.DictReader(f, skipinitialspace=True):
+                yield {key.strip(): value for key, value in record.items()
+                       if key is not None and value not in (None, '')}
+            return
+
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if ext == '.jsonl':
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e.msg})") from None
+            else:
+                yield {'layup': line}
+
+
+def read_materials(path):
+    """
+    Material table of a batch job
+
+    Every record needs E1, E2, G12 and nu12 and may name the material
+    ('name') and give all lamina strengths (Xt, Xc, Yt, Yc, S) for the
+    failure indices. Strengths use the units of the moduli (GPa for
+    E1 = 140), since ply stresses come out in those units.
+
+    Returns:
+    --------
+    materials : list of dict
+    """
+    materials = []
+    for i, record in enumerate(read_records(path)):
+        try:
+            material = {key: float(record[key]) for key in MATERIAL_KEYS}
+        except KeyError as e:
+            raise ValueError(f"{path}: material {i} is missing {e}") from None
+        given = [key for key in STRENGTH_KEYS if key in record]
+        if given:
+            if len(given) < len(STRENGTH_KEYS):
+                raise ValueError(f"{path}: material {i} needs all of "
+                                 f"{', '.join(STRENGTH_KEYS)} or none")
+            material.update({key: float(record[key]) for key in STRENGTH_KEYS})
+        material['name'] = str(record.get('name', f"material{i}"))
+        materials.append(material)
+    if not materials:
+        raise ValueError(f"{path}: no materials")
+    return materials
+
+
+def read_load_cases(path):
+    """
+    Load cases of a batch job ('name' and any of Nx, Ny, Nxy, Mx, My, Mxy)
+
+    Returns:
+    --------
+    names : list of str
+    loads : ndarray (P, 6)
+    """
+    names, loads = [], []
+    for i, record in enumerate(read_records(path)):
+        names.append(str(record.get('name', f"load{i}")))
+        loads.append([float(record.get(key, 0.0)) for key in LOAD_KEYS])
+    if not loads:
+        raise ValueError(f"{path}: no load cases")
+    return names, np.array(loads)
+
+
+def _layup_items(records):
+    """(name, code, layup) of layup records; codes are strings for output"""
+    for i, record in enumerate(records):
+        layup = record.get('layup')
+        if layup is None:
+            raise ValueError(f"Layup record {i} has no 'layup'")
+        if isinstance(layup, str):
+            code = layup
+        elif isinstance(layup, list):
+            try:
+                layup = [float(angle) for angle in layup]
+            except (TypeError, ValueError):
+                raise ValueError(f"Layup record {i}: angles must be numbers") from None
+            code = '[' + '/'.join(f"{angle:g}" for angle in layup) + ']'
+        else:
+            raise ValueError(f"Layup record {i}: 'layup' must be a laminate code or "
+                             f"a list of angles, not {type(layup).__name__}")
+        yield str(record.get('name', i)), code, layup
+
+
+def run_batch_job(layups, materials, output, loads=None, ply_thickness=(0.125,),
+                  processes=None, format=None, chunk_size=SWEEP_CHUNK_ROWS):
+    """
+    Evaluate every layup of a file against materials, ply thicknesses and
+    load cases, writing one result row per combination as it goes
+
+    The layup file is read lazily in groups of about chunk_size result
+    rows; groups are evaluated by a process pool (A, B, D, mid-plane
+    strains, ply stresses and failure indices) and encoded there, so the
+    main process only appends the encoded rows, in file order.
+    At most TASKS_IN_FLIGHT groups per worker are pending, so memory is
+    independent of the file sizes. Materials and load cases are small
+    tables and are read up front.
+
+    Parameters:
+    -----------
+    layups : str
+        Layup file (.csv / .jsonl with a 'layup' and optional 'name'
+        column, or one laminate code per line)
+    materials : str
+        Material file (see read_materials)
+    output : str
+        Result file (.csv, .jsonl or .parquet)
+    loads : str, optional
+        Load-case file (see read_load_cases); without it only stiffness
+        columns are written
+    ply_thickness : iterable of float
+        Ply thicknesses (mm) for codes without '@t' overrides
+    processes : int, optional
+        Worker processes (default: all CPUs); 1 runs in this process
+    format : str, optional
+        'csv', 'jsonl' or 'parquet' (default: from the output extension)
+    chunk_size : int
+        Target result rows per task
+
+    Returns:
+    --------
+    stats : dict
+        'layups', 'rows', 'seconds', 'layups_per_second', 'rows_per_second'
+    """
+    start = time.perf_counter()
+    material_table = read_materials(materials)
+    load_names, load_values = (None, None) if loads is None else read_load_cases(loads)
+    thicknesses = np.atleast_1d(np.asarray(ply_thickness, dtype=float))
+
+    study = _Study.from_spec({'materials': material_table, 'thicknesses': thicknesses,
+                              'loads': load_values},
+                             () if loads is None else ('material_stresses',))
+    labels = {'material': [m['name'] for m in material_table],
+              'ply_thickness': thicknesses.tolist(), 'load_case': load_names}
+    format = format or OUTPUT_FORMATS.get(os.path.splitext(output)[1].lower())
+    job = _Job(study, labels, format)
+
+    groups = _layup_groups(_layup_items(read_records(layups)),
+                           max(1, chunk_size // study.rows_per_layup))
+    processes = processes or os.cpu_count() or 1
+    n_layups = n_rows = 0
+
+    writer = _writer(output, format, job.columns)
+    try:
+        for n, encoded in _evaluate_groups(job, groups, processes):
+            n_layups += n
+            n_rows += n * study.rows_per_layup
+            writer.write(encoded)
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - start
+    return {'layups': n_layups, 'rows': n_rows, 'seconds': seconds,
+            'layups_per_second': n_layups / seconds if seconds else float('inf'),
+            'rows_per_second': n_rows / seconds if seconds else float('inf')}
+
+
+class _Job:
+    """Study, output labels and format of a batch job; evaluates layup groups"""
+
+    def __init__(self, study, labels, format):
+        if format not in _ENCODERS:
+            raise ValueError(f"Unknown output format {format!r} "
+                             f"(use one of {', '.join(_ENCODERS)})")
+        self.study = study
+        self.labels = labels
+        self.format = format
+        self.has_strengths = any(STRENGTH_KEYS[0] in m for m in study.materials)
+
+        columns = ['layup_id', 'layup_name', 'layup', 'material', 'ply_thickness']
+        if study.loads is not None:
+            columns.append('load_case')
+        columns += ['n_plies', 'thickness']
+        columns += [f"{M}{suffix}" for M in 'ABD' for _, _, suffix in _MATRIX_ENTRIES]
+        if study.loads is not None:
+            columns += _STRAIN_COLUMNS + _STRESS_COLUMNS
+            if self.has_strengths:
+                columns += _FAILURE_COLUMNS
+        self.columns = columns
+
+    def run(self, items, first_layup):
+        """Encoded result rows of one group of (name, code, layup) items"""
+        chunk = self.evaluate([layup for _, _, layup in items], first_layup)
+        layup = chunk['layup_id'] - first_layup
+        chunk['layup_name'] = [items[i][0] for i in layup]
+        chunk['layup'] = [items[i][1] for i in layup]
+        for name, values in self.labels.items():
+            if values is not None:
+                chunk[name] = [values[i] for i in chunk[name]]
+        return _ENCODERS[self.format](self.columns,
+                                      [_as_list(chunk[name]) for name in self.columns])
+
+    def evaluate(self, layups, first_layup):
+        """Result columns (1-D arrays) of one layup group"""
+        study = self.study
+        chunk = study.evaluate(layups, first_layup, first_layup * study.rows_per_layup)
+        n_plies = chunk['n_plies']
+        columns = {'layup_id': chunk['layup'], 'material': chunk['material_index'],
+                   'ply_thickness': chunk['thickness_index'],
+                   'n_plies': n_plies, 'thickness': chunk['thicknesses'].sum(axis=1)}
+        for M in 'ABD':
+            for i, j, suffix in _MATRIX_ENTRIES:
+                columns[f"{M}{suffix}"] = chunk[M][:, i, j]
+
+        if study.loads is None:
+            return columns
+        columns['load_case'] = chunk['load_index']
+        for k, name in enumerate(_STRAIN_COLUMNS):
+            columns[name] = (chunk['strains'] if k < 3 else chunk['curvatures'])[:, k % 3]
+
+        # Padding plies are excluded from the extremes
+        stresses = chunk['material_stresses']
+        valid = (np.arange(stresses.shape[1]) < n_plies[:, None])[:, :, None]
+        s = np.where(valid[..., None], stresses, np.nan)
+        columns['sigma1_max'], columns['sigma1_min'] = (np.nanmax(s[..., 0], axis=(1, 2)),
+                                                        np.nanmin(s[..., 0], axis=(1, 2)))
+        columns['sigma2_max'], columns['sigma2_min'] = (np.nanmax(s[..., 1], axis=(1, 2)),
+                                                        np.nanmin(s[..., 1], axis=(1, 2)))
+        columns['tau12_max'] = np.nanmax(np.abs(s[..., 2]), axis=(1, 2))
+
+        if self.has_strengths:
+            n = len(n_plies)
+            max_stress, tsai_wu = np.full(n, np.nan), np.full(n, np.nan)
+            critical = np.full(n, -1)
+            for m, material in enumerate(study.materials):
+                rows = chunk['material_index'] == m
+                if STRENGTH_KEYS[0] not in material or not rows.any():
+                    continue
+                ms = max_stress_index(stresses[rows], material)
+                tw = np.where(valid[rows], tsai_wu_index(stresses[rows], material), -np.inf)
+                max_stress[rows] = np.where(valid[rows], ms, 0.0).max(axis=(1, 2))
+                tsai_wu[rows] = tw.max(axis=(1, 2))
+                critical[rows] = tw.max(axis=2).argmax(axis=1)
+            columns['max_stress_index'] = max_stress
+            columns['tsai_wu_index'] = tsai_wu
+            columns['critical_ply'] = [k if k >= 0 else None for k in critical.tolist()]
+        return columns
+
+
+def _evaluate_groups(job, groups, processes):
+    """Yield (layup count, encoded rows) per group, in file order"""
+    tasks = _tasks(groups)
+    if processes == 1:
+        for items, first_layup in tasks:
+            yield len(items), job.run(items, first_layup)
+        return
+
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(job,)) as pool:
+        pending = deque()
+        for items, first_layup in tasks:
+            pending.append((len(items), pool.submit(_run_task, items, first_layup)))
+            if len(pending) > TASKS_IN_FLIGHT * processes:
+                n, future = pending.popleft()
+                yield n, future.result()
+        while pending:
+            n, future = pending.popleft()
+            yield n, future.result()
+
+
+def _tasks(groups):
+    """(items, first layup) of every layup group"""
+    first_layup = 0
+    for items in groups:
+        yield items, first_layup
+        first_layup += len(items)
+
+
+def _init_worker(job):
+    _worker['job'] = job
+
+
+def _run_task(items, first_layup):
+    return _worker['job'].run(items, first_layup)
+
+
+def _as_list(values):
+    """Plain Python values for the encoders, NaN -> None (empty / null)"""
+    if isinstance(values, list):
+        return values
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        missing = np.isnan(values)
+        if missing.any():
+            return [None if m else v for v, m in zip(values.tolist(), missing.tolist())]
+    return values.tolist()
+
+
+# Row encoding per format, run in the workers: (columns, values) -> payload
+
+def _encode_csv(columns, values):
+    text = io.StringIO()
+    csv.writer(text).writerows(zip(*values))
+    return text.getvalue()
+
+
+def _encode_jsonl(columns, values):
+    return ''.join(json.dumps(dict(zip(columns, row))) + '\n' for row in zip(*values))
+
+
+def _encode_parquet(columns, values):
+    return dict(zip(columns, values))
+
+
+_ENCODERS = {'csv': _encode_csv, 'jsonl': _encode_jsonl, 'parquet': _encode_parquet}
+
+
+def _writer(path, format, columns):
+    """Incremental writer of encoded rows"""
+    if format == 'parquet':
+        return _ParquetWriter(path)
+    header = _encode_csv(columns, [[name] for name in columns]) if format == 'csv' else ''
+    return _TextWriter(path, header)
+
+
+class _TextWriter:
+    """Appends encoded CSV / JSONL text"""
+
+    def __init__(self, path, header):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._file.write(header)
+
+    def write(self, text):
+        self._file.write(text)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Row groups appended to one Parquet file (requires pyarrow)"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from None
+        self._pa, self._pq = pyarrow, pyarrow.parquet
+        self._path = path
+        self._writer = None
+
+    def write(self, columns):
+        table = self._pa.table(columns)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
@@ -0,0 +1,446 @@
+"""
+Catalog Module
+Persistent store of precomputed layup stiffness (SQLite + memory-mapped .npy)
+"""
+
+import hashlib
+import os
+import sqlite3
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .batch import batch_abd, pad_layups
+from .compliance import batch_abd_inverse
+from .lamination import lamination_parameters
+
+
+# One catalog record: stiffness, compliance, lamination parameters, thickness
+RECORD_DTYPE = np.dtype([('ABD', 'f8', (6, 6)), ('abd', 'f8', (6, 6)),
+                         ('xi', 'f8', (12,)), ('h', 'f8')])
+
+# Result of a single lookup
+CatalogEntry = namedtuple('CatalogEntry', ['code', 'ABD', 'abd', 'xi', 'h'])
+
+# Keys per SQLite "IN (...)" query
+_QUERY_BATCH = 500
+
+# Layup inputs whose keys get() remembers
+_KEY_MEMO_SIZE = 65536
+
+# Seconds a writer waits for another handle's write transaction
+_LOCK_TIMEOUT = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS materials (
+    id INTEGER PRIMARY KEY,
+    hash BLOB UNIQUE,
+    E1 REAL, E2 REAL, G12 REAL, nu12 REAL
+);
+CREATE TABLE IF NOT EXISTS layups (
+    key BLOB PRIMARY KEY,
+    row INTEGER NOT NULL,
+    material_id INTEGER NOT NULL,
+    code TEXT,
+    n_plies INTEGER
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS layups_material ON layups (material_id, row);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER
+);
+"""
+
+
+def material_hash(material_props):
+    """Stable 16-byte digest of E1, E2, G12, nu12"""
+    values = ','.join(f"{float(material_props[k]):.12g}" for k in ('E1', 'E2', 'G12', 'nu12'))
+    return hashlib.blake2b(values.encode(), digest_size=16).digest()
+
+
+def canonical_layups(angles, thicknesses):
+    """
+    Canonical integer form of padded layups: angles folded into (-90, 90]
+    in micro-degrees and thicknesses in nanometres, bottom to top
+
+    Layups with the same canonical form have identical A, B, D.
+
+    Returns:
+    --------
+    canonical : ndarray (N, n, 2) of int64
+    """
+    folded = (np.asarray(angles, dtype=float) + 90.0) % 180.0 - 90.0
+    folded = np.where(folded == -90.0, 90.0, folded)
+    return np.stack([np.round(folded * 1e6),
+                     np.round(np.asarray(thicknesses, dtype=float) * 1e6)],
+                    axis=-1).astype(np.int64)
+
+
+def layup_keys(material_digest, angles, thicknesses, n_plies):
+    """16-byte catalog keys of padded layups for one material"""
+    canonical = canonical_layups(angles, thicknesses)
+    return [hashlib.blake2b(row[:n].tobytes(), digest_size=16, key=material_digest).digest()
+            for row, n in zip(canonical, n_plies)]
+
+
+class LayupCatalog:
+    """
+    On-disk catalog of layups with precomputed ABD, abd and lamination
+    parameters
+
+    Metadata (material, layup code, key -> row) lives in SQLite; the numeric
+    records live in one memory-mapped structured .npy file, so opening a
+    catalog is cheap and lookups read single records without loading the
+    rest. Rows are keyed by a hash of the canonical layup and the material.
+
+    Several handles (processes) may read and add to one catalog: add()
+    runs in an exclusive SQLite write transaction and re-reads the row
+    count and records file inside it, and readers reopen the records
+    file when another handle has grown it.
+
+    Example:
+    --------
+    >>> catalog = LayupCatalog('layups.catalog')
+    >>> catalog.add(material, ["[0/±45/90]_s", "[0/90]_2s"], 0.125)
+    >>> entry = catalog.get(material, "[0/±45/90]_s", 0.125)
+    >>> entry.ABD, entry.abd, entry.xi
+    """
+
+    def __init__(self, path):
+        """
+        Open or create a catalog directory
+
+        Parameters:
+        -----------
+        path : str
+            Directory holding catalog.sqlite and records.npy
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self._records_path = os.path.join(path, 'records.npy')
+        # Autocommit mode: write transactions are opened explicitly
+        self._db = sqlite3.connect(os.path.join(path, 'catalog.sqlite'),
+                                   timeout=_LOCK_TIMEOUT, isolation_level=None)
+        self._db.executescript(_SCHEMA)
+        self._materials = {}
+        self._key_memo = {}
+        self._records = None
+        self._records_id = None
+        self._n_rows = 0
+        self._sync()
+
+    def __len__(self):
+        self._sync()
+        return self._n_rows
+
+    def __repr__(self):
+        return f"LayupCatalog({self.path!r}, {len(self)} layups)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Flush the records and close the database"""
+        if self._records is not None:
+            self._records.flush()
+        self._db.close()
+
+    @property
+    def records(self):
+        """Memory-mapped structured array of all records (RECORD_DTYPE)"""
+        self._sync()
+        if self._records is None:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return self._records[:self._n_rows]
+
+    def _sync(self):
+        """
+        Refresh the row count and remap records.npy if another handle has
+        replaced it (grown) since it was mapped
+        """
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'rows'").fetchone()
+        self._n_rows = row[0] if row else 0
+        self._map_records()
+
+    def _map_records(self):
+        """(Re)open the memory map of records.npy if the file was replaced"""
+        try:
+            stat = os.stat(self._records_path)
+        except FileNotFoundError:
+            return
+        records_id = (stat.st_ino, stat.st_size)
+        if records_id != self._records_id:
+            self._records = open_memmap(self._records_path, mode='r+')
+            self._records_id = records_id
+
+    # ------------------------------------------------------------------
+    # Insertion
+    # ------------------------------------------------------------------
+
+    def add(self, material_props, layups, ply_thickness=None, codes=None):
+        """
+        Add layups, computing stiffness only for those not yet stored
+
+        Parameters:
+        -----------
+        material_props : dict
+            Dictionary with E1, E2, G12, nu12
+        layups : list or ndarray (N, n)
+            Stacking sequence strings / angle lists, or an angle array such
+            as a chunk from enumerate_layups
+        ply_thickness : float or ndarray (N, n), optional
+            Ply thickness (mm) of plies without an '@t' override; required
+            unless every ply of every code carries one
+        codes : list of str, optional
+            Display codes; defaults to the input strings or "a/b/c" angles
+
+        Returns:
+        --------
+        rows : ndarray (N,)
+            Record index of every layup
+        """
+        if not isinstance(layups, np.ndarray):
+            layups = list(layups)
+        angles, thicknesses, n_plies = self._prepare(layups, ply_thickness)
+
+        # Exclusive write lock: row numbers and records are only allocated
+        # from the state on disk, never from a value cached by this handle
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._sync()
+            rows = self._insert(material_props, layups, angles, thicknesses, n_plies, codes)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            self._materials.clear()
+            self._sync()
+            raise
+        return rows
+
+    def _insert(self, material_props, layups, angles, thicknesses, n_plies, codes):
+        """Body of add(), inside its write transaction"""
+        material_id, digest = self._material(material_props, create=True)
+        keys = layup_keys(digest, angles, thicknesses, n_plies)
+
+        rows = self._find_rows(keys)
+        new = {}
+        for i, key in enumerate(keys):
+            if rows[i] < 0 and key not in new:
+                new[key] = i
+
+        if new:
+            index = np.fromiter(new.values(), dtype=np.intp, count=len(new))
+            new_codes = ([codes[i] for i in index] if codes is not None
+                         else _format_codes(layups, angles, n_plies, index))
+            start = self._n_rows
+            self._append_records(material_props, angles[index], thicknesses[index])
+            self._db.executemany(
+                "INSERT INTO layups (key, row, material_id, code, n_plies) VALUES (?, ?, ?, ?, ?)",
+                ((keys[i], start + j, material_id, code, int(n_plies[i]))
+                 for j, (i, code) in enumerate(zip(index, new_codes))))
+            self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('rows', ?)",
+                             (self._n_rows,))
+
+            new_rows = {key: start + j for j, key in enumerate(new)}
+            for i, key in enumerate(keys):
+                if rows[i] < 0:
+                    rows[i] = new_rows[key]
+        return rows
+
+    def add_enumeration(self, material_props, chunks, ply_thickness):
+        """
+        Bulk insert the angle chunks of an enumeration
+
+        Returns:
+        --------
+        n_rows : int
+            Catalog size afterwards
+        """
+        for chunk in chunks:
+            self.add(material_props, chunk, ply_thickness)
+        return len(self)
+
+    def _append_records(self, material_props, angles, thicknesses):
+        """Compute and append records for new layups"""
+        A, B, D = batch_abd(material_props, angles, thicknesses)
+        abd, _ = batch_abd_inverse(A, B, D)
+
+        block = np.empty(len(angles), dtype=RECORD_DTYPE)
+        block['ABD'] = np.block([[A, B], [B, D]])
+        block['abd'] = abd
+        block['xi'] = lamination_parameters(angles, thicknesses)
+        block['h'] = thicknesses.sum(axis=1)
+
+        self._reserve(self._n_rows + len(block))
+        self._records[self._n_rows:self._n_rows + len(block)] = block
+        self._records.flush()
+        self._n_rows += len(block)
+
+    def _reserve(self, n_rows):
+        """Grow records.npy (doubling) so that it holds at least n_rows"""
+        capacity = 0 if self._records is None else len(self._records)
+        if n_rows <= capacity:
+            return
+        capacity = max(2 * capacity, n_rows, 1024)
+
+        tmp_path = os.path.join(self.path, 'records.tmp.npy')
+        grown = open_memmap(tmp_path, mode='w+', dtype=RECORD_DTYPE, shape=(capacity,))
+        if self._n_rows:
+            grown[:self._n_rows] = self._records[:self._n_rows]
+        grown.flush()
+        del grown
+        self._records = None
+        # Other handles keep their mapping of the old file until _sync
+        # sees the new one
+        os.replace(tmp_path, self._records_path)
+        self._records_id = None
+        self._map_records()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, material_props, layup, ply_thickness=None):
+        """
+        Record of one layup, or None if it is not in the catalog
+
+        Parameters:
+        -----------
+        material_props : dict
+            Dictionary with E1, E2, G12, nu12
+        layup : str or list
+            Stacking sequence
+        ply_thickness : float or list, optional
+            Ply thickness (mm), as for add
+        """
+        # Repeated lookups of the same code skip parsing and hashing
+        memo_key = (tuple(material_props[k] for k in ('E1', 'E2', 'G12', 'nu12')),
+                    layup if isinstance(layup, str) else tuple(layup),
+                    ply_thickness if np.ndim(ply_thickness) == 0 else tuple(ply_thickness))
+        key = self._key_memo.get(memo_key)
+        if key is None:
+            keys = self._keys(material_props, [layup], ply_thickness)
+            if keys is None:
+                return None
+            key = keys[0]
+            if len(self._key_memo) >= _KEY_MEMO_SIZE:
+                self._key_memo.clear()
+            self._key_memo[memo_key] = key
+
+        found = self._db.execute("SELECT row, code FROM layups WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            return None
+        row, code = found
+        if self._records is None or row >= len(self._records):
+            self._sync()    # added through another handle
+        record = self._records[row]
+        return CatalogEntry(code, record['ABD'], record['abd'], record['xi'], float(record['h']))
+
+    def lookup(self, material_props, layups, ply_thickness=None):
+        """
+        Record indices of many layups (-1 where not in the catalog)
+
+        Returns:
+        --------
+        rows : ndarray (N,)
+            Indices into `records`
+        """
+        keys = self._keys(material_props, layups, ply_thickness)
+        if keys is None:
+            return np.full(len(layups), -1)
+        return self._find_rows(keys)
+
+    def _keys(self, material_props, layups, ply_thickness):
+        """Keys of layups of a registered material (None if unknown)"""
+        found = self._material(material_props, create=False)
+        if found is None:
+            return None
+        angles, thicknesses, n_plies = self._prepare(layups, ply_thickness)
+        return layup_keys(found[1], angles, thicknesses, n_plies)
+
+    def material_rows(self, material_props, return_plies=False):
+        """
+        Record indices of all layups of one material, ascending
+
+        With return_plies, also returns their ply counts.
+        """
+        found = self._material(material_props, create=False)
+        rows, n_plies = np.empty(0, dtype=np.intp), np.empty(0, dtype=int)
+        if found is not None:
+            result = np.array(self._db.execute(
+                "SELECT row, n_plies FROM layups WHERE material_id = ? ORDER BY row",
+                (found[0],)).fetchall(), dtype=np.intp).reshape(-1, 2)
+            rows, n_plies = result[:, 0], result[:, 1]
+        return (rows, n_plies) if return_plies else rows
+
+    def codes(self, rows):
+        """Layup codes of the given record indices"""
+        result = {}
+        rows = [int(r) for r in rows]
+        for start in range(0, len(rows), _QUERY_BATCH):
+            batch = rows[start:start + _QUERY_BATCH]
+            query = ("SELECT row, code FROM layups WHERE row IN (%s)"
+                     % ','.join('?' * len(batch)))
+            result.update(self._db.execute(query, batch))
+        return [result.get(r) for r in rows]
+
+    def _find_rows(self, keys):
+        rows = np.full(len(keys), -1)
+        position = {}
+        for i, key in enumerate(keys):
+            position.setdefault(key, []).append(i)
+        unique = list(position)
+        for start in range(0, len(unique), _QUERY_BATCH):
+            batch = unique[start:start + _QUERY_BATCH]
+            query = ("SELECT key, row FROM layups WHERE key IN (%s)"
+                     % ','.join('?' * len(batch)))
+            for key, row in self._db.execute(query, batch):
+                rows[position[key]] = row
+        return rows
+
+    def _material(self, material_props, create):
+        """(id, digest) of a material, registering it if create is set"""
+        digest = material_hash(material_props)
+        if digest in self._materials:
+            return self._materials[digest], digest
+
+        row = self._db.execute("SELECT id FROM materials WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            if not create:
+                return None
+            cursor = self._db.execute(
+                "INSERT INTO materials (hash, E1, E2, G12, nu12) VALUES (?, ?, ?, ?, ?)",
+                (digest, *(float(material_props[k]) for k in ('E1', 'E2', 'G12', 'nu12'))))
+            row = (cursor.lastrowid,)
+        self._materials[digest] = row[0]
+        return row[0], digest
+
+    @staticmethod
+    def _prepare(layups, ply_thickness):
+        """Padded angle/thickness arrays and ply counts of the input"""
+        if isinstance(layups, np.ndarray):
+            angles = np.atleast_2d(np.asarray(layups, dtype=float))
+            thicknesses = np.array(np.broadcast_to(
+                np.asarray(ply_thickness, dtype=float), angles.shape))
+            n_plies = np.full(len(angles), angles.shape[1])
+        else:
+            angles, thicknesses, n_plies = pad_layups(layups, ply_thickness)
+        if np.isnan(thicknesses).any():
+            raise ValueError("Plies without thickness: give ply_thickness or an '@t' "
+                             "override on every ply")
+        return angles, thicknesses, n_plies
+
+
+def _format_codes(layups, angles, n_plies, index):
+    """Display codes of layups[index]: input strings or "a/b/c" angles"""
+    labels = {a: f"{a:g}" for a in np.unique(angles[index])}
+    codes = ['/'.join([labels[a] for a in row[:n]])
+             for row, n in zip(angles[index].tolist(), n_plies[index])]
+    if not isinstance(layups, np.ndarray):
+        codes = [layups[i] if isinstance(layups[i], str) else code
+                 for i, code in zip(index, codes)]
+    return codes
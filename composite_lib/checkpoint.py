@@ -0,0 +1,273 @@
+"""
+Checkpoint Module
+Periodic checkpoints and exact resumption of sweeps and Monte Carlo runs
+"""
+
+import os
+import pickle
+import time
+
+import numpy as np
+
+from .sweeps import SWEEP_CHUNK_ROWS, _Study, sweep
+
+
+# Default seconds between checkpoints
+CHECKPOINT_INTERVAL = 60.0
+
+# Largest fraction of the run time spent writing checkpoints; a slow save
+# stretches the interval until the next one accordingly
+MAX_OVERHEAD = 0.02
+
+# Samples drawn per Monte Carlo batch
+MONTE_CARLO_BATCH = 4096
+
+
+class Checkpoint:
+    """
+    Job state saved to a local file at most every `interval` seconds
+
+    The state is any picklable object: reducers, optimizer populations,
+    numpy Generators (their bit generator state is pickled exactly),
+    counters. Saves are atomic (write to a temporary file, then rename),
+    so a job killed while saving resumes from the previous checkpoint.
+    The interval is stretched so that saving never takes more than
+    max_overhead of the wall time.
+
+    Example (an optimizer loop):
+    --------
+    >>> checkpoint = Checkpoint('search.ckpt', interval=30)
+    >>> state = checkpoint.load() or {'generation': 0, 'population': init(),
+    ...                               'rng': np.random.default_rng(1)}
+    >>> while state['generation'] < 500:
+    ...     state['population'] = step(state['population'], state['rng'])
+    ...     state['generation'] += 1
+    ...     checkpoint.maybe_save(state)
+    >>> checkpoint.save(state)
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_INTERVAL, max_overhead=MAX_OVERHEAD):
+        """
+        Parameters:
+        -----------
+        path : str
+            Checkpoint file
+        interval : float
+            Minimum seconds between saves
+        max_overhead : float
+            Largest fraction of wall time spent saving
+        """
+        self.path = path
+        self.interval = float(interval)
+        self.max_overhead = float(max_overhead)
+        self.saves = 0
+        self.save_seconds = 0.0
+        self._next_save = time.monotonic() + self.interval
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """
+        State of the last checkpoint, or None if there is none
+
+        Only load checkpoint files this library wrote: they are pickles.
+        """
+        if not self.exists():
+            return None
+        with open(self.path, 'rb') as f:
+            return pickle.load(f)
+
+    def due(self):
+        """Whether the interval since the last save has passed"""
+        return time.monotonic() >= self._next_save
+
+    def maybe_save(self, state):
+        """Save if due; returns whether a checkpoint was written"""
+        if not self.due():
+            return False
+        self.save(state)
+        return True
+
+    def save(self, state):
+        """Write a checkpoint now"""
+        start = time.monotonic()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        end = time.monotonic()
+        self.saves += 1
+        self.save_seconds += end - start
+        self._next_save = end + max(self.interval, (end - start) / self.max_overhead)
+
+    def remove(self):
+        """Delete the checkpoint file (e.g. once its results are stored)"""
+        if self.exists():
+            os.remove(self.path)
+
+
+def resumable_sweep(spec, reducers, checkpoint, fields=(), chunk_size=SWEEP_CHUNK_ROWS):
+    """
+    Reduce a sweep (see reduce_sweep) with periodic checkpoints, resuming
+    from the checkpoint file if it exists
+
+    The checkpoint holds the reducers and the number of layups consumed.
+    On resume the first layups of spec['layups'] are skipped, so the
+    layup iterable must yield the same sequence on every run (a list, a
+    file, or enumerate_layups with the same arguments). Chunks after the
+    skip are cut exactly as in an uninterrupted run, so the reducers end
+    up identical. Reducers must be picklable (use field names or
+    module-level functions rather than lambdas); a disk-backed
+    SweepResults is flushed and reopened in place.
+
+    Parameters:
+    -----------
+    spec : dict
+        Sweep specification (see sweep)
+    reducers : tuple or callable
+        Reducers (see reduce_sweep), or a function returning them; a
+        function is only called when starting afresh, so e.g. a
+        disk-backed SweepResults is not re-created over checkpointed files
+    checkpoint : Checkpoint or str
+        Checkpoint (or its file path, with the default interval)
+    fields, chunk_size
+        See sweep; must match those of the checkpointed run
+
+    Returns:
+    --------
+    reducers : tuple
+        The updated reducers (the restored objects when resuming)
+
+    Example:
+    --------
+    >>> def reducers():
+    ...     return (Extrema(('strains', 0)),
+    ...             SweepResults(sweep_schema(24), 10**7, path='study.results'))
+    >>> strain, results = resumable_sweep(spec, reducers, 'study.ckpt')
+    """
+    if not isinstance(checkpoint, Checkpoint):
+        checkpoint = Checkpoint(checkpoint)
+    study = _Study.from_spec(spec, fields)
+    config = {'fields': sorted(fields), 'chunk_size': chunk_size,
+              'rows_per_layup': study.rows_per_layup}
+
+    state = checkpoint.load()
+    if state is None:
+        state = {'config': config, 'layups': 0, 'finished': False,
+                 'reducers': _reducers(reducers)}
+    elif state['config'] != config:
+        raise ValueError(f"Checkpoint {checkpoint.path!r} was written with {state['config']}, "
+                         f"not {config}")
+    if state['finished']:
+        return state['reducers']
+
+    reducers = state['reducers']
+    layups = _skip_layups(spec['layups'], state['layups'])
+    for chunk in sweep(dict(spec, layups=layups), fields, chunk_size, state['layups']):
+        for reducer in reducers:
+            reducer.update(chunk)
+        state['layups'] = int(chunk['layup'][-1]) + 1
+        if checkpoint.due():
+            _flush(reducers)
+            checkpoint.save(state)
+
+    state['finished'] = True
+    _flush(reducers)
+    checkpoint.save(state)
+    return reducers
+
+
+def monte_carlo(sample, n_samples, reducers, seed=None, checkpoint=None,
+                batch_size=MONTE_CARLO_BATCH):
+    """
+    Feed n_samples random samples, drawn in fixed-size batches, to
+    reducers (e.g. Moments, Histogram, Extrema), with optional
+    checkpoints
+
+    Batch boundaries depend only on batch_size and the generator state is
+    checkpointed with the reducers, so an interrupted run resumes with
+    exactly the draws it would have made and gives identical results.
+
+    Parameters:
+    -----------
+    sample : callable
+        sample(rng, first, n) -> chunk dict of per-sample arrays for
+        samples first .. first + n - 1; must draw all randomness from rng
+        (e.g. scattered material properties evaluated with batch_abd)
+    n_samples : int
+        Total samples
+    reducers : tuple or callable
+        Objects with update(chunk), or a function returning them (see
+        resumable_sweep); chunks get an 'index' field if sample omits it
+    seed : int or SeedSequence, optional
+        Seed of the numpy Generator
+    checkpoint : Checkpoint or str, optional
+        Checkpoint to save to and resume from
+    batch_size : int
+        Samples per batch; must match the checkpointed run
+
+    Returns:
+    --------
+    reducers : tuple
+        The updated reducers (the restored objects when resuming)
+    """
+    if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+        checkpoint = Checkpoint(checkpoint)
+    state = None if checkpoint is None else checkpoint.load()
+    if state is None:
+        state = {'batch_size': batch_size, 'done': 0, 'rng': np.random.default_rng(seed),
+                 'reducers': _reducers(reducers)}
+    elif state['batch_size'] != batch_size:
+        raise ValueError(f"Checkpoint {checkpoint.path!r} used batch_size "
+                         f"{state['batch_size']}, not {batch_size}")
+
+    reducers, rng = state['reducers'], state['rng']
+    while state['done'] < n_samples:
+        first = state['done']
+        n = min(batch_size, n_samples - first)
+        chunk = dict(sample(rng, first, n))
+        chunk.setdefault('index', np.arange(first, first + n))
+        for reducer in reducers:
+            reducer.update(chunk)
+        state['done'] = first + n
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save(state)
+
+    if checkpoint is not None:
+        checkpoint.save(state)
+    return reducers
+
+
+def _reducers(reducers):
+    """Reducer tuple from a tuple or a factory"""
+    return tuple(reducers() if callable(reducers) else reducers)
+
+
+def _skip_layups(layups, n):
+    """The layup stream without its first n layups ((k, n) arrays count k)"""
+    iterator = iter(layups)
+    while n > 0:
+        item = next(iterator, None)
+        if item is None:
+            return
+        if isinstance(item, np.ndarray) and item.ndim == 2:
+            if len(item) > n:
+                yield item[n:]
+                n = 0
+                break
+            n -= len(item)
+        else:
+            n -= 1
+    yield from iterator
+
+
+def _flush(reducers):
+    """Write pending pages of disk-backed reducers before a checkpoint"""
+    for reducer in reducers:
+        flush = getattr(reducer, 'flush', None)
+        if flush is not None:
+            flush()
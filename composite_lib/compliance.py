@@ -0,0 +1,227 @@
+"""
+Compliance Module
+Batched ABD inversion and load solves using the A/B/D block structure
+"""
+
+import numpy as np
+
+
+# Layups whose scaled determinant det(M) / prod(diag(M)) of A or of the
+# Schur complement falls below this are flagged as near-singular
+SINGULAR_RTOL = 1e-12
+
+# Rows per chunk of the batched routines: float64 work arrays stay bounded
+# (a few MB) whatever the batch size or storage dtype
+CHUNK_ROWS = 16384
+
+# max|B| relative to sqrt(max|A| max|D|) below which coupling is treated as zero
+COUPLING_RTOL = 1e-12
+
+
+def _inv3(M):
+    """
+    Closed-form inverse of a stack of 3x3 matrices
+
+    Returns:
+    --------
+    inverse : ndarray (..., 3, 3)
+    det : ndarray (...)
+    """
+    a, b, c = M[..., 0, 0], M[..., 0, 1], M[..., 0, 2]
+    d, e, f = M[..., 1, 0], M[..., 1, 1], M[..., 1, 2]
+    g, h, i = M[..., 2, 0], M[..., 2, 1], M[..., 2, 2]
+
+    cof = np.empty(M.shape)
+    cof[..., 0, 0] = e*i - f*h
+    cof[..., 0, 1] = c*h - b*i
+    cof[..., 0, 2] = b*f - c*e
+    cof[..., 1, 0] = f*g - d*i
+    cof[..., 1, 1] = a*i - c*g
+    cof[..., 1, 2] = c*d - a*f
+    cof[..., 2, 0] = d*h - e*g
+    cof[..., 2, 1] = b*g - a*h
+    cof[..., 2, 2] = a*e - b*d
+
+    det = a*cof[..., 0, 0] + b*cof[..., 1, 0] + c*cof[..., 2, 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inverse = cof / det[..., None, None]
+    return inverse, det
+
+
+def _scaled_det(M, det):
+    """
+    Hadamard ratio det(M) / prod(diag(M)) of a stack of symmetric matrices
+
+    It lies in (0, 1] for positive definite matrices, is independent of
+    row/column scaling and tends to zero as M approaches singularity.
+    """
+    diag = M[..., 0, 0] * M[..., 1, 1] * M[..., 2, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = det / diag
+    return np.where(diag > 0, ratio, -np.inf)
+
+
+def row_chunks(n_rows, chunk_rows=CHUNK_ROWS):
+    """Slices covering range(n_rows) in blocks of at most chunk_rows"""
+    for start in range(0, n_rows, chunk_rows):
+        yield slice(start, min(start + chunk_rows, n_rows))
+
+
+def _storage_dtype(dtype, *arrays):
+    """Requested output dtype, or that of the inputs (float64 for non-floats)"""
+    if dtype is not None:
+        return np.dtype(dtype)
+    dtype = np.result_type(*arrays)
+    return dtype if np.issubdtype(dtype, np.floating) else np.dtype(np.float64)
+
+
+def _uncoupled(A, B, D):
+    """Layups whose coupling matrix B is negligible"""
+    scale = np.sqrt(np.abs(A).max(axis=(-2, -1)) * np.abs(D).max(axis=(-2, -1)))
+    return np.abs(B).max(axis=(-2, -1)) <= COUPLING_RTOL * scale
+
+
+def batch_abd_inverse(A, B, D, rtol=SINGULAR_RTOL, dtype=None):
+    """
+    Invert a batch of ABD matrices by block (Schur complement) inversion
+
+    With S = D - B A⁻¹ B the compliance blocks are
+
+        d = S⁻¹,  b = -A⁻¹ B d,  a = A⁻¹ - b B A⁻¹
+
+    Layups with B = 0 skip the Schur complement (a = A⁻¹, d = D⁻¹). All 3x3
+    inverses are closed form and always evaluated in float64, chunk by
+    chunk; only the result is stored in dtype.
+
+    Parameters:
+    -----------
+    A, B, D : ndarray (N, 3, 3)
+        Extensional, coupling and bending stiffness matrices
+    rtol : float
+        Scaled-determinant threshold below which a layup is flagged
+    dtype : dtype, optional
+        Storage dtype of abd (default: that of the inputs)
+
+    Returns:
+    --------
+    abd : ndarray (N, 6, 6)
+        Compliance matrices (inf/NaN entries for singular layups)
+    ill_conditioned : ndarray (N,) of bool
+        Near-singular or non positive-definite layups
+    """
+    dtype = _storage_dtype(dtype, A, B, D)
+    A, B, D = (np.asarray(M) for M in (A, B, D))
+    lead = A.shape[:-2]
+    A, B, D = (M.reshape(-1, 3, 3) for M in (A, B, D))
+
+    abd = np.empty((len(A), 6, 6), dtype=dtype)
+    ill_conditioned = np.empty(len(A), dtype=bool)
+    for rows in row_chunks(len(A)):
+        abd[rows], ill_conditioned[rows] = _abd_inverse(
+            *(np.asarray(M[rows], dtype=np.float64) for M in (A, B, D)), rtol)
+
+    return abd.reshape(lead + (6, 6)), ill_conditioned.reshape(lead)
+
+
+def _schur_blocks(A, B, D):
+    """
+    Blocks shared by the inversion and the load solve of one float64 chunk
+
+    Returns:
+    --------
+    A_inv : ndarray (N, 3, 3)
+        A⁻¹
+    AB : ndarray (N, 3, 3)
+        A⁻¹ B (zero for uncoupled layups)
+    d : ndarray (N, 3, 3)
+        S⁻¹, or D⁻¹ for uncoupled layups
+    conditioning : ndarray (N,)
+        Smaller scaled determinant of A and S (see _scaled_det)
+    """
+    A_inv, det_A = _inv3(A)
+    conditioning = _scaled_det(A, det_A)
+
+    # Uncoupled layups: the blocks invert independently (S = D)
+    uncoupled = _uncoupled(A, B, D)
+    AB = A_inv @ B
+    AB[uncoupled] = 0.0
+    S = D - B @ AB
+    S[uncoupled] = D[uncoupled]
+
+    d, det = _inv3(S)
+    conditioning = np.minimum(conditioning, _scaled_det(S, det))
+    return A_inv, AB, d, conditioning
+
+
+def _abd_inverse(A, B, D, rtol):
+    """Block inversion of one float64 chunk (see batch_abd_inverse)"""
+    A_inv, AB, d, conditioning = _schur_blocks(A, B, D)
+    b = -AB @ d
+
+    abd = np.empty(A.shape[:-2] + (6, 6))
+    abd[..., :3, :3] = A_inv - b @ AB.swapaxes(-2, -1)
+    abd[..., :3, 3:] = b
+    abd[..., 3:, :3] = b.swapaxes(-2, -1)
+    abd[..., 3:, 3:] = d
+
+    ill_conditioned = ~(conditioning > rtol)
+    return abd, ill_conditioned
+
+
+def batch_solve_strains(A, B, D, loads, dtype=None, rtol=SINGULAR_RTOL):
+    """
+    Mid-plane strains and curvatures for a batch of layups without
+    forming the compliance matrix
+
+    Solves A ε + B κ = N, B ε + D κ = M through the Schur complement
+    S = D - B A⁻¹ B with closed-form 3x3 inverses, in float64 chunk by chunk.
+    Layups whose A or S is near-singular (the ill_conditioned test of
+    batch_abd_inverse) get NaN instead of failing the whole batch.
+
+    Parameters:
+    -----------
+    A, B, D : ndarray (N, 3, 3)
+        Stiffness matrices
+    loads : ndarray (6,) or (N, 6)
+        [Nx, Ny, Nxy, Mx, My, Mxy], shared or per layup
+    dtype : dtype, optional
+        Storage dtype of the results (default: that of the stiffness inputs)
+    rtol : float
+        Scaled-determinant threshold below which a layup gets NaN
+
+    Returns:
+    --------
+    strains : ndarray (N, 3)
+        Mid-plane strains [εx0, εy0, γxy0] (NaN for singular layups)
+    curvatures : ndarray (N, 3)
+        Curvatures [κx, κy, κxy] (NaN for singular layups)
+    """
+    dtype = _storage_dtype(dtype, A, B, D)
+    A, B, D = (np.asarray(M) for M in (A, B, D))
+    lead = A.shape[:-2]
+    A, B, D = (M.reshape(-1, 3, 3) for M in (A, B, D))
+    loads = np.broadcast_to(np.asarray(loads), lead + (6,)).reshape(-1, 6)
+
+    strains = np.empty((len(A), 3), dtype=dtype)
+    curvatures = np.empty((len(A), 3), dtype=dtype)
+    for rows in row_chunks(len(A)):
+        strains[rows], curvatures[rows] = _solve_strains(
+            *(np.asarray(M[rows], dtype=np.float64) for M in (A, B, D, loads)), rtol)
+
+    return strains.reshape(lead + (3,)), curvatures.reshape(lead + (3,))
+
+
+def _solve_strains(A, B, D, loads, rtol):
+    """Schur-complement solve of one float64 chunk (see batch_solve_strains)"""
+    A_inv, AB, d, conditioning = _schur_blocks(A, B, D)
+    N, M = loads[:, :3], loads[:, 3:]
+
+    AN = np.einsum('nij,nj->ni', A_inv, N)
+    curvatures = np.einsum('nij,nj->ni', d, M - np.einsum('nji,nj->ni', AB, N))
+    strains = AN - np.einsum('nij,nj->ni', AB, curvatures)
+
+    # Same test as the ill_conditioned flags of batch_abd_inverse
+    ill_conditioned = ~(conditioning > rtol)
+    strains[ill_conditioned] = np.nan
+    curvatures[ill_conditioned] = np.nan
+    return strains, curvatures
@@ -0,0 +1,426 @@
+"""
+Distributed Sweep Module
+Coordinator / worker evaluation of sweeps over TCP (multiprocessing.connection)
+"""
+
+import itertools
+import os
+import socket
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+
+from .sweeps import SWEEP_CHUNK_ROWS, _Study, _layup_groups
+
+
+# Seconds a worker may hold a task before it is handed to another worker
+LEASE_TIMEOUT = 60.0
+
+# Failed evaluations of one task before the sweep is aborted
+MAX_ATTEMPTS = 3
+
+# Tasks leased or finished but not yet aggregated; bounds coordinator memory
+WINDOW = 64
+
+# Seconds a worker waits before asking again when no task is free
+POLL_INTERVAL = 0.1
+
+
+# Task board methods a worker may call (one pickled request / reply each)
+_WORKER_METHODS = ('study', 'lease', 'complete', 'fail')
+
+
+class _Lease:
+    """An outstanding task: payload, failed attempts and current lease"""
+
+    __slots__ = ('payload', 'attempts', 'token', 'deadline')
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.attempts = 0
+        self.token = None
+        self.deadline = None
+
+
+class _TaskBoard:
+    """
+    Thread-safe task queue of a coordinator; workers call its public
+    methods over their connection
+
+    Tasks are created lazily from the layup stream, at most `window` ahead
+    of the oldest result not yet aggregated.
+    """
+
+    def __init__(self, study, groups, window, lease_timeout, max_attempts):
+        self._study = study
+        self._groups = groups
+        self._window = window
+        self._lease_timeout = lease_timeout
+        self._max_attempts = max_attempts
+
+        self._cond = threading.Condition()
+        self._tokens = itertools.count(1)
+        self._queue = deque()          # task ids waiting for a (new) lease
+        self._open = {}                # task id -> _Lease, not yet completed
+        self._results = {}             # task id -> chunk, not yet aggregated
+        self._n_tasks = 0
+        self._next_layup = self._next_row = 0
+        self._exhausted = False
+        self.next_result = 0
+        self.error = None
+
+    # Methods called by workers over their connections -------------------
+
+    def study(self):
+        """Materials, thicknesses, loads and fields of the sweep"""
+        return self._study
+
+    def lease(self):
+        """
+        Lease the next task
+
+        Returns:
+        --------
+        ('task', task_id, token, payload), ('wait', seconds), or None once
+        the sweep is finished or aborted
+        """
+        with self._cond:
+            if self.error is not None or self.finished():
+                return None
+            self._expire_leases()
+            if not self._queue:
+                self._create_task()
+            if not self._queue:
+                return ('wait', POLL_INTERVAL)
+
+            task_id = self._queue.popleft()
+            lease = self._open[task_id]
+            lease.token = next(self._tokens)
+            lease.deadline = time.monotonic() + self._lease_timeout
+            return ('task', task_id, lease.token, lease.payload)
+
+    def complete(self, task_id, chunk):
+        """Store a task's result (duplicates from expired leases are dropped)"""
+        with self._cond:
+            lease = self._open.pop(task_id, None)
+            if lease is not None:
+                if lease.token is None:
+                    # Completed by the worker whose lease expired: withdraw
+                    # the requeued copy
+                    self._queue.remove(task_id)
+                self._results[task_id] = chunk
+                self._cond.notify_all()
+
+    def fail(self, task_id, token, message):
+        """Report a failed evaluation; retried until max_attempts"""
+        with self._cond:
+            lease = self._open.get(task_id)
+            if lease is None or lease.token != token:
+                return
+            lease.attempts += 1
+            lease.token = lease.deadline = None
+            if lease.attempts >= self._max_attempts:
+                self.error = f"Task {task_id} failed {lease.attempts} times:\n{message}"
+            else:
+                self._queue.append(task_id)
+            self._cond.notify_all()
+
+    # Coordinator side ---------------------------------------------------
+
+    def abort(self, message):
+        """End the sweep with an error (raised by take)"""
+        with self._cond:
+            if self.error is None:
+                self.error = message
+            self._cond.notify_all()
+
+    def close(self):
+        """End the sweep for all workers, finished or not"""
+        with self._cond:
+            if self.error is None and not self.finished():
+                self.error = "Coordinator closed"
+            self._cond.notify_all()
+
+    def finished(self):
+        return self._exhausted and self.next_result == self._n_tasks
+
+    def take(self, timeout):
+        """Next result in task order (blocks), or None when finished"""
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while self.next_result not in self._results:
+                if self.error is not None:
+                    raise RuntimeError(self.error)
+                if self.finished():
+                    return None
+                # The coordinator also creates tasks, so an exhausted check
+                # does not wait for a worker to ask first
+                if not self._queue:
+                    self._create_task()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No result for task {self.next_result} within {timeout} s")
+                self._cond.wait(POLL_INTERVAL if remaining is None
+                                else min(POLL_INTERVAL, remaining))
+                self._expire_leases()
+
+            chunk = self._results.pop(self.next_result)
+            self.next_result += 1
+            return chunk
+
+    def _create_task(self):
+        """Compile the next layup group into a task if the window allows"""
+        if self._exhausted or self._n_tasks - self.next_result >= self._window:
+            return
+        items = next(self._groups, None)
+        if items is None:
+            self._exhausted = True
+            self._cond.notify_all()
+            return
+
+        angles, plies, n_plies = self._study.compile(items)
+        payload = (angles, plies, n_plies, self._next_layup, self._next_row)
+        self._next_layup += len(angles)
+        self._next_row += len(angles) * self._study.rows_per_layup
+
+        self._open[self._n_tasks] = _Lease(payload)
+        self._queue.append(self._n_tasks)
+        self._n_tasks += 1
+
+    def _expire_leases(self):
+        """Requeue tasks whose worker missed the lease deadline"""
+        now = time.monotonic()
+        for task_id, lease in self._open.items():
+            if lease.deadline is not None and lease.deadline < now:
+                lease.token = lease.deadline = None
+                self._queue.appendleft(task_id)
+
+
+class SweepCoordinator:
+    """
+    Serve a sweep (see sweep) to worker processes on any number of hosts
+
+    The layup stream is cut into chunks of about chunk_size result rows.
+    Workers connect over TCP (run_worker, or `python run_sweep_worker.py
+    HOST:PORT KEY` on another host), lease a chunk, evaluate it
+    with the library's batch laminate math and send the rows back. A lease
+    that is not completed within lease_timeout (lost worker, dead host) is
+    handed out again; a chunk whose evaluation raises is retried up to
+    max_attempts times. Results are aggregated strictly in chunk order, so
+    reducers see exactly the chunks sweep() would yield.
+
+    Example:
+    --------
+    >>> with SweepCoordinator(spec, address=('0.0.0.0', 5000)) as coordinator:
+    ...     print(coordinator.address, coordinator.authkey.hex())
+    ...     extrema, = coordinator.run(Extrema(('strains', 0)))
+    """
+
+    def __init__(self, spec, fields=(), address=('127.0.0.1', 0), authkey=None,
+                 chunk_size=SWEEP_CHUNK_ROWS, window=WINDOW,
+                 lease_timeout=LEASE_TIMEOUT, max_attempts=MAX_ATTEMPTS):
+        """
+        Prepare the task board (call start() or use as a context manager)
+
+        Parameters:
+        -----------
+        spec : dict
+            Sweep specification (see sweep); the layup iterable is consumed
+            lazily as tasks are created
+        fields : tuple of str
+            Optional result fields (see sweep)
+        address : (str, int)
+            Interface and port to listen on; port 0 picks a free port
+        authkey : bytes, optional
+            Shared secret for workers (default: random, see .authkey)
+        chunk_size : int
+            Target result rows per task
+        window : int
+            Maximum tasks in flight or awaiting aggregation
+        lease_timeout : float
+            Seconds before an unfinished task is leased to another worker
+        max_attempts : int
+            Failed evaluations of one task before run() raises
+        """
+        study = _Study.from_spec(spec, fields)
+        groups = _layup_groups(spec['layups'], max(1, chunk_size // study.rows_per_layup))
+        self._board = _TaskBoard(study, groups, window, lease_timeout, max_attempts)
+
+        self.authkey = authkey if authkey is not None else os.urandom(16)
+        self._listener = Listener(tuple(address), authkey=self.authkey)
+        self._thread = None
+        self._closed = False
+
+    @property
+    def address(self):
+        """(host, port) the coordinator listens on"""
+        return self._listener.address
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self):
+        """Accept worker connections in a background thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._accept, name='sweep-coordinator',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def _accept(self):
+        """Serve every worker connection in its own thread until closed"""
+        while not self._closed:
+            try:
+                connection = self._listener.accept()
+            except Exception:
+                continue    # failed handshake (or the wake-up in close)
+            if self._closed:
+                connection.close()
+                break
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        """Answer one worker's (method, args) requests until it disconnects"""
+        with connection:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    return
+                if method not in _WORKER_METHODS:
+                    return
+                try:
+                    reply = getattr(self._board, method)(*args)
+                except Exception:
+                    # Surface coordinator bugs through run() instead of
+                    # silently losing the worker
+                    self._board.abort(f"Coordinator error in {method}():\n"
+                                      f"{traceback.format_exc()}")
+                    reply = None
+                try:
+                    connection.send(reply)
+                except (EOFError, OSError):
+                    return
+
+    def chunks(self, timeout=None):
+        """
+        Yield result chunks in sweep order as workers deliver them
+
+        Parameters:
+        -----------
+        timeout : float, optional
+            Seconds to wait for the next chunk before raising TimeoutError
+        """
+        self.start()
+        while True:
+            chunk = self._board.take(timeout)
+            if chunk is None:
+                return
+            yield chunk
+
+    def run(self, *reducers, timeout=None):
+        """
+        Aggregate the whole sweep into reducers (see reduce_sweep)
+
+        Returns:
+        --------
+        reducers : tuple
+        """
+        for chunk in self.chunks(timeout):
+            for reducer in reducers:
+                reducer.update(chunk)
+        return reducers
+
+    def close(self):
+        """Stop accepting workers; connected workers see the sweep as ended"""
+        if self._closed:
+            return
+        self._closed = True
+        self._board.close()
+        if self._thread is not None:
+            # Wake the blocking accept() with a throw-away connection
+            try:
+                socket.create_connection(self.address, timeout=1.0).close()
+            except OSError:
+                pass
+            self._thread.join()
+            self._thread = None
+        self._listener.close()
+
+
+def run_worker(address, authkey, retry_connect=10.0):
+    """
+    Evaluate tasks from a coordinator until its sweep is finished
+
+    Parameters:
+    -----------
+    address : (str, int)
+        Coordinator host and port
+    authkey : bytes
+        Coordinator's authkey
+    retry_connect : float
+        Seconds to keep retrying the initial connection
+
+    Returns:
+    --------
+    n_tasks : int
+        Number of tasks this worker completed
+    """
+    deadline = time.monotonic() + retry_connect
+    while True:
+        try:
+            connection = Client(tuple(address), authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(POLL_INTERVAL)
+
+    def call(method, *args):
+        connection.send((method, args))
+        return connection.recv()
+
+    n_tasks = 0
+    with connection:
+        try:
+            study = call('study')
+            while True:
+                lease = call('lease')
+                if lease is None:
+                    break
+                if lease[0] == 'wait':
+                    time.sleep(lease[1])
+                    continue
+
+                _, task_id, token, payload = lease
+                try:
+                    chunk = study.evaluate_arrays(*payload)
+                except Exception:
+                    call('fail', task_id, token, traceback.format_exc())
+                    continue
+                call('complete', task_id, chunk)
+                n_tasks += 1
+        except (EOFError, OSError):
+            pass    # coordinator closed
+    return n_tasks
+
+
+def start_local_workers(address, authkey, n_workers):
+    """
+    Start worker processes on this machine (e.g. for testing a coordinator)
+
+    Returns:
+    --------
+    processes : list of multiprocessing.Process
+    """
+    processes = [Process(target=run_worker, args=(address, authkey), daemon=True)
+                 for _ in range(n_workers)]
+    for process in processes:
+        process.start()
+    return processes
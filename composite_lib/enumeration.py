@@ -0,0 +1,310 @@
+"""
+Enumeration Module
+Generate admissible layups from a discrete angle set
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+
+class LayupEnumerator:
+    """
+    Enumerate canonical layups under common design rules
+
+    Layups are generated depth-first over angle indices with the rules
+    applied as pruning in the recursion:
+
+    - symmetric: only the half stack (plus an odd mid-plane ply) is free
+    - balanced: every +θ ply has a -θ partner (0° and 90° excepted)
+    - max_consecutive: no more than this many adjacent plies of one angle
+    - min_family_fraction: each angle family |θ| (e.g. 0, ±45, 90) makes
+      up at least this fraction of the plies (the 10% rule)
+
+    Layups equivalent under reversal (flipping the plate) or mirroring
+    (θ -> -θ) are reported once, as the lexicographically smallest member
+    of their class in angle-index order. Mirroring only counts when every
+    admissible angle has its mirror image in the set; otherwise layups
+    are identified under reversal alone.
+    """
+
+    def __init__(self, angles, symmetric=True, balanced=True,
+                 max_consecutive=4, min_family_fraction=0.1):
+        """
+        Initialize enumerator
+
+        Parameters:
+        -----------
+        angles : list of float
+            Admissible ply angles (degrees), e.g. [0, 45, -45, 90]
+        symmetric : bool
+            Only generate symmetric layups
+        balanced : bool
+            Only generate balanced layups
+        max_consecutive : int or None
+            Maximum run of adjacent plies with equal angle
+        min_family_fraction : float or None
+            Minimum fraction of plies per angle family (0.1 for the 10% rule)
+        """
+        self.angles = np.array(sorted(set(float(a) for a in angles)))
+        self.symmetric = symmetric
+        self.balanced = balanced
+        self.max_consecutive = max_consecutive or math.inf
+        self.min_family_fraction = min_family_fraction or 0.0
+
+        index = {a: i for i, a in enumerate(self.angles)}
+        K = len(self.angles)
+
+        # Mirror image index of every angle (None if -θ is not admissible)
+        self.mirror = [index.get(-a, index.get(_normalize(-a))) for a in self.angles]
+        self.mirror_closed = all(m is not None for m in self.mirror)
+
+        # Balance pairs: (pair id, ±1) for angles that need a partner
+        self.balance_pair = [None] * K
+        pairs = {}
+        for i, a in enumerate(self.angles):
+            if _normalize(a) in (0.0, 90.0):
+                continue
+            key = abs(a)
+            pair = pairs.setdefault(key, len(pairs))
+            self.balance_pair[i] = (pair, 1 if a > 0 else -1)
+        self.n_pairs = len(pairs)
+
+        # Angle families for the minimum-fraction rule
+        families = {}
+        self.family = [families.setdefault(_normalize(abs(a)), len(families))
+                       for a in self.angles]
+        self.n_families = len(families)
+
+    def layups(self, max_plies, min_plies=1, chunk_size=4096, processes=None,
+               indices=False):
+        """
+        Stream canonical layups in chunks
+
+        Parameters:
+        -----------
+        max_plies : int
+            Largest ply count to generate
+        min_plies : int
+            Smallest ply count to generate
+        chunk_size : int
+            Maximum number of layups per yielded chunk
+        processes : int, optional
+            Split the search tree across this many worker processes; the
+            output is identical to (and in the same order as) a serial run
+        indices : bool
+            Yield indices into self.angles instead of angles, for use with
+            an AngleTable built on the same angle set
+
+        Yields:
+        -------
+        angles : ndarray (k, n_plies)
+            Ply angles (degrees) of up to chunk_size layups with equal ply
+            count, ready for batch_abd
+        """
+        for n in range(min_plies, max_plies + 1):
+            if processes and processes > 1:
+                blocks = self._parallel_blocks(n, processes)
+            else:
+                blocks = _batched(self._search(n), chunk_size)
+            yield from self._chunks(n, blocks, chunk_size, indices)
+
+    def _chunks(self, n, blocks, chunk_size, indices=False):
+        """Re-slice blocks of free-ply index rows into full-stack chunks"""
+        pending, size = [], 0
+        for block in blocks:
+            pending.append(block)
+            size += len(block)
+            while size >= chunk_size:
+                rows = np.concatenate(pending)
+                yield self._expand(n, rows[:chunk_size], indices)
+                pending, size = [rows[chunk_size:]], size - chunk_size
+        if size:
+            yield self._expand(n, np.concatenate(pending), indices)
+
+    def _expand(self, n, free, indices=False):
+        """Free plies -> full stack angles (or angle indices)"""
+        if self.symmetric:
+            half = n // 2
+            free = np.concatenate([free, free[:, :half][:, ::-1]], axis=1)
+        return free if indices else self.angles[free]
+
+    def _parallel_blocks(self, n, processes):
+        """Distribute subtrees below a shallow prefix level to workers"""
+        n_free = (n + 1) // 2 if self.symmetric else n
+        depth, prefixes = 0, [()]
+        while depth < n_free and len(prefixes) < 8 * processes:
+            depth += 1
+            prefixes = list(self._search(n, depth=depth))
+        if depth == n_free:
+            yield _rows_array(prefixes, n_free)
+            return
+
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            yield from pool.map(_subtree_rows, repeat(self), repeat(n), prefixes)
+
+    def _search(self, n, prefix=(), depth=None):
+        """
+        Depth-first search over free plies with pruning
+
+        Yields complete free-ply index tuples, or partial tuples of length
+        depth when depth is given. Positions covered by prefix only take
+        the prefixed choice, which replays its state for workers.
+        """
+        K = len(self.angles)
+        max_run = self.max_consecutive
+        symmetric = self.symmetric
+        half = n // 2
+        n_free = (n + 1) // 2 if symmetric else n
+        if n_free == 0:
+            return
+        odd_mid = symmetric and n % 2 == 1
+
+        # Each free ply counts twice in a symmetric stack, except the mid ply
+        weight = [2 if symmetric and p < half else 1 for p in range(n_free)]
+        remaining = [sum(weight[p + 1:]) for p in range(n_free)]
+        need = math.ceil(self.min_family_fraction * n - 1e-9)
+
+        imbalance = [0] * self.n_pairs
+        family_count = [0] * self.n_families
+        stop = n_free if depth is None else min(depth, n_free)
+        mirror, balance_pair, family = self.mirror, self.balance_pair, self.family
+        mirror_closed = self.mirror_closed
+        balanced = self.balanced
+
+        # Explicit-stack DFS: per depth the chosen ply, the next candidate,
+        # the run length ending there and whether seq == mirror(seq) so far
+        seq = [0] * stop
+        next_choice = [0] * (stop + 1)
+        run = [0] * (stop + 1)
+        mirror_equal = [mirror_closed] * (stop + 1)
+
+        def bounds(p):
+            return (prefix[p], prefix[p] + 1) if p < len(prefix) else (0, K)
+
+        # totals[0]: sum of |imbalance|, totals[1]: summed family deficit
+        totals = [0, need * self.n_families]
+
+        def place(p, i, sign):
+            w = sign * weight[p]
+            pair = balance_pair[i]
+            if pair is not None:
+                k = pair[0]
+                before = imbalance[k]
+                imbalance[k] += pair[1] * w
+                totals[0] += abs(imbalance[k]) - abs(before)
+            f = family[i]
+            before = family_count[f]
+            family_count[f] += w
+            totals[1] += max(0, need - family_count[f]) - max(0, need - before)
+
+        p = 0
+        next_choice[0] = bounds(0)[0]
+        while p >= 0:
+            if p == stop:
+                if stop < n_free or self._is_canonical_leaf(seq):
+                    yield tuple(seq)
+                p -= 1
+                place(p, seq[p], -1)
+                continue
+
+            i = next_choice[p]
+            if i >= bounds(p)[1]:
+                p -= 1
+                if p >= 0:
+                    place(p, seq[p], -1)
+                continue
+            next_choice[p] = i + 1
+
+            # Consecutive-ply rule (runs across the mid-plane double up)
+            same = p > 0 and seq[p - 1] == i
+            new_run = run[p] + 1 if same else 1
+            if new_run > max_run:
+                continue
+            if symmetric and p == n_free - 1:
+                if odd_mid:
+                    full_run = 2*run[p] + 1 if same else 1
+                else:
+                    full_run = 2*new_run
+                if full_run > max_run:
+                    continue
+
+            # Mirror canonical order (mirror-closed sets), decided on the
+            # first differing ply
+            equal = mirror_equal[p]
+            if equal:
+                mirror_i = mirror[i]
+                if mirror_i < i:
+                    continue
+                equal = mirror_i == i
+
+            # Balance and family deficits must fit in the remaining plies
+            place(p, i, 1)
+            if (balanced and totals[0] > remaining[p]) or totals[1] > remaining[p]:
+                place(p, i, -1)
+                continue
+
+            seq[p] = i
+            run[p + 1] = new_run
+            mirror_equal[p + 1] = equal
+            p += 1
+            if p < stop:
+                next_choice[p] = bounds(p)[0]
+
+    def _is_canonical_leaf(self, seq):
+        """Reversal checks for non-symmetric stacks (mirror already pruned)"""
+        if self.symmetric:
+            return True
+        reverse = seq[::-1]
+        if reverse < seq:
+            return False
+        if self.mirror_closed:
+            if [self.mirror[i] for i in reverse] < seq:
+                return False
+        return True
+
+
+def _subtree_rows(enumerator, n, prefix):
+    """Worker: all complete rows below one prefix"""
+    n_free = (n + 1) // 2 if enumerator.symmetric else n
+    return _rows_array(list(enumerator._search(n, prefix=prefix)), n_free)
+
+
+def _batched(rows, size):
+    """Group index tuples into arrays of at most size rows"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield _rows_array(batch, len(row))
+            batch = []
+    if batch:
+        yield _rows_array(batch, len(batch[0]))
+
+
+def _rows_array(rows, width):
+    return np.array(rows, dtype=np.intp).reshape(len(rows), width)
+
+
+def _normalize(angle):
+    """Map an angle to (-90, 90] so that e.g. -90 and 90 compare equal"""
+    angle = (angle + 90.0) % 180.0 - 90.0
+    return 90.0 if angle == -90.0 else angle
+
+
+def enumerate_layups(angles, max_plies, min_plies=1, symmetric=True, balanced=True,
+                     max_consecutive=4, min_family_fraction=0.1,
+                     chunk_size=4096, processes=None, indices=False):
+    """
+    Stream canonical admissible layups in chunks (see LayupEnumerator)
+
+    Example:
+    --------
+    >>> for chunk in enumerate_layups([0, 45, -45, 90], max_plies=16):
+    ...     A, B, D = batch_abd(material, chunk, np.full(chunk.shape, 0.125))
+    """
+    enumerator = LayupEnumerator(angles, symmetric, balanced,
+                                 max_consecutive, min_family_fraction)
+    return enumerator.layups(max_plies, min_plies, chunk_size, processes, indices)
@@ -0,0 +1,82 @@
+"""
+Failure Criteria Module
+Vectorized first-ply failure indices from material-axis ply stresses
+"""
+
+import numpy as np
+
+
+# Lamina strengths (positive magnitudes, in the stress units of the moduli,
+# i.e. GPa for the materials of this library): longitudinal tension and
+# compression, transverse tension and compression, in-plane shear
+STRENGTH_KEYS = ('Xt', 'Xc', 'Yt', 'Yc', 'S')
+
+# Normalized Tsai-Wu interaction coefficient F12* = F12 / sqrt(F11 F22)
+TSAI_WU_F12_STAR = -0.5
+
+
+def _strengths(strengths):
+    """Xt, Xc, Yt, Yc, S as floats (positive magnitudes)"""
+    try:
+        values = [abs(float(strengths[key])) for key in STRENGTH_KEYS]
+    except KeyError as e:
+        raise ValueError(f"Missing strength {e} (need {', '.join(STRENGTH_KEYS)})") from None
+    if not all(values):
+        raise ValueError("Strengths must be non-zero")
+    return values
+
+
+def max_stress_index(material_stresses, strengths):
+    """
+    Maximum-stress failure index
+
+    Parameters:
+    -----------
+    material_stresses : ndarray (..., 3)
+        [σ1, σ2, τ12] at any number of points
+    strengths : dict
+        Xt, Xc, Yt, Yc, S, in the units of the stresses (those of E1,
+        E2, G12; e.g. 1.5 for 1500 MPa with moduli in GPa)
+
+    Returns:
+    --------
+    index : ndarray (...)
+        Largest stress / strength ratio; failure at index >= 1
+    """
+    Xt, Xc, Yt, Yc, S = _strengths(strengths)
+    s = np.asarray(material_stresses, dtype=float)
+    s1, s2, t12 = s[..., 0], s[..., 1], s[..., 2]
+    return np.maximum.reduce([np.where(s1 >= 0, s1 / Xt, -s1 / Xc),
+                              np.where(s2 >= 0, s2 / Yt, -s2 / Yc),
+                              np.abs(t12) / S])
+
+
+def tsai_wu_index(material_stresses, strengths, f12_star=TSAI_WU_F12_STAR):
+    """
+    Tsai-Wu failure index
+
+        F1 σ1 + F2 σ2 + F11 σ1² + F22 σ2² + F66 τ12² + 2 F12 σ1 σ2
+
+    Parameters:
+    -----------
+    material_stresses : ndarray (..., 3)
+        [σ1, σ2, τ12] at any number of points
+    strengths : dict
+        Xt, Xc, Yt, Yc, S, in the units of the stresses (those of E1,
+        E2, G12; e.g. 1.5 for 1500 MPa with moduli in GPa)
+    f12_star : float
+        Normalized interaction coefficient
+
+    Returns:
+    --------
+    index : ndarray (...)
+        Failure at index >= 1
+    """
+    Xt, Xc, Yt, Yc, S = _strengths(strengths)
+    F1, F2 = 1/Xt - 1/Xc, 1/Yt - 1/Yc
+    F11, F22, F66 = 1/(Xt*Xc), 1/(Yt*Yc), 1/S**2
+    F12 = f12_star * np.sqrt(F11 * F22)
+
+    s = np.asarray(material_stresses, dtype=float)
+    s1, s2, t12 = s[..., 0], s[..., 1], s[..., 2]
+    return F1*s1 + F2*s2 + F11*s1**2 + F22*s2**2 + F66*t12**2 + 2*F12*s1*s2
@@ -3,6 +3,8 @@ Lamina Module
 Calculate lamina stiffness matrices and transformed properties
 """
 
+import weakref
+
 import numpy as np
 
 
@@ -10,8 +12,18 @@ class Lamina:
     """
     Single lamina (ply) analysis
     Calculate Q matrix and transformed Q-bar matrix
+
+    Lamina is an immutable value type: attributes cannot be reassigned,
+    Q, Qbar and the compliance S are computed on first access and cached
+    as read-only arrays, and Lamina.intern() shares equal plies.
     """
 
+    __slots__ = ('E1', 'E2', 'G12', 'nu12', 'nu21', 't', 'theta',
+                 '_Q', '_Qbar', '_S', '__weakref__')
+
+    # Interned instances, keyed by their defining values
+    _interned = weakref.WeakValueDictionary()
+
     def __init__(self, E1, E2, G12, nu12, t, theta=0):
         """
         Initialize lamina
@@ -31,19 +43,72 @@ class Lamina:
         theta : float
             Fiber orientation angle (degrees)
         """
-        self.E1 = E1
-        self.E2 = E2
-        self.G12 = G12
-        self.nu12 = nu12
-        self.nu21 = nu12 * E2 / E1  # Minor Poisson's ratio
-        self.t = t
-        self.theta = theta
+        init = object.__setattr__
+        init(self, 'E1', E1)
+        init(self, 'E2', E2)
+        init(self, 'G12', G12)
+        init(self, 'nu12', nu12)
+        init(self, 'nu21', nu12 * E2 / E1)  # Minor Poisson's ratio
+        init(self, 't', t)
+        init(self, 'theta', theta)
+
+        # Q, Q-bar and S are computed on first access
+        init(self, '_Q', None)
+        init(self, '_Qbar', None)
+        init(self, '_S', None)
+
+    @classmethod
+    def intern(cls, E1, E2, G12, nu12, t, theta=0):
+        """
+        Return a shared Lamina for these values, creating it if needed
+
+        Equal plies (same material, thickness and angle) map to one
+        instance, so their cached matrices are computed only once.
+        """
+        key = (E1, E2, G12, nu12, t, theta)
+        lamina = cls._interned.get(key)
+        if lamina is None:
+            lamina = cls(E1, E2, G12, nu12, t, theta)
+            cls._interned[key] = lamina
+        return lamina
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Lamina is immutable; cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Lamina is immutable; cannot delete '{name}'")
+
+    def _key(self):
+        return (self.E1, self.E2, self.G12, self.nu12, self.t, self.theta)
+
+    def __eq__(self, other):
+        if not isinstance(other, Lamina):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return (f"Lamina(E1={self.E1}, E2={self.E2}, G12={self.G12}, "
+                f"nu12={self.nu12}, t={self.t}, theta={self.theta})")
+
+    def __reduce__(self):
+        return (self.__class__, self._key())
 
-        # Calculate Q matrix
-        self.Q = self._calculate_Q()
+    @property
+    def Q(self):
+        """Reduced stiffness matrix Q (read-only, cached)"""
+        if self._Q is None:
+            object.__setattr__(self, '_Q', _read_only(self._calculate_Q()))
+        return self._Q
 
-        # Calculate transformed Q-bar matrix
-        self.Qbar = self._calculate_Qbar()
+    @property
+    def Qbar(self):
+        """Transformed reduced stiffness matrix Q-bar (read-only, cached)"""
+        if self._Qbar is None:
+            object.__setattr__(self, '_Qbar', _read_only(self._calculate_Qbar()))
+        return self._Qbar
 
     def _calculate_Q(self):
         """
@@ -113,18 +178,21 @@ class Lamina:
     def get_compliance_matrix(self):
         """
         Calculate compliance matrix S in material coordinates
+        (computed once, then returned from cache)
 
         Returns:
         --------
         S : ndarray (3x3)
-            Compliance matrix
+            Compliance matrix (read-only)
         """
-        S = np.array([
-            [1/self.E1,     -self.nu12/self.E1,  0],
-            [-self.nu12/self.E1,  1/self.E2,      0],
-            [0,             0,                    1/self.G12]
-        ])
-        return S
+        if self._S is None:
+            S = np.array([
+                [1/self.E1,     -self.nu12/self.E1,  0],
+                [-self.nu12/self.E1,  1/self.E2,      0],
+                [0,             0,                    1/self.G12]
+            ])
+            object.__setattr__(self, '_S', _read_only(S))
+        return self._S
 
     def print_properties(self):
         """Print lamina properties"""
@@ -140,3 +208,59 @@ class Lamina:
         print("\nQ-bar matrix (GPa):")
         print(self.Qbar)
         print("=" * 40)
+
+
+def _read_only(array):
+    """Mark a cached matrix read-only so shared instances stay immutable"""
+    array.flags.writeable = False
+    return array
+
+
+def qbar_stack(material_props, theta):
+    """
+    Transformed reduced stiffness Q-bar for an array of ply angles
+
+    Same closed-form transformation as Lamina, evaluated elementwise.
+
+    Parameters:
+    -----------
+    material_props : dict
+        Dictionary with E1, E2, G12, nu12
+    theta : array_like
+        Ply angles (degrees), any shape
+
+    Returns:
+    --------
+    Qbar : ndarray (theta.shape + (3, 3))
+        Transformed reduced stiffness matrices
+    """
+    E1, E2 = material_props['E1'], material_props['E2']
+    G12, nu12 = material_props['G12'], material_props['nu12']
+    nu21 = nu12 * E2 / E1
+    denom = 1 - nu12 * nu21
+
+    Q11 = E1 / denom
+    Q22 = E2 / denom
+    Q12 = nu12 * E2 / denom
+    Q66 = G12
+
+    theta_rad = np.radians(np.asarray(theta, dtype=float))
+    c = np.cos(theta_rad)
+    s = np.sin(theta_rad)
+
+    c2 = c**2
+    s2 = s**2
+    c3 = c**3
+    s3 = s**3
+    c4 = c**4
+    s4 = s**4
+
+    Qbar = np.empty(theta_rad.shape + (3, 3))
+    Qbar[..., 0, 0] = Q11*c4 + 2*(Q12 + 2*Q66)*s2*c2 + Q22*s4
+    Qbar[..., 1, 1] = Q11*s4 + 2*(Q12 + 2*Q66)*s2*c2 + Q22*c4
+    Qbar[..., 0, 1] = Qbar[..., 1, 0] = (Q11 + Q22 - 4*Q66)*s2*c2 + Q12*(s4 + c4)
+    Qbar[..., 2, 2] = (Q11 + Q22 - 2*Q12 - 2*Q66)*s2*c2 + Q66*(s4 + c4)
+    Qbar[..., 0, 2] = Qbar[..., 2, 0] = (Q11 - Q12 - 2*Q66)*s*c3 + (Q12 - Q22 + 2*Q66)*s3*c
+    Qbar[..., 1, 2] = Qbar[..., 2, 1] = (Q11 - Q12 - 2*Q66)*s3*c + (Q12 - Q22 + 2*Q66)*s*c3
+
+    return Qbar
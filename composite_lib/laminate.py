@@ -5,14 +5,32 @@ Calculate A, B, D matrices and perform laminate analysis
 """
 
 import numpy as np
-from .lamina import Lamina
+from .lamina import Lamina, qbar_stack
+from .stacking import StackingBlocks, compile_layup, parse_layup
+from .batch import ANGLE_TOL, batch_is_balanced, batch_is_symmetric
+from .compliance import batch_abd_inverse
 
 
 class Laminate:
     """
     Laminate analysis using Classical Laminated Plate Theory (CLPT)
+
+    Ply data is stored as contiguous arrays (angles, thicknesses, z_coords
+    and an (n, 3, 3) Qbar stack). Lamina objects are only built on first
+    access to `laminae`.
+
+    A laminate built from StackingBlocks keeps the grouped representation
+    in `blocks`; A, B, D come from closed-form block sums, and the per-ply
+    arrays are expanded only when first accessed.
+
+    set_angle, swap, insert_ply and remove_ply edit the laminate in place
+    with local A, B, D updates; set check_edits to verify each edit
+    against a full rebuild.
     """
 
+    # Per-ply attributes expanded on demand for block laminates
+    _PLY_ARRAYS = ('stacking_sequence', 'angles', 'thicknesses', 'z_coords', 'Qbar')
+
     def __init__(self, material_props, stacking_sequence, ply_thickness):
         """
         Initialize laminate
@@ -21,71 +39,112 @@ class Laminate:
         -----------
         material_props : dict
             Dictionary with E1, E2, G12, nu12
-        stacking_sequence : list
+        stacking_sequence : list, str or StackingBlocks
             List of ply angles (degrees), e.g., [0, 90, 0] or [-45, 45]
-            Can use 's' suffix for symmetric, e.g., "0/90/0_s"
+            Can use 's' suffix for symmetric, e.g., "0/90/0_s", and the
+            full laminate code notation, e.g., "[0/±45/90]_2s"
+            or StackingBlocks for repeated sub-laminates
         ply_thickness : float or list
             Thickness of each ply (mm), or single value if all equal
+            (ignored for StackingBlocks, which carry their own thicknesses)
         """
         self.material_props = material_props
+        self.blocks = None
+        self._laminae = None
+
+        # Verify every incremental edit against a full rebuild
+        self.check_edits = False
+
+        if isinstance(stacking_sequence, StackingBlocks):
+            self._init_from_blocks(stacking_sequence)
+            return
 
         # Parse stacking sequence
         if isinstance(stacking_sequence, str):
             self.stacking_sequence = self._parse_stacking_sequence(stacking_sequence)
+            if np.ndim(ply_thickness) == 0:
+                # Per-ply '@t' overrides in the code take precedence
+                ply_thickness = compile_layup(stacking_sequence, ply_thickness)[1]
         else:
             self.stacking_sequence = stacking_sequence
 
+        # Ply arrays
+        self.angles = np.array(self.stacking_sequence, dtype=float)
+        self.n_plies = len(self.angles)
+
         # Handle ply thickness
-        if isinstance(ply_thickness, (int, float)):
-            self.ply_thicknesses = [ply_thickness] * len(self.stacking_sequence)
+        if np.ndim(ply_thickness) == 0:
+            self.thicknesses = np.full(self.n_plies, float(ply_thickness))
         else:
-            self.ply_thicknesses = ply_thickness
-
-        self.n_plies = len(self.stacking_sequence)
-
-        # Create lamina objects
-        self.laminae = self._create_laminae()
+            self.thicknesses = np.array(ply_thickness, dtype=float)
 
         # Calculate laminate properties
-        self.total_thickness = sum(self.ply_thicknesses)
+        self.total_thickness = float(self.thicknesses.sum())
         self.z_coords = self._calculate_z_coordinates()
+        self.Qbar = qbar_stack(material_props, self.angles)
 
         # Calculate ABD matrices
         self.A, self.B, self.D = self._calculate_ABD()
 
-        # Calculate compliance matrices
-        self.ABD = self._assemble_ABD()
-        self.abd = np.linalg.inv(self.ABD)
+        # Compliance matrices are computed on first access
+        self._reset_compliance()
+
+    def _init_from_blocks(self, blocks):
+        """Initialize from StackingBlocks without expanding the plies"""
+        self.blocks = blocks
+        self.n_plies = blocks.n_plies
+        self.total_thickness = blocks.total_thickness
+
+        # Calculate ABD matrices by closed-form block sums
+        self.A, self.B, self.D = blocks.calculate_ABD(self.material_props)
+
+        # Compliance matrices are computed on first access
+        self._reset_compliance()
+
+    def __getattr__(self, name):
+        # Only reached for missing attributes: expand block laminates lazily
+        if name in Laminate._PLY_ARRAYS and self.__dict__.get('blocks') is not None:
+            self._expand_blocks()
+            return self.__dict__[name]
+        raise AttributeError(f"'Laminate' object has no attribute '{name}'")
 
-    def _parse_stacking_sequence(self, seq_str):
+    def _expand_blocks(self):
+        """Materialize per-ply arrays of a block laminate"""
+        self.angles, self.thicknesses = self.blocks.expand()
+        self.stacking_sequence = self.angles.tolist()
+        self.z_coords = self._calculate_z_coordinates()
+        self.Qbar = qbar_stack(self.material_props, self.angles)
+
+    @staticmethod
+    def _parse_stacking_sequence(seq_str):
         """
-        Parse stacking sequence string
-        Examples: "0/90/0_s", "[0/90]_s", "45/-45/0"
+        Parse stacking sequence string (see stacking.parse_layup)
+        Examples: "0/90/0_s", "[0/90]_s", "45/-45/0", "[0/±45/90]_2s"
         """
-        # Remove brackets and spaces
-        seq_str = seq_str.replace('[', '').replace(']', '').replace(' ', '')
+        return parse_layup(seq_str)
 
-        # Check for symmetric notation
-        if '_s' in seq_str.lower() or 's' == seq_str[-1].lower():
-            seq_str = seq_str.replace('_s', '').replace('_S', '').replace('S', '').replace('s', '')
-            angles = [float(x) for x in seq_str.split('/')]
-            # Create symmetric layup
-            angles = angles + angles[::-1]
-        else:
-            angles = [float(x) for x in seq_str.split('/')]
+    @property
+    def ply_thicknesses(self):
+        """Ply thicknesses as a list (compatibility view of `thicknesses`)"""
+        return self.thicknesses.tolist()
 
-        return angles
+    @property
+    def laminae(self):
+        """Lamina objects for each ply, created on first access"""
+        if self._laminae is None:
+            self._laminae = self._create_laminae()
+        return self._laminae
 
     def _create_laminae(self):
-        """Create Lamina objects for each ply"""
+        """Create Lamina objects for each ply (equal plies are shared)"""
         laminae = []
         for i, theta in enumerate(self.stacking_sequence):
-            lamina = Lamina(
+            lamina = Lamina.intern(
                 E1=self.material_props['E1'],
                 E2=self.material_props['E2'],
                 G12=self.material_props['G12'],
                 nu12=self.material_props['nu12'],
-                t=self.ply_thicknesses[i],
+                t=float(self.thicknesses[i]),
                 theta=theta
             )
             laminae.append(lamina)
@@ -101,11 +160,10 @@ class Laminate:
         z : ndarray
             z-coordinates [z0, z1, ..., zn]
         """
-        z = np.zeros(self.n_plies + 1)
-        z[0] = -self.total_thickness / 2
-
-        for i in range(self.n_plies):
-            z[i+1] = z[i] + self.ply_thicknesses[i]
+        z = np.empty(self.n_plies + 1)
+        z[0] = 0.0
+        np.cumsum(self.thicknesses, out=z[1:])
+        z -= self.total_thickness / 2
 
         return z
 
@@ -122,26 +180,59 @@ class Laminate:
         D : ndarray (3x3)
             Bending stiffness matrix
         """
-        A = np.zeros((3, 3))
-        B = np.zeros((3, 3))
-        D = np.zeros((3, 3))
+        z_k = self.z_coords[:-1]
+        z_k1 = self.z_coords[1:]
 
-        for i, lamina in enumerate(self.laminae):
-            z_k = self.z_coords[i]
-            z_k1 = self.z_coords[i+1]
+        # A matrix
+        A = np.tensordot(z_k1 - z_k, self.Qbar, axes=1)
 
-            Qbar = lamina.Qbar
+        # B matrix
+        B = 0.5 * np.tensordot(z_k1**2 - z_k**2, self.Qbar, axes=1)
 
-            # A matrix
-            A += Qbar * (z_k1 - z_k)
+        # D matrix
+        D = (1/3) * np.tensordot(z_k1**3 - z_k**3, self.Qbar, axes=1)
 
-            # B matrix
-            B += 0.5 * Qbar * (z_k1**2 - z_k**2)
+        return A, B, D
 
-            # D matrix
-            D += (1/3) * Qbar * (z_k1**3 - z_k**3)
+    def _reset_compliance(self):
+        """Drop cached ABD/abd after A, B or D changed"""
+        self._ABD = None
+        self._compliance = None
+
+    @property
+    def ABD(self):
+        """6x6 stiffness matrix [[A, B], [B, D]]"""
+        if self._ABD is None:
+            self._ABD = self._assemble_ABD()
+        return self._ABD
+
+    @property
+    def abd(self):
+        """6x6 compliance matrix inv(ABD)"""
+        if self._compliance is None:
+            self._compliance = self._calculate_compliance()
+        return self._compliance[0]
+
+    @property
+    def ill_conditioned(self):
+        """True if ABD is near-singular or not positive definite"""
+        if self._compliance is None:
+            self._compliance = self._calculate_compliance()
+        return self._compliance[1]
+
+    def _calculate_compliance(self):
+        """
+        Invert ABD by its block structure
 
-        return A, B, D
+        Returns:
+        --------
+        abd : ndarray (6x6)
+            Compliance matrix
+        ill_conditioned : bool
+            True if ABD is near-singular or not positive definite
+        """
+        abd, flags = batch_abd_inverse(self.A[None], self.B[None], self.D[None])
+        return abd[0], bool(flags[0])
 
     def _assemble_ABD(self):
         """
@@ -158,6 +249,202 @@ class Laminate:
         ])
         return ABD
 
+    # ------------------------------------------------------------------
+    # Incremental editing
+    #
+    # Edits update A, B, D by the contributions of the affected plies only;
+    # ABD and abd are recomputed lazily (closed form) on the next access.
+    # A ply k contributes (t, (z1² - z0²)/2, (z1³ - z0³)/3) · Qbar_k, and
+    # shifting a group of plies by δ changes its (A, B, D) to
+    # (A, B + δA, D + 2δB + δ²A), so moving plies never needs their Qbar.
+    # ------------------------------------------------------------------
+
+    def set_angle(self, k, angle):
+        """
+        Change the angle of ply k (z-coordinates are unchanged)
+
+        Parameters:
+        -----------
+        k : int
+            Ply index (bottom = 0)
+        angle : float
+            New ply angle (degrees)
+        """
+        self._begin_edit()
+        k = self._ply_index(k)
+        self._add_ply_contribution(k, -1)
+        self.angles[k] = angle
+        self.Qbar[k] = qbar_stack(self.material_props, angle)
+        self._add_ply_contribution(k, 1)
+        self._end_edit()
+
+    def swap(self, i, j):
+        """
+        Exchange plies i and j (angle and thickness)
+
+        Plies in between shift only if the two thicknesses differ.
+        """
+        self._begin_edit()
+        i, j = sorted((self._ply_index(i), self._ply_index(j)))
+        if i == j:
+            return
+        self._add_ply_contribution(i, -1)
+        self._add_ply_contribution(j, -1)
+
+        delta = self.thicknesses[j] - self.thicknesses[i]
+        if delta != 0:
+            self._shift_plies(i + 1, j, delta)
+        for array in (self.angles, self.thicknesses, self.Qbar):
+            array[[i, j]] = array[[j, i]]
+        self.z_coords[i + 1] = self.z_coords[i] + self.thicknesses[i]
+        self.z_coords[j] = self.z_coords[j + 1] - self.thicknesses[j]
+
+        self._add_ply_contribution(i, 1)
+        self._add_ply_contribution(j, 1)
+        self._end_edit()
+
+    def insert_ply(self, k, angle, thickness=None):
+        """
+        Insert a ply so that it becomes ply k
+
+        Parameters:
+        -----------
+        k : int
+            Position of the new ply (0 = bottom, n_plies = top)
+        angle : float
+            Ply angle (degrees)
+        thickness : float, optional
+            Ply thickness (mm); defaults to the thickness of the ply it
+            displaces (or the top ply when appending)
+        """
+        self._begin_edit()
+        if not 0 <= k <= self.n_plies:
+            raise IndexError(f"Ply position {k} out of range 0..{self.n_plies}")
+        if thickness is None:
+            thickness = self.thicknesses[min(k, self.n_plies - 1)]
+
+        # Open a gap of the new thickness by moving the shorter side away
+        # from it, then re-centre the laminate on its new mid-plane
+        if k < self.n_plies - k:
+            z_bottom = self.z_coords[k] - thickness
+            self._shift_plies(0, k, -thickness)
+            recentre = thickness / 2
+        else:
+            z_bottom = self.z_coords[k]
+            self._shift_plies(k, self.n_plies, thickness)
+            recentre = -thickness / 2
+
+        self.angles = np.insert(self.angles, k, angle)
+        self.thicknesses = np.insert(self.thicknesses, k, thickness)
+        self.Qbar = np.insert(self.Qbar, k, qbar_stack(self.material_props, angle), axis=0)
+        self.z_coords = np.insert(self.z_coords, k + 1, z_bottom + thickness)
+        self.z_coords[k] = z_bottom
+        self.n_plies += 1
+        self.total_thickness += thickness
+
+        self._add_ply_contribution(k, 1)
+        self._shift_plies(0, self.n_plies, recentre)
+        self._end_edit()
+
+    def remove_ply(self, k):
+        """Remove ply k and close the gap"""
+        self._begin_edit()
+        k = self._ply_index(k)
+        if self.n_plies == 1:
+            raise ValueError("Cannot remove the only ply of a laminate")
+        thickness = self.thicknesses[k]
+        self._add_ply_contribution(k, -1)
+
+        # Close the gap from the shorter side, then re-centre
+        if k < self.n_plies - 1 - k:
+            self._shift_plies(0, k, thickness)
+            recentre = -thickness / 2
+            self.z_coords = np.delete(self.z_coords, k)
+        else:
+            self._shift_plies(k + 1, self.n_plies, -thickness)
+            recentre = thickness / 2
+            self.z_coords = np.delete(self.z_coords, k + 1)
+
+        self.angles = np.delete(self.angles, k)
+        self.thicknesses = np.delete(self.thicknesses, k)
+        self.Qbar = np.delete(self.Qbar, k, axis=0)
+        self.n_plies -= 1
+        self.total_thickness -= thickness
+
+        self._shift_plies(0, self.n_plies, recentre)
+        self._end_edit()
+
+    def check_consistency(self, rtol=1e-9):
+        """
+        Compare the incrementally updated state against a full rebuild
+
+        Raises:
+        -------
+        RuntimeError
+            If z-coordinates or A, B, D deviate by more than rtol
+            (relative to the largest entry of each matrix)
+        """
+        ref = Laminate(self.material_props, self.angles.tolist(), self.thicknesses)
+        checks = [('z_coords', self.z_coords, ref.z_coords),
+                  ('A', self.A, ref.A), ('B', self.B, ref.B), ('D', self.D, ref.D)]
+        scale = {'z_coords': ref.total_thickness, 'A': np.abs(ref.A).max(),
+                 'B': np.abs(ref.A).max() * ref.total_thickness,
+                 'D': np.abs(ref.D).max()}
+        for name, value, expected in checks:
+            error = np.abs(value - expected).max() / scale[name]
+            if error > rtol:
+                raise RuntimeError(
+                    f"Incremental {name} deviates from rebuild (relative error {error:.2e})")
+
+    def _ply_index(self, k):
+        if not -self.n_plies <= k < self.n_plies:
+            raise IndexError(f"Ply index {k} out of range for {self.n_plies} plies")
+        return k % self.n_plies
+
+    def _begin_edit(self):
+        """Switch block laminates to plain per-ply arrays before editing"""
+        if self.blocks is not None:
+            self._expand_blocks()
+            self.angles = np.array(self.angles)
+            self.thicknesses = np.array(self.thicknesses)
+            self.blocks = None
+        self._laminae = None
+
+    def _end_edit(self):
+        """Refresh derived state after an edit"""
+        self.stacking_sequence = self.angles.tolist()
+        self._reset_compliance()
+        if self.check_edits:
+            self.check_consistency()
+
+    def _add_ply_contribution(self, k, sign):
+        """Add (sign=1) or subtract (sign=-1) the A, B, D terms of ply k"""
+        z0, z1 = self.z_coords[k], self.z_coords[k + 1]
+        Q = sign * self.Qbar[k]
+        self.A = self.A + (z1 - z0) * Q
+        self.B = self.B + 0.5 * (z1**2 - z0**2) * Q
+        self.D = self.D + (1/3) * (z1**3 - z0**3) * Q
+
+    def _shift_plies(self, start, stop, delta):
+        """
+        Move plies start..stop-1 (and interfaces start..stop) by delta
+        along z, updating B and D
+        """
+        if stop <= start or delta == 0:
+            return
+        if start == 0 and stop == self.n_plies:
+            # Whole laminate: its own A and B are the group sums
+            A_seg, B_seg = self.A, self.B
+        else:
+            z_k, z_k1 = self.z_coords[start:stop], self.z_coords[start + 1:stop + 1]
+            Qbar = self.Qbar[start:stop]
+            A_seg = np.tensordot(z_k1 - z_k, Qbar, axes=1)
+            B_seg = 0.5 * np.tensordot(z_k1**2 - z_k**2, Qbar, axes=1)
+
+        self.B = self.B + delta * A_seg
+        self.D = self.D + 2 * delta * B_seg + delta**2 * A_seg
+        self.z_coords[start:stop + 1] += delta
+
     def calculate_strains_curvatures(self, loads):
         """
         Calculate mid-plane strains and curvatures from applied loads
@@ -174,7 +461,15 @@ class Laminate:
             Mid-plane strains [εx0, εy0, γxy0]
         curvatures : ndarray (3,)
             Curvatures [κx, κy, κxy]
+
+        Raises:
+        -------
+        np.linalg.LinAlgError
+            If ABD is near-singular or not positive definite
         """
+        if self.ill_conditioned:
+            raise np.linalg.LinAlgError("ABD matrix is singular or ill-conditioned")
+
         if isinstance(loads, dict):
             N = np.array([loads.get('Nx', 0), loads.get('Ny', 0), loads.get('Nxy', 0)])
             M = np.array([loads.get('Mx', 0), loads.get('My', 0), loads.get('Mxy', 0)])
@@ -182,13 +477,10 @@ class Laminate:
         else:
             load_vector = np.array(loads)
 
-        # Solve for strains and curvatures
-        strain_curvature = self.abd @ load_vector
+        # The cached compliance already passed the conditioning test
+        deformation = self.abd @ load_vector
 
-        strains = strain_curvature[0:3]
-        curvatures = strain_curvature[3:6]
-
-        return strains, curvatures
+        return deformation[:3], deformation[3:]
 
     def calculate_ply_stresses(self, strains, curvatures, ply_index, surface='mid'):
         """
@@ -227,17 +519,146 @@ class Laminate:
         strain_z = strains + z * curvatures
 
         # Get Qbar for this ply
-        Qbar = self.laminae[ply_index].Qbar
+        Qbar = self.Qbar[ply_index]
 
         # Calculate stress in global coordinates
         stress_global = Qbar @ strain_z
 
         # Transform to material coordinates
-        theta = self.laminae[ply_index].theta
+        theta = self.angles[ply_index]
         stress_local = self._transform_stress_to_material(stress_global, theta)
 
         return stress_global, stress_local
 
+    def get_engineering_constants(self):
+        """
+        Effective laminate engineering constants
+
+        Membrane constants come from the in-plane compliance a* = abd[:3, :3],
+        flexural constants from the bending compliance d* = abd[3:, 3:].
+        For symmetric laminates these reduce to inv(A) and inv(D).
+
+        Returns:
+        --------
+        dict : E_x, E_y, G_xy, nu_xy, nu_yx (membrane) and
+               E_fx, E_fy, G_fxy, nu_fxy (flexural), moduli in GPa
+        """
+        constants = self.get_engineering_constants_polar(0.0)
+        return {key: float(value[0]) for key, value in constants.items()}
+
+    def get_engineering_constants_polar(self, theta):
+        """
+        Effective engineering constants along arbitrary in-plane directions
+
+        The laminate compliance is rotated in closed form,
+        a'(θ) = T(-θ)ᵀ a T(-θ), for all directions at once instead of
+        rebuilding a rotated laminate per angle.
+
+        Parameters:
+        -----------
+        theta : float or array_like
+            Directions measured from the laminate x-axis (degrees)
+
+        Returns:
+        --------
+        dict : arrays of E_x, E_y, G_xy, nu_xy, nu_yx, E_fx, E_fy, G_fxy,
+               nu_fxy, one value per direction
+        """
+        theta = np.atleast_1d(np.asarray(theta, dtype=float))
+        h = self.total_thickness
+
+        T = self._stress_transformation_matrices(-theta)
+        a = np.einsum('kji,jl,klm->kim', T, self.abd[:3, :3], T)
+        d = np.einsum('kji,jl,klm->kim', T, self.abd[3:, 3:], T)
+
+        return {
+            'E_x': 1 / (h * a[:, 0, 0]),
+            'E_y': 1 / (h * a[:, 1, 1]),
+            'G_xy': 1 / (h * a[:, 2, 2]),
+            'nu_xy': -a[:, 0, 1] / a[:, 0, 0],
+            'nu_yx': -a[:, 0, 1] / a[:, 1, 1],
+            'E_fx': 12 / (h**3 * d[:, 0, 0]),
+            'E_fy': 12 / (h**3 * d[:, 1, 1]),
+            'G_fxy': 12 / (h**3 * d[:, 2, 2]),
+            'nu_fxy': -d[:, 0, 1] / d[:, 0, 0],
+        }
+
+    def calculate_stress_field(self, strains, curvatures, points_per_ply=2):
+        """
+        Calculate through-thickness stresses for all plies at once
+
+        Each ply is sampled at points_per_ply evenly spaced z-positions from
+        its bottom to its top surface (2 gives bottom and top only).
+
+        Parameters:
+        -----------
+        strains : ndarray (3,)
+            Mid-plane strains
+        curvatures : ndarray (3,)
+            Curvatures
+        points_per_ply : int
+            Number of sample points per ply (>= 2)
+
+        Returns:
+        --------
+        z : ndarray (n_plies * points_per_ply,)
+            z-coordinates of the sample points, bottom to top
+        stress_global : ndarray (n_plies * points_per_ply, 3)
+            Stresses in global coordinates [σx, σy, τxy]
+        stress_local : ndarray (n_plies * points_per_ply, 3)
+            Stresses in material coordinates [σ1, σ2, τ12]
+        """
+        if points_per_ply < 2:
+            raise ValueError("points_per_ply must be at least 2")
+
+        z_k = self.z_coords[:-1, None]
+        z_k1 = self.z_coords[1:, None]
+        frac = np.linspace(0.0, 1.0, points_per_ply)[None, :]
+        z = z_k + (z_k1 - z_k) * frac                        # (n, p)
+
+        strain_z = (np.asarray(strains)[None, None, :]
+                    + z[..., None] * np.asarray(curvatures)[None, None, :])
+
+        stress_global = np.einsum('kij,kpj->kpi', self.Qbar, strain_z)
+
+        T = self._stress_transformation_matrices(self.angles)
+        stress_local = np.einsum('kij,kpj->kpi', T, stress_global)
+
+        return (z.ravel(), stress_global.reshape(-1, 3),
+                stress_local.reshape(-1, 3))
+
+    @staticmethod
+    def _stress_transformation_matrices(thetas):
+        """
+        Stack of stress transformation matrices T(θ) for an array of angles
+
+        Parameters:
+        -----------
+        thetas : ndarray (n,)
+            Ply angles (degrees)
+
+        Returns:
+        --------
+        T : ndarray (n, 3, 3)
+            Global-to-material stress transformation matrices
+        """
+        theta_rad = np.radians(thetas)
+        c = np.cos(theta_rad)
+        s = np.sin(theta_rad)
+
+        T = np.empty(theta_rad.shape + (3, 3))
+        T[..., 0, 0] = c**2
+        T[..., 0, 1] = s**2
+        T[..., 0, 2] = 2*s*c
+        T[..., 1, 0] = s**2
+        T[..., 1, 1] = c**2
+        T[..., 1, 2] = -2*s*c
+        T[..., 2, 0] = -s*c
+        T[..., 2, 1] = s*c
+        T[..., 2, 2] = c**2 - s**2
+
+        return T
+
     def _transform_stress_to_material(self, stress_global, theta):
         """
         Transform stress from global to material coordinates
@@ -268,24 +689,15 @@ class Laminate:
 
         return stress_local
 
-    def is_symmetric(self):
-        """Check if laminate is symmetric"""
-        n = len(self.stacking_sequence)
-        for i in range(n // 2):
-            if self.stacking_sequence[i] != self.stacking_sequence[-(i+1)]:
-                return False
-        return True
-
-    def is_balanced(self):
-        """Check if laminate is balanced"""
-        angles = np.array(self.stacking_sequence)
-        for angle in np.unique(angles):
-            if angle != 0 and angle != 90:
-                count_pos = np.sum(angles == angle)
-                count_neg = np.sum(angles == -angle)
-                if count_pos != count_neg:
-                    return False
-        return True
+    def is_symmetric(self, atol=ANGLE_TOL):
+        """Check if laminate is symmetric (angles within atol and thicknesses)"""
+        return bool(batch_is_symmetric(self.angles[None], self.thicknesses[None],
+                                       atol=atol)[0])
+
+    def is_balanced(self, atol=ANGLE_TOL):
+        """Check if laminate is balanced (equal ±θ thickness, angles within atol)"""
+        return bool(batch_is_balanced(self.angles[None], self.thicknesses[None],
+                                      atol=atol)[0])
 
     def print_properties(self):
         """Print laminate properties"""
@@ -0,0 +1,161 @@
+"""
+Lamination Parameters Module
+Tsai-Pagano lamination parameters and material invariants
+"""
+
+import numpy as np
+from .batch import batch_z_coordinates
+
+
+# Order of the 12 lamination parameters in every returned vector
+LAMINATION_PARAMETER_NAMES = ('xi1A', 'xi2A', 'xi3A', 'xi4A',
+                              'xi1B', 'xi2B', 'xi3B', 'xi4B',
+                              'xi1D', 'xi2D', 'xi3D', 'xi4D')
+
+
+def material_invariants(material_props):
+    """
+    Tsai-Pagano stiffness invariants U1..U5 of a material
+
+    Parameters:
+    -----------
+    material_props : dict
+        Dictionary with E1, E2, G12, nu12
+
+    Returns:
+    --------
+    U : ndarray (5,)
+        [U1, U2, U3, U4, U5]
+    """
+    E1, E2 = material_props['E1'], material_props['E2']
+    G12, nu12 = material_props['G12'], material_props['nu12']
+    denom = 1 - nu12 * nu12 * E2 / E1
+
+    Q11, Q22, Q12, Q66 = E1 / denom, E2 / denom, nu12 * E2 / denom, G12
+
+    return np.array([
+        (3*Q11 + 3*Q22 + 2*Q12 + 4*Q66) / 8,
+        (Q11 - Q22) / 2,
+        (Q11 + Q22 - 2*Q12 - 4*Q66) / 8,
+        (Q11 + Q22 + 6*Q12 - 4*Q66) / 8,
+        (Q11 + Q22 - 2*Q12 + 4*Q66) / 8,
+    ])
+
+
+def lamination_parameters(angles, thicknesses):
+    """
+    Lamination parameters of a batch of layups
+
+    With normalized through-thickness weights
+
+        ξA = 1/h ∫ f dz,   ξB = 4/h² ∫ z f dz,   ξD = 12/h³ ∫ z² f dz
+
+    for f = (cos 2θ, cos 4θ, sin 2θ, sin 4θ). All values lie in [-1, 1] and,
+    together with the material invariants, determine A, B and D.
+
+    Parameters:
+    -----------
+    angles : ndarray (N, n)
+        Ply angles (degrees)
+    thicknesses : ndarray (N, n)
+        Ply thicknesses (mm)
+
+    Returns:
+    --------
+    xi : ndarray (N, 12)
+        Parameters in LAMINATION_PARAMETER_NAMES order
+    """
+    angles = np.atleast_2d(np.asarray(angles, dtype=float))
+    thicknesses = np.broadcast_to(np.asarray(thicknesses, dtype=float), angles.shape)
+
+    z = batch_z_coordinates(thicknesses)
+    z_k, z_k1 = z[:, :-1], z[:, 1:]
+    h = z[:, -1:] - z[:, :1]
+
+    theta = np.radians(angles)
+    f = np.stack([np.cos(2*theta), np.cos(4*theta),
+                  np.sin(2*theta), np.sin(4*theta)], axis=-1)
+
+    weights = [(z_k1 - z_k) / h,
+               2 * (z_k1**2 - z_k**2) / h**2,
+               4 * (z_k1**3 - z_k**3) / h**3]
+    return np.concatenate([np.einsum('nk,nkj->nj', w, f) for w in weights], axis=1)
+
+
+def abd_from_lamination_parameters(material_props, xi, h):
+    """
+    A, B, D matrices from lamination parameters (inverse of the above)
+
+    Parameters:
+    -----------
+    material_props : dict
+        Dictionary with E1, E2, G12, nu12
+    xi : ndarray (N, 12)
+        Lamination parameters
+    h : float or ndarray (N,)
+        Laminate thickness (mm)
+
+    Returns:
+    --------
+    A, B, D : ndarray (N, 3, 3)
+    """
+    U1, U2, U3, U4, U5 = material_invariants(material_props)
+    xi = np.atleast_2d(xi)
+    h = np.broadcast_to(np.asarray(h, dtype=float), xi.shape[:1])
+
+    def matrix(x, scale, with_isotropic):
+        x1, x2, x3, x4 = x.T
+        iso = 1.0 if with_isotropic else 0.0
+        M = np.empty((len(x), 3, 3))
+        M[:, 0, 0] = iso*U1 + U2*x1 + U3*x2
+        M[:, 1, 1] = iso*U1 - U2*x1 + U3*x2
+        M[:, 0, 1] = M[:, 1, 0] = iso*U4 - U3*x2
+        M[:, 2, 2] = iso*U5 - U3*x2
+        M[:, 0, 2] = M[:, 2, 0] = U2/2*x3 + U3*x4
+        M[:, 1, 2] = M[:, 2, 1] = U2/2*x3 - U3*x4
+        return scale[:, None, None] * M
+
+    A = matrix(xi[:, 0:4], h, True)
+    B = matrix(xi[:, 4:8], h**2 / 4, False)
+    D = matrix(xi[:, 8:12], h**3 / 12, True)
+    return A, B, D
+
+
+def lamination_parameters_from_abd(material_props, A, B, D, h):
+    """
+    Lamination parameters reproducing given A, B, D (least squares)
+
+    Useful for turning a stiffness target into a point in lamination
+    parameter space.
+
+    Parameters:
+    -----------
+    material_props : dict
+        Dictionary with E1, E2, G12, nu12
+    A, B, D : ndarray (3, 3) or (N, 3, 3)
+        Target stiffness matrices (B may be zeros)
+    h : float or ndarray (N,)
+        Laminate thickness (mm)
+
+    Returns:
+    --------
+    xi : ndarray (N, 12)
+    """
+    U1, U2, U3, U4, U5 = material_invariants(material_props)
+    A, B, D = (np.asarray(M, dtype=float).reshape(-1, 3, 3) for M in (A, B, D))
+    h = np.broadcast_to(np.asarray(h, dtype=float), A.shape[:1])
+
+    def parameters(M, scale, with_isotropic):
+        M = M / scale[:, None, None]
+        iso = 1.0 if with_isotropic else 0.0
+        x1 = (M[:, 0, 0] - M[:, 1, 1]) / (2*U2)
+        # ξ2 enters M11, M22, M12 and M66 with the same weight U3
+        x2 = (M[:, 0, 0] + M[:, 1, 1] - M[:, 0, 1] - M[:, 2, 2]
+              + iso*(U4 + U5 - 2*U1)) / (4*U3)
+        x3 = (M[:, 0, 2] + M[:, 1, 2]) / U2
+        x4 = (M[:, 0, 2] - M[:, 1, 2]) / (2*U3)
+        return np.stack([x1, x2, x3, x4], axis=1)
+
+    return np.concatenate([parameters(A, h, True),
+                           parameters(B, h**2 / 4, False),
+                           parameters(D, h**3 / 12, True)], axis=1)
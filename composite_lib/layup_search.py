@@ -0,0 +1,242 @@
+"""
+Layup Search Module
+Nearest-neighbour retrieval of layups in lamination-parameter space
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .lamination import lamination_parameters, lamination_parameters_from_abd
+
+
+# Column slices of the A, B and D groups in a lamination-parameter vector
+_GROUPS = {'A': slice(0, 4), 'B': slice(4, 8), 'D': slice(8, 12)}
+
+# |ξ| below which B- or A16/A26-type parameters count as zero in filters
+_ZERO_TOL = 1e-9
+
+
+def lamination_target(material_props, A, D, h, B=None):
+    """
+    Lamination parameters of a stiffness target
+
+    Parameters:
+    -----------
+    material_props : dict
+        Dictionary with E1, E2, G12, nu12
+    A, D : ndarray (3, 3)
+        Target extensional and bending stiffness
+    h : float
+        Laminate thickness (mm)
+    B : ndarray (3, 3), optional
+        Target coupling stiffness (default zero)
+
+    Returns:
+    --------
+    xi : ndarray (12,)
+    """
+    if B is None:
+        B = np.zeros((3, 3))
+    return lamination_parameters_from_abd(material_props, A, B, D, h)[0]
+
+
+class LaminationIndex:
+    """
+    KD-tree over the lamination parameters of many candidate layups
+
+    k-nearest and radius queries return the candidates whose stiffness is
+    closest to a target (in lamination-parameter space, optionally with
+    per-group weights), subject to constraint filters.
+
+    Example:
+    --------
+    >>> index = LaminationIndex.from_layups(angles, 0.125)
+    >>> target = lamination_target(material, A_target, D_target, h)
+    >>> distances, rows = index.nearest(target, k=5, balanced=True)
+    """
+
+    def __init__(self, xi, n_plies=None, thickness=None, labels=None,
+                 groups=('A', 'B', 'D'), weights=None):
+        """
+        Build the index
+
+        Parameters:
+        -----------
+        xi : ndarray (N, 12)
+            Lamination parameters of the candidates
+        n_plies : ndarray (N,), optional
+            Ply counts (enables min_plies / max_plies filters)
+        thickness : ndarray (N,), optional
+            Laminate thicknesses (enables min_thickness / max_thickness)
+        labels : list or callable, optional
+            Layup codes, or a function mapping row indices to codes
+        groups : tuple of str
+            Parameter groups ('A', 'B', 'D') that span the search space
+        weights : dict, optional
+            Distance weight per group, e.g. {'A': 1.0, 'D': 2.0}
+        """
+        self.xi = np.asarray(xi, dtype=float)
+        self.n_plies = None if n_plies is None else np.asarray(n_plies)
+        self.thickness = None if thickness is None else np.asarray(thickness, dtype=float)
+        self.labels = labels
+        self.groups = tuple(groups)
+        self.rows = None
+
+        weights = weights or {}
+        self._columns = np.concatenate([np.arange(12)[_GROUPS[g]] for g in self.groups])
+        self._scale = np.concatenate([np.full(4, float(weights.get(g, 1.0)))
+                                      for g in self.groups])
+        self.tree = cKDTree(self.xi[:, self._columns] * self._scale)
+
+    def __len__(self):
+        return len(self.xi)
+
+    @classmethod
+    def from_layups(cls, angles, thicknesses, n_plies=None, labels=None, **kwargs):
+        """
+        Index padded layup arrays (e.g. concatenated enumeration chunks)
+
+        Parameters:
+        -----------
+        angles : ndarray (N, n)
+            Ply angles (degrees)
+        thicknesses : float or ndarray (N, n)
+            Ply thicknesses (mm), zero for padding
+        n_plies : ndarray (N,), optional
+            Ply counts (default: all columns)
+        """
+        angles = np.atleast_2d(np.asarray(angles, dtype=float))
+        thicknesses = np.broadcast_to(np.asarray(thicknesses, dtype=float), angles.shape)
+        if n_plies is None:
+            n_plies = np.full(len(angles), angles.shape[1])
+        if labels is None:
+            def labels(rows):
+                return ['/'.join(f"{a:g}" for a in angles[r, :n_plies[r]]) for r in rows]
+        return cls(lamination_parameters(angles, thicknesses), n_plies,
+                   thicknesses.sum(axis=1), labels, **kwargs)
+
+    @classmethod
+    def from_catalog(cls, catalog, material_props, **kwargs):
+        """
+        Index every layup of one material stored in a LayupCatalog
+
+        Returned row indices refer to positions in this index; `rows` maps
+        them back to catalog records.
+        """
+        rows, n_plies = catalog.material_rows(material_props, return_plies=True)
+        records = catalog.records[rows]
+
+        def labels(indices):
+            return catalog.codes(rows[indices])
+
+        index = cls(records['xi'], n_plies, records['h'], labels, **kwargs)
+        index.rows = rows
+        return index
+
+    def label(self, indices):
+        """Layup codes of result indices"""
+        if self.labels is None:
+            return None
+        if callable(self.labels):
+            return self.labels(np.atleast_1d(indices))
+        return [self.labels[i] for i in np.atleast_1d(indices)]
+
+    def nearest(self, target, k=1, **filters):
+        """
+        k layups closest to a target
+
+        Parameters:
+        -----------
+        target : ndarray (12,)
+            Target lamination parameters (see lamination_target)
+        k : int
+            Number of results
+        **filters
+            Constraints, see `mask`
+
+        Returns:
+        --------
+        distances : ndarray (<= k,)
+            Weighted Euclidean distances, ascending
+        indices : ndarray (<= k,)
+            Candidate rows
+        """
+        point = self._point(target)
+        n = len(self)
+        if not filters:
+            distances, indices = self.tree.query(point, k=min(k, n))
+            return np.atleast_1d(distances), np.atleast_1d(indices)
+
+        # Widen the candidate set until k of them satisfy the filters
+        m = min(4 * k, n)
+        while True:
+            distances, indices = self.tree.query(point, k=m)
+            distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+            keep = self.mask(indices, **filters)
+            if keep.sum() >= k or m == n:
+                return distances[keep][:k], indices[keep][:k]
+            m = min(4 * m, n)
+
+    def within(self, target, radius, **filters):
+        """
+        All layups within a distance of a target, nearest first
+
+        Returns:
+        --------
+        distances, indices : ndarray
+        """
+        point = self._point(target)
+        indices = np.asarray(self.tree.query_ball_point(point, radius), dtype=np.intp)
+        if filters:
+            indices = indices[self.mask(indices, **filters)]
+        distances = np.linalg.norm(self.tree.data[indices] - point, axis=1)
+        order = np.argsort(distances, kind='stable')
+        return distances[order], indices[order]
+
+    def mask(self, indices, min_plies=None, max_plies=None, min_thickness=None,
+             max_thickness=None, uncoupled=None, balanced=None, where=None):
+        """
+        Constraint filter on candidate rows
+
+        Parameters:
+        -----------
+        indices : ndarray
+            Candidate rows
+        min_plies, max_plies : int, optional
+            Ply count range (requires n_plies)
+        min_thickness, max_thickness : float, optional
+            Thickness range in mm (requires thickness)
+        uncoupled : bool, optional
+            Require B = 0 (all ξB zero), e.g. symmetric layups
+        balanced : bool, optional
+            Require A16 = A26 = 0 (ξ3A = ξ4A = 0)
+        where : ndarray (N,) of bool, optional
+            Arbitrary precomputed mask over all candidates
+
+        Returns:
+        --------
+        keep : ndarray of bool, one per index
+        """
+        keep = np.ones(len(indices), dtype=bool)
+        if min_plies is not None or max_plies is not None:
+            if self.n_plies is None:
+                raise ValueError("Index was built without ply counts")
+            n = self.n_plies[indices]
+            keep &= (n >= (min_plies or 0)) & (n <= (max_plies or np.inf))
+        if min_thickness is not None or max_thickness is not None:
+            if self.thickness is None:
+                raise ValueError("Index was built without thicknesses")
+            h = self.thickness[indices]
+            keep &= (h >= (min_thickness or 0.0)) & (h <= (max_thickness or np.inf))
+        if uncoupled is not None:
+            zero_B = np.all(np.abs(self.xi[indices, 4:8]) <= _ZERO_TOL, axis=1)
+            keep &= zero_B == uncoupled
+        if balanced is not None:
+            zero_shear = np.all(np.abs(self.xi[indices, 2:4]) <= _ZERO_TOL, axis=1)
+            keep &= zero_shear == balanced
+        if where is not None:
+            keep &= np.asarray(where)[indices]
+        return keep
+
+    def _point(self, target):
+        return np.asarray(target, dtype=float)[self._columns] * self._scale
@@ -0,0 +1,197 @@
+"""
+Parallel Sweep Module
+Process-pool evaluation of sweeps into shared-memory or memory-mapped arrays
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .results import SweepResults
+from .sweeps import SWEEP_CHUNK_ROWS, _Study
+
+
+# Smallest task (result rows) handed to a worker; below this the per-task
+# overhead outweighs the work
+MIN_TASK_ROWS = 256
+
+# Target number of tasks per worker; the first tasks are large, the last
+# ones small, so workers finish together
+TASKS_PER_WORKER = 4
+
+# Per-process state set by _init_worker (the study and attached arrays)
+_worker = {}
+
+
+def parallel_sweep(spec, fields=(), processes=None, path=None,
+                   min_task_rows=MIN_TASK_ROWS, max_task_rows=SWEEP_CHUNK_ROWS):
+    """
+    Evaluate a sweep (see sweep) across a pool of worker processes
+
+    The layups are compiled once and placed in shared memory. The result
+    rows of the sweep are preallocated, in shared memory or in the .npy
+    files of a SweepResults directory, and every worker writes its rows in
+    place, so no result array is ever pickled. Tasks follow guided
+    scheduling: their size shrinks from max_task_rows towards
+    min_task_rows as the remaining work drops. Each row is computed from
+    its own inputs only and lands at a fixed position, so the output is
+    bitwise identical to a serial sweep for any worker count.
+
+    Parameters:
+    -----------
+    spec : dict
+        Sweep specification (see sweep); the layup iterable is consumed up
+        front to size the outputs
+    fields : tuple of str
+        Optional result fields (see sweep)
+    processes : int, optional
+        Worker processes (default: all CPUs); 1 runs in this process
+    path : str, optional
+        Directory for disk-backed results (default: in memory)
+    min_task_rows, max_task_rows : int
+        Bounds on the result rows of one task
+
+    Returns:
+    --------
+    results : SweepResults
+        All rows in sweep order, one field per chunk key of sweep()
+
+    Raises:
+    -------
+    ValueError
+        If spec['layups'] holds no layups (the field layout is taken from
+        the first one)
+    """
+    study = _Study.from_spec(spec, fields)
+    layups = [item for item in spec['layups']
+              if not (isinstance(item, np.ndarray) and item.ndim == 2 and len(item) == 0)]
+    if not layups:
+        raise ValueError("parallel_sweep: no layups in spec['layups']")
+    angles, plies, n_plies = study.compile(layups)
+    per_layup = study.rows_per_layup
+    n_layups = len(angles)
+    n_rows = n_layups * per_layup
+
+    # Field layout from a one-layup dry run
+    probe = study.evaluate_arrays(angles[:1], plies[:1], n_plies[:1], 0, 0)
+    schema = {name: (value.shape[1:], value.dtype.str) for name, value in probe.items()}
+
+    processes = processes or os.cpu_count() or 1
+    tasks = list(_tasks(n_layups, per_layup, processes, min_task_rows, max_task_rows))
+
+    segments, inputs, outputs = [], {}, {}
+    try:
+        # Every array as a local view plus a handle the workers can attach to
+        input_handles, output_handles = {}, {}
+        for name, array in (('angles', angles), ('plies', plies), ('n_plies', n_plies)):
+            shm = _create_segment(array.shape, array.dtype)
+            segments.append(shm)
+            inputs[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            inputs[name][...] = array
+            input_handles[name] = ('shm', shm.name, array.shape, array.dtype.str)
+
+        if path is not None:
+            results = SweepResults(schema, n_rows, path=path,
+                                   attrs={'materials': study.materials})
+        for name, (shape, dtype) in schema.items():
+            if path is None:
+                shm = _create_segment((n_rows,) + shape, dtype)
+                segments.append(shm)
+                outputs[name] = np.ndarray((n_rows,) + shape, dtype=dtype, buffer=shm.buf)
+                output_handles[name] = ('shm', shm.name, (n_rows,) + shape, dtype)
+            else:
+                outputs[name] = open_memmap(results.field_path(name), mode='r+')
+                output_handles[name] = ('npy', results.field_path(name))
+
+        if processes == 1:
+            _worker.update(study=study, inputs=inputs, outputs=outputs)
+            try:
+                for task in tasks:
+                    _run_task(*task)
+            finally:
+                _worker.clear()
+        else:
+            with ProcessPoolExecutor(processes, initializer=_init_worker,
+                                     initargs=(study, input_handles, output_handles)) as pool:
+                for _ in pool.map(_run_task, *zip(*tasks)):
+                    pass
+
+        if path is None:
+            results = SweepResults(schema, n_rows)
+            results.write(0, **outputs)
+        else:
+            results.mark_written(n_rows)
+            results.flush()
+        return results
+    finally:
+        # Views must be released before their segments can close
+        inputs.clear()
+        outputs.clear()
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+def _tasks(n_layups, per_layup, processes, min_rows, max_rows):
+    """
+    Guided schedule of (first layup, last layup + 1, first row) tasks
+
+    Each task takes a share of the remaining rows proportional to
+    1 / (TASKS_PER_WORKER * processes), clipped to [min_rows, max_rows].
+    """
+    start = 0
+    while start < n_layups:
+        remaining = (n_layups - start) * per_layup
+        rows = int(np.clip(remaining // (TASKS_PER_WORKER * processes), min_rows, max_rows))
+        stop = min(n_layups, start + max(1, rows // per_layup))
+        yield start, stop, start * per_layup
+        start = stop
+
+
+def _create_segment(shape, dtype):
+    """New shared memory segment large enough for an array"""
+    size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return shared_memory.SharedMemory(create=True, size=max(1, size))
+
+
+def _attach(name, shape, dtype):
+    """
+    Attach to an existing shared memory segment as an array
+
+    Pool workers share the resource tracker of the creating process, so the
+    segment stays owned (and is unlinked) by the creator.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _init_worker(study, inputs, outputs):
+    """Attach the input and output arrays once per worker process"""
+    segments = []
+
+    def attach(handle):
+        if handle[0] == 'npy':
+            return open_memmap(handle[1], mode='r+')
+        shm, array = _attach(*handle[1:])
+        segments.append(shm)
+        return array
+
+    _worker.update(study=study, segments=segments,
+                   inputs={name: attach(handle) for name, handle in inputs.items()},
+                   outputs={name: attach(handle) for name, handle in outputs.items()})
+
+
+def _run_task(start, stop, first_row):
+    """Evaluate layups start:stop and write their rows in place"""
+    inputs, outputs = _worker['inputs'], _worker['outputs']
+    chunk = _worker['study'].evaluate_arrays(
+        inputs['angles'][start:stop], inputs['plies'][start:stop],
+        inputs['n_plies'][start:stop], start, first_row)
+
+    rows = slice(first_row, first_row + len(chunk['index']))
+    for name, value in chunk.items():
+        outputs[name][rows] = value
+    return rows.stop - rows.start
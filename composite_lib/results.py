@@ -0,0 +1,289 @@
+"""
+Sweep Results Module
+Preallocated, optionally memory-mapped result arrays for parameter sweeps
+"""
+
+import json
+import os
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+
+# Metadata file of a disk-backed result set
+_SCHEMA_FILE = 'schema.json'
+
+
+def sweep_schema(n_plies, stiffness=True, loads=True, stresses=True, dtype='f8'):
+    """
+    Standard field layout of a laminate sweep
+
+    Parameters:
+    -----------
+    n_plies : int
+        Maximum number of plies (layups are padded to this width)
+    stiffness : bool
+        Include A, B, D
+    loads : bool
+        Include loads, strains and curvatures
+    stresses : bool
+        Include global and material-axis ply stresses at the bottom and
+        top surface of every ply (requires loads)
+    dtype : dtype
+        Storage dtype of the floating-point fields
+
+    Returns:
+    --------
+    schema : dict
+        Field name -> (per-row shape, dtype)
+    """
+    schema = {
+        'angles': ((n_plies,), dtype),
+        'thicknesses': ((n_plies,), dtype),
+        'n_plies': ((), 'i4'),
+        'material': ((4,), 'f8'),
+    }
+    if stiffness:
+        schema.update({'A': ((3, 3), dtype), 'B': ((3, 3), dtype), 'D': ((3, 3), dtype)})
+    if loads:
+        schema.update({'loads': ((6,), dtype), 'strains': ((3,), dtype),
+                       'curvatures': ((3,), dtype)})
+        if stresses:
+            schema.update({'stresses': ((n_plies, 2, 3), dtype),
+                           'material_stresses': ((n_plies, 2, 3), dtype)})
+    return schema
+
+
+class SweepResults:
+    """
+    Column store for the results of a sweep
+
+    Every field is one preallocated array of shape (capacity,) + field
+    shape, either in memory or as a .npy file memory-mapped from a
+    directory. Chunks are written in place (no per-value Python objects),
+    and a saved result set reopens without copying, so plots and analyses
+    read only the pages they touch.
+
+    Example:
+    --------
+    >>> results = SweepResults(sweep_schema(8), 10**7, path='sweep.results')
+    >>> results.append(angles=chunk, A=A, B=B, D=D)
+    >>> results.close()
+    >>> A11 = SweepResults.open('sweep.results')['A'][:, 0, 0]
+    """
+
+    def __init__(self, schema, capacity, path=None, attrs=None):
+        """
+        Allocate a new result set
+
+        Parameters:
+        -----------
+        schema : dict
+            Field name -> (per-row shape, dtype), e.g. from sweep_schema
+        capacity : int
+            Number of rows to preallocate
+        path : str, optional
+            Directory for disk-backed storage (default: in memory)
+        attrs : dict, optional
+            JSON-serializable metadata stored with the results
+        """
+        self.schema = {name: (tuple(shape), np.dtype(dtype).str)
+                       for name, (shape, dtype) in schema.items()}
+        self.capacity = int(capacity)
+        self.path = path
+        self.attrs = dict(attrs or {})
+        self.mode = 'w+'
+        self._n_rows = 0
+
+        if path is None:
+            self._arrays = {name: np.zeros((self.capacity,) + shape, dtype=dtype)
+                            for name, (shape, dtype) in self.schema.items()}
+        else:
+            os.makedirs(path, exist_ok=True)
+            self._arrays = {name: open_memmap(self.field_path(name), mode='w+', dtype=dtype,
+                                              shape=(self.capacity,) + shape)
+                            for name, (shape, dtype) in self.schema.items()}
+            self._write_schema()
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """
+        Reopen a disk-backed result set without copying
+
+        Parameters:
+        -----------
+        path : str
+            Directory written by a previous SweepResults
+        mode : str
+            'r' for read-only arrays, 'r+' to continue writing
+
+        Returns:
+        --------
+        results : SweepResults
+        """
+        if mode not in ('r', 'r+'):
+            raise ValueError(f"Unsupported mode: {mode!r} (use 'r' or 'r+')")
+        with open(os.path.join(path, _SCHEMA_FILE)) as f:
+            meta = json.load(f)
+
+        results = cls.__new__(cls)
+        results.schema = {name: (tuple(shape), dtype)
+                          for name, (shape, dtype) in meta['fields'].items()}
+        results.capacity = meta['capacity']
+        results.path = path
+        results.attrs = meta.get('attrs', {})
+        results.mode = mode
+        results._n_rows = meta['rows']
+        results._arrays = {name: open_memmap(results.field_path(name), mode=mode)
+                           for name in results.schema}
+        return results
+
+    def __len__(self):
+        return self._n_rows
+
+    def __repr__(self):
+        where = 'memory' if self.path is None else repr(self.path)
+        return (f"SweepResults({len(self)}/{self.capacity} rows, "
+                f"fields {list(self.schema)}, {where})")
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __getitem__(self, name):
+        """Written rows of a field (a view, never a copy)"""
+        return self._arrays[name][:self._n_rows]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def fields(self):
+        return list(self.schema)
+
+    def arrays(self):
+        """Dict of all fields, written rows only"""
+        return {name: self[name] for name in self.schema}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, **chunk):
+        """
+        Write a chunk after the last written row
+
+        Parameters:
+        -----------
+        **chunk : ndarray
+            Field name -> array of shape (m,) + field shape (or broadcastable
+            to it); fields not given are left zero
+
+        Returns:
+        --------
+        rows : slice
+            Rows the chunk was written to
+        """
+        return self.write(self._n_rows, **chunk)
+
+    def write(self, start, **chunk):
+        """
+        Write a chunk at rows start, start + 1, ... (e.g. from out-of-order
+        workers); the written-row count becomes the largest row written + 1
+
+        Returns:
+        --------
+        rows : slice
+        """
+        if self.mode == 'r':
+            raise ValueError("Result set is open read-only")
+        unknown = set(chunk) - set(self.schema)
+        if unknown:
+            raise KeyError(f"Fields not in schema: {sorted(unknown)}")
+        if not chunk:
+            return slice(start, start)
+
+        # Row count from the arrays that carry a leading row axis
+        chunk = {name: np.asarray(value) for name, value in chunk.items()}
+        m = max((len(value) for name, value in chunk.items()
+                 if value.ndim > len(self.schema[name][0])), default=1)
+        stop = start + m
+        if stop > self.capacity:
+            raise ValueError(f"Chunk rows {start}:{stop} exceed capacity {self.capacity}")
+
+        for name, value in chunk.items():
+            target = self._arrays[name][start:stop]
+            if value.ndim == target.ndim and value.shape[1:] != target.shape[1:]:
+                # Narrower per-row arrays (e.g. fewer plies) fill the leading
+                # part of each row, the rest is zeroed like layup padding
+                target[...] = 0
+                target = target[tuple(slice(0, k) for k in value.shape)]
+            target[...] = np.broadcast_to(value, target.shape)
+        self._n_rows = max(self._n_rows, stop)
+        return slice(start, stop)
+
+    def update(self, chunk):
+        """
+        Append the schema fields of a sweep chunk (other keys are ignored),
+        so a SweepResults can be passed to reduce_sweep like a reducer
+        """
+        return self.append(**{name: value for name, value in chunk.items()
+                              if name in self.schema})
+
+    def mark_written(self, n_rows):
+        """
+        Extend the written-row count to n_rows, for rows filled through the
+        field files by other processes (see parallel_sweep)
+        """
+        if not 0 <= n_rows <= self.capacity:
+            raise ValueError(f"Row count {n_rows} outside capacity {self.capacity}")
+        self._n_rows = max(self._n_rows, int(n_rows))
+
+    def field_path(self, name):
+        """.npy file of a field of a disk-backed result set"""
+        if self.path is None:
+            raise ValueError("Result set is in memory")
+        return os.path.join(self.path, f"{name}.npy")
+
+    def flush(self):
+        """Write pending pages and the row count to disk"""
+        if self.path is None or self.mode == 'r':
+            return
+        for array in self._arrays.values():
+            array.flush()
+        self._write_schema()
+
+    def close(self):
+        """Flush and release the memory maps"""
+        self.flush()
+        self._arrays = {}
+
+    def __getstate__(self):
+        """
+        Disk-backed sets pickle as a reference to their directory and row
+        count (e.g. in a checkpoint); in-memory sets pickle their arrays
+        """
+        state = self.__dict__.copy()
+        if self.path is not None:
+            self.flush()
+            del state['_arrays']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if '_arrays' not in state:
+            # Rows written after the pickled count are overwritten on append
+            mode = 'r' if self.mode == 'r' else 'r+'
+            self._arrays = {name: open_memmap(self.field_path(name), mode=mode)
+                            for name in self.schema}
+
+    def _write_schema(self):
+        meta = {'fields': {name: [list(shape), dtype]
+                           for name, (shape, dtype) in self.schema.items()},
+                'capacity': self.capacity, 'rows': self._n_rows, 'attrs': self.attrs}
+        tmp_path = os.path.join(self.path, _SCHEMA_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=1)
+        os.replace(tmp_path, os.path.join(self.path, _SCHEMA_FILE))
@@ -0,0 +1,477 @@
+"""
+Laminate Service Module
+Local asyncio HTTP/JSON service with micro-batched laminate evaluation
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from .batch import abd_from_qbar, batch_z_coordinates
+from .compliance import batch_abd_inverse, batch_solve_strains
+from .lamina import qbar_stack
+from .stacking import compile_layup
+from .sweeps import MATERIAL_KEYS, _ply_stresses
+
+
+# Seconds the batcher waits after the first queued request for others to join
+BATCH_WINDOW = 0.002
+
+# Maximum requests evaluated in one batch
+MAX_BATCH = 1024
+
+# Compiled layups kept in the LRU cache
+LAYUP_CACHE_SIZE = 4096
+
+# Cached Q-bar matrices per material before its angle table is reset
+ANGLE_CACHE_SIZE = 4096
+
+# Latency samples kept for the percentiles of /metrics
+LATENCY_SAMPLES = 10000
+
+# Seconds over which /metrics reports the recent throughput
+THROUGHPUT_WINDOW = 10.0
+
+DEFAULT_PORT = 8604
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+            405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+# Path -> allowed method
+_ROUTES = {'/analyze': 'POST', '/metrics': 'GET', '/health': 'GET'}
+
+
+class _Request:
+    """A validated analysis request waiting in the batch queue"""
+
+    __slots__ = ('material', 'key', 'angles', 'thicknesses', 'loads', 'stresses',
+                 'future')
+
+    def __init__(self, material, key, angles, thicknesses, loads, stresses, future):
+        self.material = material
+        self.key = key
+        self.angles = angles
+        self.thicknesses = thicknesses
+        self.loads = loads
+        self.stresses = stresses
+        self.future = future
+
+
+class LaminateService:
+    """
+    Asynchronous laminate analysis service
+
+    Requests arriving within batch_window of each other are coalesced: the
+    batcher groups them by material, pads their layups to one array and
+    evaluates A, B, D, the compliance matrix, mid-plane strains and ply
+    stresses for the whole group with the batch routines. Q-bar matrices
+    are kept per material and ply angle and compiled layups in an LRU
+    cache, so a warm service only gathers and sums stiffness terms.
+
+    HTTP routes (JSON bodies, HTTP/1.1 keep-alive):
+
+        POST /analyze   one request object or a list of them
+        GET  /metrics   request counts, batch sizes, latency, throughput
+        GET  /health
+
+    A request object holds 'material' ({E1, E2, G12, nu12}), 'layup'
+    (laminate code or angle list), 'ply_thickness' (mm) and optionally
+    'loads' ([Nx, Ny, Nxy, Mx, My, Mxy]) and 'stresses' (bool).
+
+    Example:
+    --------
+    >>> service = LaminateService(batch_window=0.001)
+    >>> asyncio.run(service.serve('127.0.0.1', 8604))
+    """
+
+    def __init__(self, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        """
+        Parameters:
+        -----------
+        batch_window : float
+            Seconds to collect requests before evaluating a batch
+        max_batch : int
+            Maximum requests per batch
+        """
+        self.batch_window = float(batch_window)
+        self.max_batch = int(max_batch)
+
+        self._queue = None
+        self._batcher = None
+        self._qbar = {}                    # material key -> {angle: Qbar}
+        self._layups = OrderedDict()       # (layup, ply thickness) -> (angles, thicknesses)
+        self._connections = {}             # handler task -> stream writer
+
+        self._started = time.monotonic()
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._completed = deque()          # completion times within THROUGHPUT_WINDOW
+        self._counts = {'requests': 0, 'errors': 0, 'batches': 0, 'batched_requests': 0,
+                        'max_batch_size': 0, 'layup_cache_hits': 0, 'layup_cache_misses': 0}
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start the batcher on the running event loop"""
+        if self._batcher is None:
+            self._queue = asyncio.Queue()
+            self._batcher = asyncio.create_task(self._run_batches())
+        return self
+
+    async def close(self):
+        """Stop the batcher; queued requests are cancelled"""
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+            while not self._queue.empty():
+                self._queue.get_nowait().future.cancel()
+
+    async def analyze(self, request):
+        """
+        Analyze one laminate (batched with concurrent requests)
+
+        Parameters:
+        -----------
+        request : dict
+            Request object (see class docstring)
+
+        Returns:
+        --------
+        result : dict
+            'A', 'B', 'D', 'abd' (nested lists), 'ill_conditioned',
+            'n_plies', 'thickness' and, with loads, 'strains' and
+            'curvatures'; with stresses also 'z', 'stresses' and
+            'material_stresses' at the bottom and top of every ply
+
+        Raises:
+        -------
+        ValueError
+            If the request is malformed
+        """
+        start = time.perf_counter()
+        self._counts['requests'] += 1
+        try:
+            await self.start()
+            item = self._parse(request)
+            self._queue.put_nowait(item)
+            result = await item.future
+        except Exception:
+            self._counts['errors'] += 1
+            raise
+
+        now = time.perf_counter()
+        self._latencies.append(now - start)
+        self._completed.append(now)
+        return result
+
+    def _parse(self, request):
+        """Validate a request object into a queue item"""
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        try:
+            material = {key: float(request['material'][key]) for key in MATERIAL_KEYS}
+            ply_thickness = float(request['ply_thickness'])
+            layup = request['layup']
+        except KeyError as e:
+            raise ValueError(f"Missing request field: {e}") from None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid material or ply_thickness: {e}") from None
+        # Checked per request: a bad material would fail its whole batch group
+        for key in ('E1', 'E2', 'G12'):
+            if not 0 < material[key] < np.inf:
+                raise ValueError(f"{key} must be positive and finite")
+        nu12, E1, E2 = material['nu12'], material['E1'], material['E2']
+        if not nu12**2 * E2 / E1 < 1:
+            raise ValueError("nu12 must be finite with nu12² E2 / E1 < 1")
+        if not 0 < ply_thickness < np.inf:
+            raise ValueError("ply_thickness must be positive and finite")
+
+        angles, thicknesses = self._compile(layup, ply_thickness)
+
+        loads = request.get('loads')
+        if loads is not None:
+            try:
+                loads = np.asarray(loads, dtype=float).reshape(6)
+            except (TypeError, ValueError):
+                raise ValueError("loads must be [Nx, Ny, Nxy, Mx, My, Mxy]") from None
+            if not np.isfinite(loads).all():
+                raise ValueError("loads must be finite")
+        stresses = request.get('stresses', False)
+        if not isinstance(stresses, bool):
+            raise ValueError("stresses must be true or false")
+        if stresses and loads is None:
+            raise ValueError("stresses require loads")
+
+        key = tuple(material[k] for k in MATERIAL_KEYS)
+        future = asyncio.get_running_loop().create_future()
+        return _Request(material, key, angles, thicknesses, loads, stresses, future)
+
+    def _compile(self, layup, ply_thickness):
+        """Angle and thickness arrays of a layup, from the LRU cache"""
+        if isinstance(layup, str):
+            cache_key = (layup, ply_thickness)
+        elif isinstance(layup, (list, tuple)) and layup:
+            try:
+                cache_key = (tuple(float(a) for a in layup), ply_thickness)
+            except (TypeError, ValueError):
+                raise ValueError("layup angles must be numbers") from None
+            if not np.isfinite(cache_key[0]).all():
+                raise ValueError("layup angles must be finite")
+        else:
+            raise ValueError("layup must be a laminate code or a list of angles")
+
+        compiled = self._layups.get(cache_key)
+        if compiled is not None:
+            self._counts['layup_cache_hits'] += 1
+            self._layups.move_to_end(cache_key)
+            return compiled
+
+        self._counts['layup_cache_misses'] += 1
+        if isinstance(layup, str):
+            compiled = compile_layup(layup, ply_thickness)
+        else:
+            angles = np.array(cache_key[0])
+            compiled = angles, np.full(len(angles), ply_thickness)
+        if not len(compiled[0]):
+            raise ValueError("layup has no plies")
+        self._layups[cache_key] = compiled
+        if len(self._layups) > LAYUP_CACHE_SIZE:
+            self._layups.popitem(last=False)
+        return compiled
+
+    async def _run_batches(self):
+        """Collect requests over the batch window and evaluate them together"""
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            self._counts['batches'] += 1
+            self._counts['batched_requests'] += len(batch)
+            self._counts['max_batch_size'] = max(self._counts['max_batch_size'], len(batch))
+
+            groups = {}
+            for item in batch:
+                if not item.future.cancelled():
+                    groups.setdefault(item.key, []).append(item)
+            for items in groups.values():
+                try:
+                    results = self._evaluate(items)
+                except Exception as e:
+                    for item in items:
+                        if not item.future.done():
+                            item.future.set_exception(RuntimeError(f"Evaluation failed: {e}"))
+                    continue
+                for item, result in zip(items, results):
+                    if not item.future.done():
+                        item.future.set_result(result)
+
+    def _evaluate(self, items):
+        """Batched evaluation of requests sharing one material"""
+        n_plies = np.array([len(item.angles) for item in items])
+        angles = np.zeros((len(items), n_plies.max()))
+        thicknesses = np.zeros_like(angles)
+        for i, item in enumerate(items):
+            angles[i, :n_plies[i]] = item.angles
+            thicknesses[i, :n_plies[i]] = item.thicknesses
+
+        Qbar = self._qbar_stack(items[0], angles)
+        A, B, D = abd_from_qbar(Qbar, thicknesses)
+        abd, ill_conditioned = batch_abd_inverse(A, B, D)
+
+        loaded = np.array([item.loads is not None for item in items])
+        if loaded.any():
+            loads = np.array([item.loads if item.loads is not None else np.zeros(6)
+                              for item in items])
+            strains, curvatures = batch_solve_strains(A, B, D, loads)
+        if any(item.stresses for item in items):
+            stresses, material_stresses = _ply_stresses(
+                Qbar, thicknesses, angles, n_plies, strains, curvatures)
+            z = batch_z_coordinates(thicknesses)
+
+        results = []
+        for i, item in enumerate(items):
+            n = n_plies[i]
+            result = {'A': _json_list(A[i]), 'B': _json_list(B[i]), 'D': _json_list(D[i]),
+                      'abd': _json_list(abd[i]), 'ill_conditioned': bool(ill_conditioned[i]),
+                      'n_plies': int(n), 'thickness': float(thicknesses[i].sum())}
+            if loaded[i]:
+                result['strains'] = _json_list(strains[i])
+                result['curvatures'] = _json_list(curvatures[i])
+            if item.stresses:
+                result['z'] = _json_list(z[i, :n + 1])
+                result['stresses'] = _json_list(stresses[i, :n])
+                result['material_stresses'] = _json_list(material_stresses[i, :n])
+            results.append(result)
+        return results
+
+    def _qbar_stack(self, item, angles):
+        """Q-bar of every ply from the material's angle cache"""
+        table = self._qbar.setdefault(item.key, {})
+        unique, inverse = np.unique(angles, return_inverse=True)
+        missing = [a for a in unique.tolist() if a not in table]
+        if missing:
+            if len(table) + len(missing) > ANGLE_CACHE_SIZE:
+                table.clear()
+                missing = unique.tolist()
+            table.update(zip(missing, qbar_stack(item.material, np.array(missing))))
+        Qbar = np.stack([table[a] for a in unique.tolist()])
+        return Qbar[inverse.reshape(angles.shape)]
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self):
+        """
+        Service counters, latency percentiles and throughput
+
+        Returns:
+        --------
+        metrics : dict
+            Counts, mean / max batch size, latency percentiles (ms) over
+            the last LATENCY_SAMPLES requests, requests per second over the
+            last THROUGHPUT_WINDOW seconds, and cache sizes
+        """
+        now = time.perf_counter()
+        while self._completed and self._completed[0] < now - THROUGHPUT_WINDOW:
+            self._completed.popleft()
+        uptime = time.monotonic() - self._started
+
+        counts = dict(self._counts)
+        batches = counts['batches']
+        metrics = {'uptime_s': uptime, **counts,
+                   'mean_batch_size': counts['batched_requests'] / batches if batches else 0.0,
+                   'throughput_rps': len(self._completed) / max(min(uptime, THROUGHPUT_WINDOW),
+                                                                1e-9),
+                   'cached_materials': len(self._qbar),
+                   'cached_angles': sum(len(table) for table in self._qbar.values()),
+                   'cached_layups': len(self._layups)}
+        if self._latencies:
+            latencies = 1e3 * np.array(self._latencies)
+            metrics['latency_ms'] = {
+                'mean': float(latencies.mean()), 'max': float(latencies.max()),
+                **{f"p{q}": float(np.percentile(latencies, q)) for q in (50, 95, 99)}}
+        return metrics
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+        """
+        Serve HTTP until cancelled
+
+        Parameters:
+        -----------
+        host, port : str, int
+            Interface and port to listen on (port 0 picks a free port)
+        ready : callable, optional
+            Called with the bound (host, port) once listening
+        """
+        await self.start()
+        server = await asyncio.start_server(self._handle, host, port)
+        try:
+            if ready is not None:
+                ready(server.sockets[0].getsockname()[:2])
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Closing the transports ends the handlers' pending reads
+            handlers = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.close()
+
+    async def _handle(self, reader, writer):
+        """Answer the requests of one connection (keep-alive)"""
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self._route(method, target.split('?', 1)[0], body)
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                try:
+                    data = json.dumps(payload, allow_nan=False).encode()
+                except ValueError:
+                    status = 500
+                    data = json.dumps({'error': "Result is not finite"}).encode()
+                writer.write((f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                              f"Content-Type: application/json\r\n"
+                              f"Content-Length: {len(data)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                              f"\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass    # client went away or sent a malformed request line
+        finally:
+            del self._connections[asyncio.current_task()]
+            writer.close()
+
+    async def _route(self, method, path, body):
+        """(status, JSON payload) of one HTTP request"""
+        if path not in _ROUTES:
+            return 404, {'error': f"Unknown path: {path}"}
+        if method != _ROUTES[path]:
+            return 405, {'error': f"{path} expects {_ROUTES[path]}"}
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/metrics':
+            return 200, self.metrics()
+
+        try:
+            request = json.loads(body or b'null')
+            if isinstance(request, list):
+                return 200, list(await asyncio.gather(*map(self.analyze, request)))
+            return 200, await self.analyze(request)
+        except (json.JSONDecodeError, ValueError) as e:
+            return 400, {'error': str(e)}
+        except RuntimeError as e:
+            return 500, {'error': str(e)}
+
+
+def _json_list(array):
+    """Nested list of an array with non-finite values as None (JSON null)"""
+    finite = np.isfinite(array)
+    if finite.all():
+        return array.tolist()
+    return np.where(finite, array.astype(object), None).tolist()
+
+
+def run_service(host='127.0.0.1', port=DEFAULT_PORT, batch_window=BATCH_WINDOW,
+                max_batch=MAX_BATCH):
+    """Run a LaminateService until interrupted (blocking)"""
+    service = LaminateService(batch_window, max_batch)
+
+    def ready(address):
+        print(f"Laminate service listening on http://{address[0]}:{address[1]}")
+
+    try:
+        asyncio.run(service.serve(host, port, ready))
+    except KeyboardInterrupt:
+        pass
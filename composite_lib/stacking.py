@@ -0,0 +1,468 @@
+"""
+Stacking Module
+Run-length-encoded stacking sequences for laminates with many plies
+"""
+
+import csv
+import functools
+import re
+
+import numpy as np
+from .lamina import qbar_stack
+
+
+class StackingBlocks:
+    """
+    Stacking sequence stored as repeated sub-laminate blocks
+
+    Each block is a sub-laminate (one or more plies) repeated a number of
+    times, e.g. [0/45/-45/90] × 250 or a run of 40 plies at 0°. A, B and D
+    are computed in closed form per block, so the cost scales with the
+    number of distinct sub-laminate plies rather than the total ply count.
+    """
+
+    def __init__(self, blocks, ply_thickness=None):
+        """
+        Initialize blocks
+
+        Parameters:
+        -----------
+        blocks : list of tuple
+            (sub_laminate, repeat) or (sub_laminate, repeat, thicknesses),
+            bottom to top. sub_laminate is an angle or list of angles
+            (degrees); thicknesses is a ply thickness or list matching it.
+        ply_thickness : float, optional
+            Thickness (mm) for blocks that do not specify their own
+        """
+        self.units = []
+        self.unit_thicknesses = []
+        self.repeats = []
+
+        for block in blocks:
+            if len(block) == 3:
+                unit, repeat, t = block
+            else:
+                (unit, repeat), t = block, ply_thickness
+            if t is None:
+                raise ValueError("Block without thickness and no ply_thickness given")
+
+            unit = np.atleast_1d(np.asarray(unit, dtype=float))
+            t = np.broadcast_to(np.asarray(t, dtype=float), unit.shape).copy()
+            repeat = int(repeat)
+            if repeat < 1 or len(unit) == 0:
+                raise ValueError("Blocks need at least one ply and repeat >= 1")
+
+            self.units.append(unit)
+            self.unit_thicknesses.append(t)
+            self.repeats.append(repeat)
+
+        self.repeats = np.array(self.repeats, dtype=int)
+        self.unit_heights = np.array([t.sum() for t in self.unit_thicknesses])
+        self.n_plies = int(sum(len(u) * r for u, r in zip(self.units, self.repeats)))
+        self.total_thickness = float(np.dot(self.unit_heights, self.repeats))
+
+    @classmethod
+    def from_angles(cls, angles, ply_thickness):
+        """
+        Run-length encode a plain ply list into blocks of equal angle
+
+        Parameters:
+        -----------
+        angles : array_like
+            Ply angles (degrees), bottom to top
+        ply_thickness : float or array_like
+            Thickness of each ply (mm)
+        """
+        angles = np.asarray(angles, dtype=float)
+        t = np.broadcast_to(np.asarray(ply_thickness, dtype=float), angles.shape)
+
+        change = np.r_[True, (angles[1:] != angles[:-1]) | (t[1:] != t[:-1])]
+        starts = np.flatnonzero(change)
+        counts = np.diff(np.r_[starts, len(angles)])
+
+        return cls([(angles[s], c, t[s]) for s, c in zip(starts, counts)])
+
+    @property
+    def n_blocks(self):
+        return len(self.units)
+
+    def __len__(self):
+        return self.n_plies
+
+    def __repr__(self):
+        parts = []
+        for unit, r in zip(self.units, self.repeats):
+            code = "/".join(f"{a:g}" for a in unit)
+            parts.append(f"[{code}]" + (f"×{r}" if r > 1 else ""))
+        return f"StackingBlocks({' '.join(parts)})"
+
+    def expand(self):
+        """
+        Expand to per-ply arrays
+
+        Returns:
+        --------
+        angles : ndarray (n_plies,)
+            Ply angles (degrees)
+        thicknesses : ndarray (n_plies,)
+            Ply thicknesses (mm)
+        """
+        if not self.units:
+            return np.empty(0), np.empty(0)
+        angles = np.concatenate([np.tile(u, r) for u, r in zip(self.units, self.repeats)])
+        thicknesses = np.concatenate([np.tile(t, r) for t, r
+                                      in zip(self.unit_thicknesses, self.repeats)])
+        return angles, thicknesses
+
+    def calculate_ABD(self, material_props):
+        """
+        Calculate A, B, D with closed-form sums over block repeats
+
+        For a ply spanning [s, e] in the first repeat of a block of height h
+        repeated r times, the sums over repeats m = 0..r-1 are
+
+            Σ (e - s)             = r (e - s)
+            Σ (e + mh)² - (s + mh)² = r (e² - s²) + 2h S1 (e - s)
+            Σ (e + mh)³ - (s + mh)³ = r (e³ - s³) + 3h S1 (e² - s²)
+                                      + 3h² S2 (e - s)
+
+        with S1 = Σ m = r(r-1)/2 and S2 = Σ m² = (r-1)r(2r-1)/6.
+
+        Parameters:
+        -----------
+        material_props : dict
+            Dictionary with E1, E2, G12, nu12
+
+        Returns:
+        --------
+        A, B, D : ndarray (3x3)
+            Extensional, coupling and bending stiffness matrices
+        """
+        if not self.units:
+            return np.zeros((3, 3)), np.zeros((3, 3)), np.zeros((3, 3))
+
+        # Start z of each block, referenced at the laminate mid-plane
+        block_z0 = (np.r_[0.0, np.cumsum(self.unit_heights * self.repeats)[:-1]]
+                    - self.total_thickness / 2)
+
+        sizes = [len(u) for u in self.units]
+        angles = np.concatenate(self.units)
+        t = np.concatenate(self.unit_thicknesses)
+        r = np.repeat(self.repeats, sizes).astype(float)
+        h = np.repeat(self.unit_heights, sizes)
+        z0 = np.repeat(block_z0, sizes)
+
+        # Ply bounds within the first repeat of its block
+        offset = np.concatenate([np.r_[0.0, np.cumsum(ut)[:-1]]
+                                 for ut in self.unit_thicknesses])
+        s = z0 + offset
+        e = s + t
+
+        S1 = r * (r - 1) / 2
+        S2 = (r - 1) * r * (2*r - 1) / 6
+
+        d1 = e - s
+        d2 = e**2 - s**2
+        d3 = e**3 - s**3
+
+        w_A = r * d1
+        w_B = r * d2 + 2*h*S1*d1
+        w_D = r * d3 + 3*h*S1*d2 + 3*h**2*S2*d1
+
+        Qbar = qbar_stack(material_props, angles)
+        A = np.tensordot(w_A, Qbar, axes=1)
+        B = 0.5 * np.tensordot(w_B, Qbar, axes=1)
+        D = (1/3) * np.tensordot(w_D, Qbar, axes=1)
+
+        return A, B, D
+
+
+# ---------------------------------------------------------------------------
+# Laminate code parser
+# ---------------------------------------------------------------------------
+
+_SUBSCRIPT_DIGITS = str.maketrans('₀₁₂₃₄₅₆₇₈₉ₛ', '0123456789s')
+_SUBSCRIPT = re.compile('[₀₁₂₃₄₅₆₇₈₉ₛ]+')
+_OVERBARS = ('̄', '̅')
+_SIGNS = (('±', (1, -1)), ('+-', (1, -1)), ('∓', (-1, 1)), ('-+', (-1, 1)))
+_TRAILING_SYMMETRIC = re.compile(r'(_\{\d*[sS]\}|_\d*[sS]|[sS])$')
+
+
+class _LayupParser:
+    """
+    Recursive-descent parser for standard laminate code notation
+
+    Grammar (whitespace ignored):
+
+        sequence := item (('/' | ',') item)*
+        item     := (group | ply) suffix*
+        group    := '[' sequence ']' | '(' sequence ')'
+        ply      := sign? number overbar? ('@' number)?
+        sign     := '±' | '∓' | '+-' | '-+' | '+' | '-'
+        overbar  := combining overline | 'bar'
+        suffix   := '_'? ( '{' count? 's'? '}' | count? 's'? | 'T' )
+
+    A count repeats the item, 's' mirrors it (after repeating), and a
+    barred last ply is the odd mid-plane ply, which is not duplicated.
+    Plies are (angle, thickness or None, barred) tuples.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message):
+        raise ValueError(f"Invalid stacking sequence {self.text!r} at position "
+                         f"{self.pos}: {message}")
+
+    def peek(self, n=1):
+        return self.text[self.pos:self.pos + n]
+
+    def parse(self):
+        plies = self.sequence()
+        if self.pos != len(self.text):
+            self.error(f"unexpected {self.peek()!r}")
+        return plies
+
+    def sequence(self):
+        plies = self.item()
+        while self.peek() in ('/', ','):
+            self.pos += 1
+            plies = plies + self.item()
+        return plies
+
+    def item(self):
+        if self.peek() in ('[', '('):
+            close = ']' if self.peek() == '[' else ')'
+            self.pos += 1
+            plies = self.sequence()
+            if self.peek() != close:
+                self.error(f"expected {close!r}")
+            self.pos += 1
+        else:
+            plies = self.ply()
+        return self.suffixes(plies)
+
+    def ply(self):
+        signs = (1,)
+        for token, values in _SIGNS:
+            if self.text.startswith(token, self.pos):
+                signs = values
+                self.pos += len(token)
+                break
+        else:
+            if self.peek() in ('+', '-'):
+                signs = (1,) if self.peek() == '+' else (-1,)
+                self.pos += 1
+
+        angle = self.number()
+        barred = False
+        if self.peek() in _OVERBARS:
+            barred = True
+            self.pos += 1
+        elif self.peek(3).lower() == 'bar':
+            barred = True
+            self.pos += 3
+
+        thickness = None
+        if self.peek() == '@':
+            self.pos += 1
+            thickness = self.number()
+            if thickness <= 0:
+                self.error("ply thickness must be positive")
+
+        return [(sign * angle, thickness, barred and i == len(signs) - 1)
+                for i, sign in enumerate(signs)]
+
+    def number(self):
+        start = self.pos
+        while self.peek() and (self.peek().isdigit() or self.peek() == '.'):
+            self.pos += 1
+        try:
+            return float(self.text[start:self.pos])
+        except ValueError:
+            self.error("expected a number")
+
+    def suffixes(self, plies):
+        while True:
+            start = self.pos
+            underscore = self.peek() == '_'
+            self.pos += underscore
+            braced = self.peek() == '{'
+            self.pos += braced
+
+            count_start = self.pos
+            while self.peek().isdigit():
+                self.pos += 1
+            has_count = self.pos > count_start
+            count = int(self.text[count_start:self.pos]) if has_count else 1
+
+            symmetric = self.peek() in ('s', 'S')
+            self.pos += symmetric
+            total = not (has_count or symmetric) and self.peek() == 'T'
+            self.pos += total
+
+            if braced:
+                if self.peek() != '}':
+                    self.error("expected '}'")
+                self.pos += 1
+
+            if not (has_count or symmetric or total):
+                if underscore or braced:
+                    self.error("empty subscript")
+                self.pos = start
+                return plies
+            if count < 1:
+                self.error("repeat count must be at least 1")
+
+            plies = plies * count
+            if symmetric:
+                plies = _mirror(plies)
+
+
+def _mirror(plies):
+    """Symmetric expansion; a barred last ply is the unduplicated mid-plane"""
+    if plies and plies[-1][2]:
+        core = [(a, t, False) for a, t, _ in plies]
+        return core + core[-2::-1]
+    return plies + plies[::-1]
+
+
+def _normalize_layup(text):
+    """
+    Normalize legacy bracketless codes: in "0/90/0_s" a trailing symmetric
+    suffix applies to the whole sequence, not to the last ply.
+    """
+    text = _SUBSCRIPT.sub(lambda m: '_' + m.group(0).translate(_SUBSCRIPT_DIGITS),
+                          ''.join(text.split()))
+    if text and text[0] not in '[(':
+        match = _TRAILING_SYMMETRIC.search(text)
+        if match and match.start() > 0:
+            text = '[' + text[:match.start()] + ']' + match.group(0)
+    return text
+
+
+@functools.lru_cache(maxsize=65536)
+def _compile_layup(text):
+    plies = _LayupParser(_normalize_layup(text)).parse()
+    angles = tuple(a for a, _, _ in plies)
+    thicknesses = tuple(np.nan if t is None else t for _, t, _ in plies)
+    return angles, thicknesses
+
+
+def parse_layup(text):
+    """
+    Parse a laminate code into a list of ply angles
+
+    Supports ply groups and multipliers ([45/-45]_3), ± pairs, ply
+    counts (0_2), symmetric repeats ([0/±45/90]_2s), an odd mid-plane ply
+    marked with an overbar or 'bar' ([0/45/90bar]_s), nested groups and
+    per-ply thickness overrides (0@0.25). Results are cached per string.
+
+    Examples: "0/90/0_s", "[0/±45/90]_2s", "[0_2/(45/-45)_3]_s"
+
+    Parameters:
+    -----------
+    text : str
+        Laminate code
+
+    Returns:
+    --------
+    angles : list of float
+        Ply angles (degrees), bottom to top
+    """
+    return list(_compile_layup(text)[0])
+
+
+def compile_layup(text, ply_thickness):
+    """
+    Compile a laminate code to angle and thickness arrays
+
+    Parameters:
+    -----------
+    text : str
+        Laminate code (see parse_layup)
+    ply_thickness : float
+        Thickness (mm) of plies without an explicit '@t' override
+
+    Returns:
+    --------
+    angles : ndarray (n,)
+        Ply angles (degrees)
+    thicknesses : ndarray (n,)
+        Ply thicknesses (mm)
+    """
+    angles, thicknesses = _compile_layup(text)
+    thicknesses = np.array(thicknesses)
+    thicknesses[np.isnan(thicknesses)] = ply_thickness
+    return np.array(angles), thicknesses
+
+
+def parse_layups(texts, ply_thickness):
+    """
+    Bulk-compile many laminate codes into padded arrays
+
+    Each distinct string is parsed once; shorter layups are padded with
+    zero-thickness plies, which contribute nothing to A, B or D.
+
+    Parameters:
+    -----------
+    texts : iterable of str
+        Laminate codes
+    ply_thickness : float
+        Default ply thickness (mm)
+
+    Returns:
+    --------
+    angles : ndarray (N, n_max)
+        Ply angles (degrees)
+    thicknesses : ndarray (N, n_max)
+        Ply thicknesses (mm), zero for padding
+    n_plies : ndarray (N,)
+        Number of plies of each layup
+    """
+    # Parse each distinct code once, then gather rows by index
+    index = {}
+    inverse = np.fromiter((index.setdefault(text, len(index)) for text in texts),
+                          dtype=np.intp)
+    rows = [_compile_layup(text) for text in index]
+
+    unique_n = np.array([len(a) for a, _ in rows], dtype=int)
+    n_max = int(unique_n.max()) if rows else 0
+
+    unique_angles = np.zeros((len(rows), n_max))
+    unique_thicknesses = np.zeros((len(rows), n_max))
+    for i, (a, t) in enumerate(rows):
+        unique_angles[i, :len(a)] = a
+        unique_thicknesses[i, :len(t)] = t
+    unique_thicknesses[np.isnan(unique_thicknesses)] = ply_thickness
+
+    return unique_angles[inverse], unique_thicknesses[inverse], unique_n[inverse]
+
+
+def load_layup_file(path, ply_thickness):
+    """
+    Read and bulk-compile a catalog of laminate codes, one per line
+
+    Blank lines and lines starting with '#' are skipped. For CSV files the
+    first column holds the code (quote codes that contain commas).
+
+    Returns:
+    --------
+    codes : list of str
+        Laminate codes in file order
+    angles, thicknesses, n_plies : ndarray
+        As returned by parse_layups
+    """
+    codes = []
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.csv'):
+            rows = (row[0] for row in csv.reader(f, skipinitialspace=True) if row)
+        else:
+            rows = f
+        for line in rows:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            codes.append(line)
+    return (codes,) + parse_layups(codes, ply_thickness)
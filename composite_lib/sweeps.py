@@ -0,0 +1,559 @@
+"""
+Sweeps Module
+Streaming, chunked evaluation of layup / material / thickness / load studies
+"""
+
+import numpy as np
+from .batch import pad_layups, batch_abd, batch_z_coordinates
+from .compliance import batch_abd_inverse, batch_solve_strains
+from .lamina import qbar_stack
+from .laminate import Laminate
+
+
+# Order of the material constants in the 'material' field
+MATERIAL_KEYS = ('E1', 'E2', 'G12', 'nu12')
+
+# Result fields that are only computed on request
+OPTIONAL_FIELDS = ('abd', 'stresses', 'material_stresses')
+
+# Default number of result rows per yielded chunk
+SWEEP_CHUNK_ROWS = 4096
+
+
+def sweep(spec, fields=(), chunk_size=SWEEP_CHUNK_ROWS, first_layup=0):
+    """
+    Evaluate the full product of a study, one bounded chunk at a time
+
+    Every layup is combined with every material, ply thickness and load
+    case; result rows are ordered layup-major (then material, thickness,
+    load). Only the layup stream is consumed lazily, so it may be a
+    generator of any length (e.g. enumerate_layups chunks) and memory
+    stays at one chunk of chunk_size rows.
+
+    Parameters:
+    -----------
+    spec : dict
+        'layups'      : iterable of stacking sequence strings, angle lists
+                        or (k, n) angle arrays (k layups each)
+        'materials'   : material dict or iterable of dicts (E1, E2, G12, nu12)
+        'thicknesses' : ply thickness (mm) or iterable of them
+        'loads'       : optional [Nx, Ny, Nxy, Mx, My, Mxy] or (P, 6) load cases
+    fields : tuple of str
+        Extra results from OPTIONAL_FIELDS: 'abd' (with 'ill_conditioned'),
+        'stresses' and 'material_stresses' (ply bottom/top surfaces)
+    chunk_size : int
+        Target number of result rows per chunk
+    first_layup : int
+        Sweep index of the first layup in spec['layups'] (when resuming a
+        sweep whose earlier layups were already evaluated, see
+        resumable_sweep); 'index' and 'layup' continue from there
+
+    Yields:
+    -------
+    chunk : dict of ndarray
+        One row per (layup, material, thickness, load) combination:
+        'index', 'layup', 'material_index', 'thickness_index', 'load_index',
+        'angles', 'thicknesses', 'n_plies', 'material', 'A', 'B', 'D' and,
+        with loads, 'loads', 'strains', 'curvatures'; plus requested fields.
+        Names match sweep_schema, so chunks can go straight to
+        SweepResults.update.
+
+    Example:
+    --------
+    >>> spec = {'layups': enumerate_layups([0, 45, -45, 90], 16),
+    ...         'materials': material, 'thicknesses': 0.125}
+    >>> stiffest, = reduce_sweep(sweep(spec), Extrema(('A', 0, 0)))
+    """
+    study = _Study.from_spec(spec, fields)
+
+    n_layups, n_rows = first_layup, first_layup * study.rows_per_layup
+    for items in _layup_groups(spec['layups'], max(1, chunk_size // study.rows_per_layup)):
+        chunk = study.evaluate(items, n_layups, n_rows)
+        n_layups = chunk['layup'][-1] + 1
+        n_rows = chunk['index'][-1] + 1
+        yield chunk
+
+
+def reduce_sweep(chunks, *reducers):
+    """
+    Feed every chunk of a sweep to one or more reducers
+
+    Parameters:
+    -----------
+    chunks : iterable of dict
+        Output of sweep()
+    *reducers
+        Objects with an update(chunk) method (Collect, Extrema, Histogram,
+        ParetoFront, SweepResults, ...)
+
+    Returns:
+    --------
+    reducers : tuple
+        The same reducers, updated
+    """
+    for chunk in chunks:
+        for reducer in reducers:
+            reducer.update(chunk)
+    return reducers
+
+
+class _Study:
+    """Fixed materials, thicknesses and loads of a sweep; evaluates layup groups"""
+
+    def __init__(self, materials, thicknesses, loads, fields):
+        self.materials = materials
+        self.material_values = np.array([[float(m[k]) for k in MATERIAL_KEYS]
+                                         for m in materials])
+        self.thicknesses = thicknesses
+        self.loads = loads
+        self.fields = fields
+
+    @classmethod
+    def from_spec(cls, spec, fields):
+        """Validate the non-layup parts of a sweep spec"""
+        unknown = set(fields) - set(OPTIONAL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown sweep fields: {sorted(unknown)}")
+        if 'thicknesses' not in spec:
+            raise ValueError("Sweep spec needs 'thicknesses'")
+
+        materials = spec.get('materials')
+        materials = [materials] if isinstance(materials, dict) else list(materials or [])
+        if not materials:
+            raise ValueError("Sweep spec needs at least one material")
+        thicknesses = np.atleast_1d(np.asarray(spec['thicknesses'], dtype=float))
+        loads = spec.get('loads')
+        loads = None if loads is None else np.asarray(loads, dtype=float).reshape(-1, 6)
+        return cls(materials, thicknesses, loads, set(fields))
+
+    def compile(self, items):
+        """
+        Padded arrays of a layup group
+
+        Returns:
+        --------
+        angles : ndarray (L, n)
+        plies : ndarray (L, T, n)
+            Ply thicknesses for every sweep thickness
+        n_plies : ndarray (L,)
+        """
+        compiled = [_layup_arrays(items, t) for t in self.thicknesses]
+        angles, _, n_plies = compiled[0]
+        plies = np.stack([thick for _, thick, _ in compiled], axis=1)
+        return angles, plies, n_plies
+
+    @property
+    def rows_per_layup(self):
+        P = 1 if self.loads is None else len(self.loads)
+        return len(self.materials) * len(self.thicknesses) * P
+
+    def evaluate(self, items, first_layup, first_row):
+        """Result chunk for one group of layups"""
+        return self.evaluate_arrays(*self.compile(items), first_layup, first_row)
+
+    def evaluate_arrays(self, angles, plies, n_plies, first_layup, first_row):
+        """Result chunk for compiled layups (see compile)"""
+        L, M, T = len(angles), len(self.materials), len(self.thicknesses)
+        P = 1 if self.loads is None else len(self.loads)
+        shape = (L, M, T, P)
+
+        def rows(x, *dims):
+            # Broadcast an array over the (L, M, T, P) axes it lacks, flattened
+            x = np.asarray(x)
+            index = tuple(slice(None) if d in dims else None for d in 'LMTP')
+            x = x[index + (Ellipsis,)]
+            return np.broadcast_to(x, shape + x.shape[4:]).reshape((-1,) + x.shape[4:])
+
+        A, B, D = (np.empty((L, M, T, 3, 3)) for _ in range(3))
+        for m, material in enumerate(self.materials):
+            for t in range(T):
+                A[:, m, t], B[:, m, t], D[:, m, t] = batch_abd(material, angles, plies[:, t])
+
+        n_rows = L * M * T * P
+        chunk = {
+            'index': first_row + np.arange(n_rows),
+            'layup': rows(first_layup + np.arange(L), 'L'),
+            'material_index': rows(np.arange(M), 'M'),
+            'thickness_index': rows(np.arange(T), 'T'),
+            'load_index': rows(np.arange(P), 'P'),
+            'angles': rows(angles, 'L'),
+            'thicknesses': rows(plies, 'L', 'T'),
+            'n_plies': rows(n_plies, 'L'),
+            'material': rows(self.material_values, 'M'),
+            'A': rows(A, 'L', 'M', 'T'),
+            'B': rows(B, 'L', 'M', 'T'),
+            'D': rows(D, 'L', 'M', 'T'),
+        }
+
+        if 'abd' in self.fields:
+            abd, ill_conditioned = batch_abd_inverse(A, B, D)
+            chunk['abd'] = rows(abd, 'L', 'M', 'T')
+            chunk['ill_conditioned'] = rows(ill_conditioned, 'L', 'M', 'T')
+
+        if self.loads is not None:
+            chunk['loads'] = rows(self.loads, 'P')
+            chunk['strains'], chunk['curvatures'] = batch_solve_strains(
+                chunk['A'], chunk['B'], chunk['D'], chunk['loads'])
+
+            if self.fields & {'stresses', 'material_stresses'}:
+                self._stresses(chunk, rows, angles)
+
+        return chunk
+
+    def _stresses(self, chunk, rows, angles):
+        """Global and material-axis stresses at every ply's bottom and top"""
+        Qbar = np.stack([qbar_stack(material, angles) for material in self.materials], axis=1)
+        stresses, material_stresses = _ply_stresses(
+            rows(Qbar, 'L', 'M'), chunk['thicknesses'], chunk['angles'], chunk['n_plies'],
+            chunk['strains'], chunk['curvatures'], 'material_stresses' in self.fields)
+        if 'stresses' in self.fields:
+            chunk['stresses'] = stresses
+        if 'material_stresses' in self.fields:
+            chunk['material_stresses'] = material_stresses
+
+
+def _ply_stresses(Qbar, thicknesses, angles, n_plies, strains, curvatures, material=True):
+    """
+    Ply stresses at the bottom and top surface of every ply
+
+    Parameters:
+    -----------
+    Qbar : ndarray (N, n, 3, 3)
+    thicknesses, angles : ndarray (N, n)
+        Padded layups (padding plies get zero stress)
+    n_plies : ndarray (N,)
+    strains, curvatures : ndarray (N, 3)
+    material : bool
+        Also transform to material axes
+
+    Returns:
+    --------
+    stresses : ndarray (N, n, 2, 3)
+        Global [σx, σy, τxy] at (bottom, top)
+    material_stresses : ndarray (N, n, 2, 3) or None
+        [σ1, σ2, τ12] at (bottom, top)
+    """
+    z = batch_z_coordinates(thicknesses)
+    z = np.stack([z[:, :-1], z[:, 1:]], axis=-1)                          # (N, n, 2)
+    strain_z = strains[:, None, None, :] + z[..., None] * curvatures[:, None, None, :]
+
+    stresses = np.einsum('rkij,rkpj->rkpi', Qbar, strain_z)
+    stresses[np.arange(z.shape[1]) >= np.asarray(n_plies)[:, None]] = 0.0
+    if not material:
+        return stresses, None
+    T = Laminate._stress_transformation_matrices(angles)
+    return stresses, np.einsum('rkij,rkpj->rkpi', T, stresses)
+
+
+def _layup_groups(layups, size):
+    """Split a layup stream into groups of `size` layups (arrays are sliced)"""
+    pending, count = [], 0
+    for item in layups:
+        if isinstance(item, np.ndarray) and item.ndim == 2:
+            start = 0
+            while start < len(item):
+                take = min(size - count, len(item) - start)
+                pending.append(item[start:start + take])
+                count += take
+                start += take
+                if count == size:
+                    yield pending
+                    pending, count = [], 0
+        else:
+            pending.append(item)
+            count += 1
+            if count == size:
+                yield pending
+                pending, count = [], 0
+    if pending:
+        yield pending
+
+
+def _layup_arrays(items, ply_thickness):
+    """Padded angle, thickness and ply-count arrays of a mixed layup group"""
+    parts, singles = [], []
+    for item in items + [None]:
+        if item is not None and not (isinstance(item, np.ndarray) and item.ndim == 2):
+            singles.append(item)
+            continue
+        if singles:
+            parts.append(pad_layups(singles, ply_thickness))
+            singles = []
+        if item is not None:
+            k, n = item.shape
+            parts.append((np.asarray(item, dtype=float), np.full((k, n), float(ply_thickness)),
+                          np.full(k, n)))
+
+    width = max(angles.shape[1] for angles, _, _ in parts)
+
+    def widen(x):
+        return np.pad(x, ((0, 0), (0, width - x.shape[1])))
+
+    return (np.concatenate([widen(angles) for angles, _, _ in parts]),
+            np.concatenate([widen(thicknesses) for _, thicknesses, _ in parts]),
+            np.concatenate([n_plies for _, _, n_plies in parts]))
+
+
+def _values(chunk, value):
+    """Per-row values selected by a field name, (name, *index) tuple or callable"""
+    if callable(value):
+        return np.asarray(value(chunk))
+    if isinstance(value, tuple):
+        name, *index = value
+        return chunk[name][(slice(None),) + tuple(index)]
+    return chunk[value]
+
+
+def _widen(array, shape, fill=0):
+    """
+    Pad the trailing axes of array up to shape
+
+    Per-ply fields are as wide as the longest layup of their chunk, so
+    reducers pad values and state to the widest chunk seen, like the
+    zero padding of shorter layups within a chunk (and SweepResults.write).
+    """
+    array = np.asarray(array)
+    lead = array.ndim - len(shape)
+    pad = [(0, 0)] * lead + [(0, k - n) for k, n in zip(shape, array.shape[lead:])]
+    if not any(after for _, after in pad):
+        return array
+    return np.pad(array, pad, constant_values=fill)
+
+
+def _concatenate_rows(parts):
+    """Concatenate row arrays whose per-row shapes may differ in width"""
+    if not parts:
+        return np.empty(0)
+    shape = tuple(np.max([part.shape[1:] for part in parts], axis=0))
+    return np.concatenate([_widen(part, shape) for part in parts])
+
+
+class Collect:
+    """
+    Reducer that keeps selected fields of every row (for sweeps small
+    enough to hold in memory; use SweepResults for large ones)
+
+    Example:
+    --------
+    >>> A = reduce_sweep(sweep(spec), Collect('A'))[0]['A']
+    """
+
+    def __init__(self, *fields):
+        self.fields = fields
+        self._parts = {name: [] for name in fields}
+
+    def update(self, chunk):
+        for name in self.fields:
+            self._parts[name].append(np.array(_values(chunk, name)))
+
+    def __getitem__(self, name):
+        return _concatenate_rows(self._parts[name])
+
+
+class Extrema:
+    """
+    Reducer for the running min / max of a value and the sweep rows
+    ('index') where they occur, elementwise for array-valued fields
+
+    NaN values are ignored.
+    """
+
+    def __init__(self, value):
+        self.value = value
+        self.min = self.max = self.argmin = self.argmax = None
+        self.count = 0
+
+    def update(self, chunk):
+        v = np.asarray(_values(chunk, self.value), dtype=float)
+        if not len(v):
+            return
+        if self.min is not None and v.shape[1:] != self.min.shape:
+            # Wider per-ply values: earlier rows count as zero padding
+            shape = tuple(np.maximum(v.shape[1:], self.min.shape))
+            v = _widen(v, shape)
+            self.min, self.max = _widen(self.min, shape), _widen(self.max, shape)
+            self.argmin = _widen(self.argmin, shape, self._first)
+            self.argmax = _widen(self.argmax, shape, self._first)
+        nan = np.isnan(v)
+        low, high = np.where(nan, np.inf, v), np.where(nan, -np.inf, v)
+        i_min, i_max = low.argmin(axis=0), high.argmax(axis=0)
+        v_min = np.take_along_axis(low, i_min[None], axis=0)[0]
+        v_max = np.take_along_axis(high, i_max[None], axis=0)[0]
+        index = chunk['index']
+
+        if self.min is None:
+            self._first = index[0]
+            self.min, self.argmin = v_min, index[i_min]
+            self.max, self.argmax = v_max, index[i_max]
+        else:
+            lower, higher = v_min < self.min, v_max > self.max
+            self.min = np.where(lower, v_min, self.min)
+            self.argmin = np.where(lower, index[i_min], self.argmin)
+            self.max = np.where(higher, v_max, self.max)
+            self.argmax = np.where(higher, index[i_max], self.argmax)
+        self.count += len(v)
+
+
+class Moments:
+    """
+    Reducer for the running count, mean and variance of a value,
+    elementwise for array-valued fields (e.g. Monte Carlo estimates;
+    the mean of a 0/1 value is a probability)
+
+    Chunks are merged with the parallel update of Chan et al., so the
+    result does not depend on the chunk size beyond rounding. NaN rows
+    are ignored.
+    """
+
+    def __init__(self, value):
+        self.value = value
+        self.count = self.mean = self._m2 = None
+        self._rows = 0
+
+    def update(self, chunk):
+        v = np.asarray(_values(chunk, self.value), dtype=float)
+        if self.count is not None and v.shape[1:] != np.shape(self.mean):
+            # Wider per-ply values: earlier rows count as zero padding
+            shape = tuple(np.maximum(v.shape[1:], np.shape(self.mean)))
+            v = _widen(v, shape)
+            self.count = _widen(self.count, shape, self._rows)
+            self.mean, self._m2 = _widen(self.mean, shape), _widen(self._m2, shape)
+        self._rows += len(v)
+        valid = ~np.isnan(v)
+        n = valid.sum(axis=0)
+        if not n.any():
+            return
+        mean = np.where(valid, v, 0.0).sum(axis=0) / np.maximum(n, 1)
+        m2 = np.where(valid, v - mean, 0.0) ** 2
+        m2 = m2.sum(axis=0)
+
+        if self.count is None:
+            self.count, self.mean, self._m2 = n, mean, m2
+            return
+        total = self.count + n
+        delta = mean - self.mean
+        weight = np.divide(n, total, out=np.zeros(np.shape(total)), where=total > 0)
+        self.mean = self.mean + delta * weight
+        self._m2 = self._m2 + m2 + delta**2 * self.count * weight
+        self.count = total
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1 denominator)"""
+        return self._m2 / np.maximum(self.count - 1, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def standard_error(self):
+        """Standard error of the mean"""
+        return np.sqrt(self.variance / np.maximum(self.count, 1))
+
+
+class Histogram:
+    """
+    Reducer for a histogram with fixed bins (all elements of the value)
+
+    Parameters:
+    -----------
+    value : str, tuple or callable
+        Field name, (name, *index) or function of the chunk
+    bins : int or array_like
+        Number of bins (requires range) or bin edges
+    range : (float, float), optional
+        Lower and upper edge for integer bins
+    """
+
+    def __init__(self, value, bins, range=None):
+        self.value = value
+        if np.ndim(bins) == 0:
+            if range is None:
+                raise ValueError("Streaming histograms need fixed edges: give range")
+            bins = np.linspace(range[0], range[1], int(bins) + 1)
+        self.edges = np.asarray(bins, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, chunk):
+        v = np.asarray(_values(chunk, self.value), dtype=float).ravel()
+        self.counts += np.histogram(v[np.isfinite(v)], bins=self.edges)[0]
+
+
+class ParetoFront:
+    """
+    Reducer that keeps the non-dominated rows of several objectives
+
+    Parameters:
+    -----------
+    objectives : list
+        Per-row scalar values (field name, (name, *index) or callable)
+    maximize : list of bool, optional
+        Per objective; default minimizes all
+    keep : tuple of str
+        Chunk fields stored with every front row
+
+    Attributes:
+    -----------
+    values : ndarray (k, n_objectives)
+        Objective values of the front
+    index : ndarray (k,)
+        Sweep row indices of the front
+    arrays : dict
+        Kept fields of the front rows
+    """
+
+    def __init__(self, objectives, maximize=None, keep=()):
+        self.objectives = list(objectives)
+        maximize = maximize or [False] * len(self.objectives)
+        self._sign = np.where(maximize, -1.0, 1.0)
+        self.keep = keep
+        self.values = np.empty((0, len(self.objectives)))
+        self.index = np.empty(0, dtype=np.int64)
+        self.arrays = {}
+
+    def update(self, chunk):
+        values = np.stack([np.asarray(_values(chunk, obj), dtype=float)
+                           for obj in self.objectives], axis=1)
+        valid = ~np.isnan(values).any(axis=1)
+
+        candidates = np.concatenate([self.values, values[valid]])
+        front = _nondominated(candidates * self._sign)
+        n_old = len(self.values)
+        old, new = front[front < n_old], front[front >= n_old] - n_old
+
+        rows = np.flatnonzero(valid)[new]
+        self.values = candidates[front]
+        self.index = np.concatenate([self.index[old], chunk['index'][rows]])
+        self.arrays = {name: _concatenate_rows([self.arrays[name][old], chunk[name][rows]])
+                       if name in self.arrays else np.array(chunk[name][rows])
+                       for name in self.keep}
+
+
+def _nondominated(values, block=512):
+    """Indices (ascending) of the rows not dominated by any other (minimization)"""
+    n, d = values.shape
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    if d == 2:
+        # Sorted by the first objective (ties by the second), a row is on the
+        # front iff its second objective beats every row before it
+        order = np.lexsort((values[:, 1], values[:, 0]))
+        v = values[order]
+        best = np.minimum.accumulate(v[:, 1])
+        keep = np.empty(n, dtype=bool)
+        keep[0] = True
+        keep[1:] = v[1:, 1] < best[:-1]
+        # Exact duplicates of a front row are not dominated either
+        same = np.all(v[1:] == v[:-1], axis=1)
+        for i in np.flatnonzero(same) + 1:
+            keep[i] = keep[i - 1]
+        return np.sort(order[keep])
+
+    dominated = np.zeros(n, dtype=bool)
+    for start in range(0, n, block):
+        other = values[start:start + block]
+        le = np.all(other[None, :, :] <= values[:, None, :], axis=2)
+        lt = np.any(other[None, :, :] < values[:, None, :], axis=2)
+        dominated |= np.any(le & lt, axis=1)
+    return np.flatnonzero(~dominated)
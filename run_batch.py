@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Evaluate layup, material and load-case files in batch (non-interactive)
+Usage: python run_batch.py LAYUPS --materials FILE [--loads FILE] -o OUTPUT
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+from composite_lib.batch_files import run_batch_job
+from composite_lib.sweeps import SWEEP_CHUNK_ROWS
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream layups through batched ABD / strain / stress / failure evaluation")
+    parser.add_argument('layups', help="Layup file (.csv/.jsonl with a 'layup' column, "
+                                       "or one laminate code per line)")
+    parser.add_argument('--materials', required=True,
+                        help="Material file (.csv/.jsonl: name, E1, E2, G12, nu12 "
+                             "[, Xt, Xc, Yt, Yc, S]); strengths in the units of the "
+                             "moduli (GPa)")
+    parser.add_argument('--loads', help="Load-case file (.csv/.jsonl: name, Nx, Ny, Nxy, "
+                                        "Mx, My, Mxy)")
+    parser.add_argument('-o', '--output', required=True,
+                        help="Result file (.csv, .jsonl or .parquet)")
+    parser.add_argument('--format', choices=('csv', 'jsonl', 'parquet'),
+                        help="Output format (default: from the output extension)")
+    parser.add_argument('--ply-thickness', type=float, nargs='+', default=[0.125],
+                        help="Ply thickness(es) in mm")
+    parser.add_argument('--processes', type=int, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--chunk-size', type=int, default=SWEEP_CHUNK_ROWS,
+                        help="Result rows per task")
+    args = parser.parse_args()
+
+    try:
+        stats = run_batch_job(args.layups, args.materials, args.output, loads=args.loads,
+                              ply_thickness=args.ply_thickness, processes=args.processes,
+                              format=args.format, chunk_size=args.chunk_size)
+    except (OSError, ValueError, ImportError) as e:
+        sys.exit(f"Error: {e}")
+
+    print(f"Wrote {stats['rows']:,} rows ({stats['layups']:,} layups) to {args.output} "
+          f"in {stats['seconds']:.2f} s")
+    print(f"Throughput: {stats['rows_per_second']:,.0f} rows/s, "
+          f"{stats['layups_per_second']:,.0f} layups/s")
+
+
+if __name__ == '__main__':
+    main()
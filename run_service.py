@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Run the local laminate analysis service (HTTP/JSON)
+Usage: python run_service.py [--host HOST] [--port PORT] [--batch-window S]
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+from composite_lib.service import BATCH_WINDOW, DEFAULT_PORT, MAX_BATCH, run_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the laminate analysis service")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW,
+                        help="Seconds to collect concurrent requests into one batch")
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH,
+                        help="Maximum requests per batch")
+    args = parser.parse_args()
+
+    run_service(args.host, args.port, args.batch_window, args.max_batch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Run sweep workers for a SweepCoordinator on another (or this) host
+Usage: python run_sweep_worker.py HOST:PORT AUTHKEY_HEX [--processes N]
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(__file__))
+
+from composite_lib import run_worker, start_local_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run sweep workers for a coordinator")
+    parser.add_argument('address', help="Coordinator HOST:PORT")
+    parser.add_argument('authkey', help="Coordinator authkey (hex)")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="Worker processes to run on this host")
+    args = parser.parse_args()
+
+    host, port = args.address.rsplit(':', 1)
+    address, authkey = (host, int(port)), bytes.fromhex(args.authkey)
+    if args.processes == 1:
+        print(f"Completed {run_worker(address, authkey)} tasks")
+    else:
+        for process in start_local_workers(address, authkey, args.processes):
+            process.join()
+
+
+if __name__ == '__main__':
+    main()
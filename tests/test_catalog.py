@@ -0,0 +1,44 @@
+"""
+Tests for LayupCatalog with several handles on one directory
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import LayupCatalog, batch_abd
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+
+
+def test_handles_allocate_distinct_rows(tmp_path):
+    first, second = LayupCatalog(str(tmp_path)), LayupCatalog(str(tmp_path))
+    cross_ply = first.add(MATERIAL, [[0, 90, 90, 0]], 0.125)
+    angle_ply = second.add(MATERIAL, [[45, -45, -45, 45]], 0.125)
+    assert cross_ply[0] != angle_ply[0]
+
+    fresh = LayupCatalog(str(tmp_path))
+    assert len(fresh) == 2
+    np.testing.assert_allclose(fresh.get(MATERIAL, [0, 90, 90, 0], 0.125).xi[:2], [0, 1],
+                               atol=1e-12)
+    np.testing.assert_allclose(fresh.get(MATERIAL, [45, -45, -45, 45], 0.125).xi[:2], [0, -1],
+                               atol=1e-12)
+
+
+def test_reader_sees_records_grown_by_another_handle(tmp_path):
+    reader, writer = LayupCatalog(str(tmp_path)), LayupCatalog(str(tmp_path))
+    writer.add(MATERIAL, [[0, 90]], 0.125)
+    assert reader.get(MATERIAL, [0, 90], 0.125) is not None
+
+    # Beyond the first records.npy capacity, so the file is replaced
+    angles = np.array([[a, b, b, a] for a in range(-89, 91) for b in range(0, 90, 8)], float)
+    writer.add(MATERIAL, angles, 0.125)
+    assert len(reader) == len(writer)
+
+    entry = reader.get(MATERIAL, angles[-1].tolist(), 0.125)
+    A, _, _ = batch_abd(MATERIAL, angles[-1:], np.full((1, 4), 0.125))
+    np.testing.assert_allclose(entry.ABD[:3, :3], A[0])
@@ -0,0 +1,59 @@
+"""
+Tests for the batched ABD inversion and load solve
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import Laminate
+from composite_lib.compliance import batch_abd_inverse, batch_solve_strains
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+
+
+def _stiffness(rng, n):
+    """Random symmetric positive definite A and D with symmetric B"""
+    A, B, D = rng.standard_normal((3, n, 3, 3))
+    A = A @ A.swapaxes(-2, -1) + 3 * np.eye(3)
+    D = D @ D.swapaxes(-2, -1) + 3 * np.eye(3)
+    B = 0.1 * (B + B.swapaxes(-2, -1))
+    return A, B, D
+
+
+def test_solve_matches_dense_and_shares_singular_rows():
+    rng = np.random.default_rng(0)
+    A, B, D = _stiffness(rng, 6)
+    B[1] = 0.0
+    A[2] = 0.0
+    B[2] = 0.0
+    # Coupled layup whose Schur complement D - B A⁻¹ B is singular
+    D[3] = B[3] @ np.linalg.solve(A[3], B[3])
+    loads = rng.standard_normal((6, 6))
+
+    strains, curvatures = batch_solve_strains(A, B, D, loads)
+    abd, ill_conditioned = batch_abd_inverse(A, B, D)
+
+    np.testing.assert_array_equal(ill_conditioned, [False, False, True, True, False, False])
+    np.testing.assert_array_equal(np.isnan(strains).any(axis=-1), ill_conditioned)
+    np.testing.assert_array_equal(np.isnan(curvatures).any(axis=-1), ill_conditioned)
+
+    for i in np.flatnonzero(~ill_conditioned):
+        ABD = np.block([[A[i], B[i]], [B[i], D[i]]])
+        expected = np.linalg.solve(ABD, loads[i])
+        np.testing.assert_allclose(np.concatenate([strains[i], curvatures[i]]), expected,
+                                   rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(abd[i], np.linalg.inv(ABD), rtol=1e-10, atol=1e-12)
+
+
+def test_laminate_raises_for_singular_abd():
+    # Without shear stiffness the A66 and D66 terms of a 0° layup vanish
+    lam = Laminate(dict(MATERIAL, G12=0.0), [0, 0], 0.125)
+    assert lam.ill_conditioned
+    with pytest.raises(np.linalg.LinAlgError):
+        lam.calculate_strains_curvatures([1.0, 0, 0, 0, 0, 0])
@@ -0,0 +1,85 @@
+"""
+Tests for SweepCoordinator with local worker processes
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import sweep, reduce_sweep, Collect
+from composite_lib.distributed import SweepCoordinator, start_local_workers
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+FIELDS = ('A', 'strains', 'curvatures', 'index')
+
+
+def make_spec():
+    rng = np.random.default_rng(1)
+    return {'layups': [rng.choice([0, 45, -45, 90], size=8).tolist() for _ in range(400)],
+            'materials': MATERIAL, 'thicknesses': [0.125, 0.25],
+            'loads': np.array([100.0, 50.0, 0.0, 0.0, 1.0, 0.0])}
+
+
+def serial():
+    return reduce_sweep(sweep(make_spec(), chunk_size=40), Collect(*FIELDS))[0]
+
+
+def assert_same(found, expected):
+    for name in FIELDS:
+        np.testing.assert_array_equal(found[name], expected[name])
+
+
+def lease(connection):
+    """Lease a task through a hand-driven worker connection"""
+    while True:
+        connection.send(('lease', ()))
+        reply = connection.recv()
+        if reply[0] == 'task':
+            return reply
+        time.sleep(reply[1])
+
+
+def test_workers_match_serial_sweep():
+    with SweepCoordinator(make_spec(), chunk_size=40) as coordinator:
+        workers = start_local_workers(coordinator.address, coordinator.authkey, 3)
+        found, = coordinator.run(Collect(*FIELDS), timeout=60)
+    for worker in workers:
+        worker.join(10)
+    assert_same(found, serial())
+
+
+def test_stalled_and_failing_worker():
+    lease_timeout = 0.3
+    with SweepCoordinator(make_spec(), chunk_size=40, lease_timeout=lease_timeout) as coordinator, \
+            ThreadPoolExecutor(1) as executor:
+        result = executor.submit(coordinator.run, Collect(*FIELDS), timeout=60)
+        stalled = Client(coordinator.address, authkey=coordinator.authkey)
+        stalled.send(('study', ()))
+        study = stalled.recv()
+
+        # Hold a lease past its deadline; the coordinator requeues the task,
+        # then the late result arrives and the requeued copy is withdrawn
+        _, task_id, token, payload = lease(stalled)
+        chunk = study.evaluate_arrays(*payload)
+        time.sleep(3 * lease_timeout)
+        stalled.send(('complete', (task_id, chunk)))
+        stalled.recv()
+
+        # A reported failure is retried by another worker
+        _, task_id, token, _ = lease(stalled)
+        stalled.send(('fail', (task_id, token, "simulated failure")))
+        stalled.recv()
+        stalled.close()
+
+        workers = start_local_workers(coordinator.address, coordinator.authkey, 2)
+        found, = result.result()
+    for worker in workers:
+        worker.join(10)
+    assert_same(found, serial())
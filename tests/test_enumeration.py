@@ -0,0 +1,71 @@
+"""
+Tests for LayupEnumerator against brute-force enumeration
+"""
+
+import itertools
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib.enumeration import LayupEnumerator, _normalize
+
+
+def brute_force(angles, n, symmetric, balanced, max_consecutive, min_family_fraction):
+    """Canonical layups of n plies by checking every full stack"""
+    angles = sorted(set(float(a) for a in angles))
+    index = {a: i for i, a in enumerate(angles)}
+    mirror = [index.get(-a, index.get(_normalize(-a))) for a in angles]
+    mirror_closed = all(m is not None for m in mirror)
+
+    def admissible(seq):
+        stack = [angles[i] for i in seq]
+        if symmetric and stack != stack[::-1]:
+            return False
+        if balanced:
+            for a in set(stack):
+                if _normalize(a) not in (0.0, 90.0) and stack.count(a) != stack.count(-a):
+                    return False
+        if max(len(list(run)) for _, run in itertools.groupby(stack)) > max_consecutive:
+            return False
+        need = math.ceil(min_family_fraction * n - 1e-9)
+        families = {}
+        for a in stack:
+            key = _normalize(abs(a))
+            families[key] = families.get(key, 0) + 1
+        return all(families.get(_normalize(abs(a)), 0) >= need for a in angles)
+
+    canonical = set()
+    for seq in itertools.product(range(len(angles)), repeat=n):
+        if not admissible(seq):
+            continue
+        variants = [seq, seq[::-1]]
+        if mirror_closed:
+            variants += [tuple(mirror[i] for i in v) for v in variants]
+        canonical.add(min(variants))
+    return sorted(canonical)
+
+
+@pytest.mark.parametrize('angles', [[0, 45, -45, 90], [0, 45, -45, 90, 30], [-45, 0, 30, 45]])
+@pytest.mark.parametrize('symmetric', [True, False])
+@pytest.mark.parametrize('balanced', [True, False])
+def test_matches_brute_force(angles, symmetric, balanced):
+    enumerator = LayupEnumerator(angles, symmetric=symmetric, balanced=balanced,
+                                 max_consecutive=2, min_family_fraction=0.1)
+    for n in range(1, 7):
+        expected = brute_force(angles, n, symmetric, balanced, 2, 0.1)
+        found = [tuple(row) for chunk in enumerator.layups(n, n, indices=True)
+                 for row in chunk]
+        assert len(found) == len(set(found))
+        assert sorted(found) == expected
+
+
+def test_not_mirror_closed_keeps_unmirrored_layups():
+    enumerator = LayupEnumerator([0, 45, -45, 90, 30], symmetric=False, balanced=False,
+                                 max_consecutive=None, min_family_fraction=None)
+    found = {tuple(row) for chunk in enumerator.layups(3, 3) for row in chunk}
+    assert (45.0, 30.0, 45.0) in found
@@ -0,0 +1,55 @@
+"""
+Tests for the failure indices with strengths in the units of the moduli
+"""
+
+import csv
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import Laminate, max_stress_index, tsai_wu_index, run_batch_job
+
+
+# Carbon/epoxy with moduli and strengths in GPa
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+STRENGTHS = {'Xt': 1.5, 'Xc': 1.2, 'Yt': 0.05, 'Yc': 0.25, 'S': 0.07}
+
+
+def test_known_indices():
+    np.testing.assert_allclose(max_stress_index([[0.75, 0, 0], [0, -0.125, 0.035]], STRENGTHS),
+                               [0.5, 0.5])
+    # Uniaxial stress at a strength gives a Tsai-Wu index of exactly 1
+    uniaxial = [[1.5, 0, 0], [-1.2, 0, 0], [0, 0.05, 0], [0, -0.25, 0], [0, 0, 0.07]]
+    np.testing.assert_allclose(tsai_wu_index(uniaxial, STRENGTHS), 1.0)
+
+
+def test_unidirectional_ply_under_tension():
+    # A single 0° ply of thickness h under Nx carries σ1 = Nx / h
+    lam = Laminate(MATERIAL, [0], 1.0)
+    strains, curvatures = lam.calculate_strains_curvatures([0.75, 0, 0, 0, 0, 0])
+    _, local = lam.calculate_ply_stresses(strains, curvatures, 0, 'mid')
+    np.testing.assert_allclose(local, [0.75, 0, 0], atol=1e-12)
+    assert max_stress_index(local, STRENGTHS) == pytest.approx(0.5)
+
+
+def test_batch_job_failure_index(tmp_path):
+    layups, materials, loads = (str(tmp_path / name) for name in
+                                ('layups.txt', 'materials.csv', 'loads.csv'))
+    with open(layups, 'w') as f:
+        f.write("[0]\n")
+    with open(materials, 'w', newline='') as f:
+        writer = csv.DictWriter(f, ['name', *MATERIAL, *STRENGTHS])
+        writer.writeheader()
+        writer.writerow({'name': 'cfrp', **MATERIAL, **STRENGTHS})
+    with open(loads, 'w') as f:
+        f.write("name,Nx\ntension,0.75\n")
+
+    output = str(tmp_path / 'results.csv')
+    run_batch_job(layups, materials, output, loads=loads, ply_thickness=(1.0,), processes=1)
+    with open(output, newline='') as f:
+        row, = csv.DictReader(f)
+    assert float(row['max_stress_index']) == pytest.approx(0.5)
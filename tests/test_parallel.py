@@ -0,0 +1,42 @@
+"""
+Tests for parallel_sweep against the serial sweep
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import sweep, reduce_sweep, parallel_sweep, Collect, Extrema
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+LOADS = np.array([100.0, 50.0, 10.0, 5.0, 2.0, 1.0])
+
+
+@pytest.mark.parametrize('layups', [[], iter([]), [np.empty((0, 4))]])
+def test_empty_layups(layups):
+    spec = {'layups': layups, 'materials': MATERIAL, 'thicknesses': 0.125}
+    with pytest.raises(ValueError, match="no layups"):
+        parallel_sweep(spec, processes=1)
+
+    collect, extrema = reduce_sweep(sweep(dict(spec, layups=[])), Collect('A'), Extrema('A'))
+    assert len(collect['A']) == 0 and extrema.count == 0
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_matches_serial_sweep(processes, tmp_path):
+    rng = np.random.default_rng(0)
+    layups = [rng.choice([0, 45, -45, 90], size=n).tolist() for n in rng.integers(2, 9, 60)]
+    spec = {'layups': layups, 'materials': [MATERIAL, dict(MATERIAL, E1=70.0)],
+            'thicknesses': [0.125, 0.25], 'loads': LOADS}
+    fields = ('stresses',)
+    expected = reduce_sweep(sweep(spec, fields), Collect('A', 'strains', 'stresses'))[0]
+
+    for path in (None, str(tmp_path / 'results')):
+        results = parallel_sweep(spec, fields, processes=processes, path=path, min_task_rows=16)
+        for name in ('A', 'strains', 'stresses'):
+            np.testing.assert_array_equal(results[name], expected[name])
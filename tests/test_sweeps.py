@@ -0,0 +1,120 @@
+"""
+Tests for sweep reducers on layups of mixed ply counts
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from composite_lib import (sweep, reduce_sweep, Collect, Extrema, Moments, Histogram,
+                           ParetoFront)
+
+
+MATERIAL = {'E1': 140.0, 'E2': 10.0, 'G12': 5.0, 'nu12': 0.3}
+
+# Per-ply fields are as wide as the longest layup of their chunk
+SPEC = {'layups': [[0, 90], [0, 90], [0, 90], [0, 45, -45, 90], [45, -45], [0, 30, -30]],
+        'materials': MATERIAL, 'thicknesses': 0.125,
+        'loads': np.array([100.0, 50.0, 10.0, 5.0, 2.0, 1.0])}
+
+PER_PLY_FIELDS = ('angles', 'thicknesses', 'stresses', 'material_stresses')
+FIELDS = ('stresses', 'material_stresses')
+
+
+def reducers():
+    return (Collect(*PER_PLY_FIELDS),
+            Extrema('stresses'), Extrema('angles'), Moments('material_stresses'),
+            ParetoFront([('strains', 0), ('curvatures', 0)], keep=('angles',)))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 4])
+def test_mixed_ply_counts_match_single_chunk(chunk_size):
+    # One chunk holds every layup, so its fields share the widest width
+    expected = reduce_sweep(sweep(SPEC, FIELDS, chunk_size=10**6), *reducers())
+    found = reduce_sweep(sweep(SPEC, FIELDS, chunk_size=chunk_size), *reducers())
+
+    for name in PER_PLY_FIELDS:
+        np.testing.assert_array_equal(found[0][name], expected[0][name])
+    for i in (1, 2):
+        for attr in ('min', 'max', 'argmin', 'argmax'):
+            np.testing.assert_array_equal(getattr(found[i], attr), getattr(expected[i], attr))
+    np.testing.assert_array_equal(found[3].count, expected[3].count)
+    np.testing.assert_allclose(found[3].mean, expected[3].mean, rtol=1e-12, atol=1e-9)
+    np.testing.assert_allclose(found[3].variance, expected[3].variance, rtol=1e-9, atol=1e-9)
+    np.testing.assert_array_equal(found[4].index, expected[4].index)
+    np.testing.assert_array_equal(found[4].arrays['angles'], expected[4].arrays['angles'])
+
+
+def _random_spec(seed=0, n_layups=40):
+    """Layups of 1-6 plies; the shear-free material makes 0/90 layups singular"""
+    rng = np.random.default_rng(seed)
+    layups = [list(rng.choice([0, 45, -45, 90], size=rng.integers(1, 7)))
+              for _ in range(n_layups)]
+    return {'layups': layups, 'materials': [MATERIAL, dict(MATERIAL, G12=0.0)],
+            'thicknesses': [0.125, 0.25],
+            'loads': [[100.0, 50.0, 10.0, 5.0, 2.0, 1.0], [-20.0, 80.0, 0.0, 0.0, 3.0, -1.0]]}
+
+
+def _front(values):
+    """Brute-force non-dominated rows (minimization), NaN rows excluded"""
+    valid = ~np.isnan(values).any(axis=1)
+    le = np.all(values[None, :, :] <= values[:, None, :], axis=2)
+    lt = np.any(values[None, :, :] < values[:, None, :], axis=2)
+    dominated = np.any(le & lt & valid[None, :], axis=1)
+    return np.flatnonzero(valid & ~dominated)
+
+
+@pytest.mark.parametrize('chunk_size', [3, 16, 10**6])
+def test_reducers_match_collected_rows(chunk_size):
+    spec = _random_spec()
+    edges = np.linspace(-2e3, 2e3, 41)
+    collect, extrema, moments, histogram, front2, front3 = reduce_sweep(
+        sweep(spec, FIELDS, chunk_size=chunk_size),
+        Collect('index', 'A', 'D', 'strains', 'curvatures', 'stresses', 'material_stresses',
+                'angles'),
+        Extrema('stresses'), Moments('material_stresses'),
+        Histogram(('strains', 1), edges),
+        ParetoFront([('strains', 0), ('curvatures', 0)], maximize=[False, True],
+                    keep=('angles',)),
+        ParetoFront([('A', 0, 0), ('A', 2, 2), ('D', 0, 0)], maximize=[True, True, False]))
+
+    index = collect['index']
+    stresses = collect['stresses']
+    assert np.isnan(stresses).any() and len(index) == 40 * 2 * 2 * 2
+
+    # Extrema: NaN ignored, first occurrence wins ties
+    np.testing.assert_array_equal(extrema.min, np.nanmin(stresses, axis=0))
+    np.testing.assert_array_equal(extrema.max, np.nanmax(stresses, axis=0))
+    np.testing.assert_array_equal(extrema.argmin, index[np.nanargmin(stresses, axis=0)])
+    np.testing.assert_array_equal(extrema.argmax, index[np.nanargmax(stresses, axis=0)])
+    assert extrema.count == len(index)
+
+    material_stresses = collect['material_stresses']
+    np.testing.assert_array_equal(moments.count, (~np.isnan(material_stresses)).sum(axis=0))
+    np.testing.assert_allclose(moments.mean, np.nanmean(material_stresses, axis=0),
+                               rtol=1e-10, atol=1e-9)
+    np.testing.assert_allclose(moments.variance, np.nanvar(material_stresses, axis=0, ddof=1),
+                               rtol=1e-9, atol=1e-9)
+
+    strains = collect['strains'][:, 1]
+    np.testing.assert_array_equal(histogram.counts,
+                                  np.histogram(strains[np.isfinite(strains)], edges)[0])
+    assert 0 < histogram.counts.sum() < len(strains)
+
+    values = np.stack([collect['strains'][:, 0], collect['curvatures'][:, 0]], axis=1)
+    rows = _front(values * [1.0, -1.0])
+    assert len(rows) > 1
+    np.testing.assert_array_equal(np.sort(front2.index), index[rows])
+    order = np.argsort(front2.index)
+    np.testing.assert_array_equal(front2.values[order], values[rows])
+    np.testing.assert_array_equal(front2.arrays['angles'][order], collect['angles'][rows])
+
+    # Rows differing only in load case tie on A and D: all stay on the front
+    values = np.stack([collect['A'][:, 0, 0], collect['A'][:, 2, 2], collect['D'][:, 0, 0]],
+                      axis=1)
+    rows = _front(values * [-1.0, -1.0, 1.0])
+    np.testing.assert_array_equal(np.sort(front3.index), index[rows])
@@ -7,11 +7,82 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
+import time
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from composite_lib import Laminate, Lamina
+from composite_lib import Laminate, Lamina, LayupBatch, parse_layup
+from visualization.precompute import SweepPrecomputer
+
+
+# Slider grid of the stiffness rotation study (every 5 degrees)
+STIFFNESS_ROTATIONS = np.arange(-90, 91, 5)
+
+# Rotation grid of the quasi-isotropic study
+QUASI_ISO_ROTATIONS = np.linspace(0, 360, 73)
+
+# Candidate laminates of the quasi-isotropic study
+QUASI_ISO_CANDIDATES = {
+    "[-45/0/45/90]": [-45, 0, 45, 90],
+    "[0/30/60/90]": [0, 30, 60, 90],
+    "[0/45/-45/90]": [0, 45, -45, 90],
+    "[0/60/-60]": [0, 60, -60]
+}
+
+# Value ranges of the material property variation study
+MATERIAL_SWEEP_RANGES = {
+    "E1": (np.linspace(50, 300, 50), "E₁ (GPa)"),
+    "E2": (np.linspace(5, 50, 50), "E₂ (GPa)"),
+    "G12": (np.linspace(2, 20, 50), "G₁₂ (GPa)"),
+    "nu12": (np.linspace(0.15, 0.45, 50), "ν₁₂"),
+}
+
+
+@st.cache_resource
+def get_precomputer():
+    """Worker pool shared by all sessions of the visualizer"""
+    return SweepPrecomputer()
+
+
+def schedule_precomputation(viz_mode, material, stacking_input, ply_thickness):
+    """
+    Start background sweeps for the slider ranges of the active mode
+
+    Called on each rerun; sweeps already running or finished for the same
+    inputs are reused, so only a changed laminate or mode triggers new work.
+    Modes without sweeps schedule nothing.
+    """
+    precomputer = get_precomputer()
+
+    if viz_mode == "Quasi-Isotropic Study":
+        for base_sequence in QUASI_ISO_CANDIDATES.values():
+            precomputer.rotation_sweep(material, base_sequence, ply_thickness,
+                                       QUASI_ISO_ROTATIONS, wrap=True)
+
+    elif viz_mode == "Stiffness Analysis":
+        try:
+            lam = Laminate(material, stacking_input, ply_thickness)
+        except Exception:
+            return
+        precomputer.rotation_sweep(material, lam.stacking_sequence, ply_thickness,
+                                   STIFFNESS_ROTATIONS)
+
+    elif viz_mode == "Parametric Analysis":
+        for prop, (values, _) in MATERIAL_SWEEP_RANGES.items():
+            precomputer.material_sweep(material, stacking_input, ply_thickness,
+                                       prop, values)
+
+
+def wait_for_sweep(job, label="Computing sweep"):
+    """Stream the progress of a background sweep into the page until done"""
+    if not job.done():
+        bar = st.progress(job.progress, text=label)
+        while not job.done():
+            time.sleep(0.05)
+            bar.progress(job.progress, text=f"{label} ({job.progress:.0%})")
+        bar.empty()
+    return job.result()
 
 
 def main():
@@ -32,7 +103,8 @@ def main():
 
         viz_mode = st.selectbox(
             "Visualization Mode",
-            ["Laminate Structure", "Stiffness Analysis", "Quasi-Isotropic Study",
+            ["Laminate Structure", "Stiffness Analysis", "Polar Diagrams",
+             "Quasi-Isotropic Study", "Layup Comparison",
              "Parametric Analysis", "Stress/Strain Distribution"]
         )
 
@@ -69,7 +141,8 @@ def main():
         stacking_input = st.text_input(
             "Stacking Sequence",
             value="0/45/-45/90",
-            help="Enter angles separated by /, use _s for symmetric"
+            help="Enter angles separated by /, use _s for symmetric, "
+                 "e.g. [0/±45/90]_2s, [45/-45]_3, [0/45/90bar]_s"
         )
 
         ply_thickness = st.number_input(
@@ -80,6 +153,9 @@ def main():
             step=0.01
         )
 
+    # Warm up the slider sweeps of the current mode in the background
+    schedule_precomputation(viz_mode, material, stacking_input, ply_thickness)
+
     # Main content area
     if viz_mode == "Laminate Structure":
         visualize_laminate_structure(material, stacking_input, ply_thickness)
@@ -87,9 +163,15 @@ def main():
     elif viz_mode == "Stiffness Analysis":
         visualize_stiffness_analysis(material, stacking_input, ply_thickness)
 
+    elif viz_mode == "Polar Diagrams":
+        visualize_polar_diagrams(material, stacking_input, ply_thickness)
+
     elif viz_mode == "Quasi-Isotropic Study":
         visualize_quasi_isotropic(material, ply_thickness)
 
+    elif viz_mode == "Layup Comparison":
+        visualize_layup_comparison(material, ply_thickness)
+
     elif viz_mode == "Parametric Analysis":
         visualize_parametric_analysis(material, stacking_input, ply_thickness)
 
@@ -173,66 +255,176 @@ def visualize_laminate_structure(material, stacking_input, ply_thickness):
         st.error(f"Error: {str(e)}")
 
 
-def create_3d_laminate_plot(lam):
-    """Create 3D visualization of laminate layers"""
-    fig = go.Figure()
+# Box topology shared by every ply slab: 8 corner vertices, 12 triangles
+_SLAB_I = np.array([0, 0, 4, 4, 0, 0, 1, 1, 2, 2, 3, 3])
+_SLAB_J = np.array([1, 2, 5, 6, 1, 5, 2, 6, 3, 7, 0, 4])
+_SLAB_K = np.array([2, 3, 6, 7, 5, 4, 6, 5, 7, 6, 4, 7])
+
+# Above this many slabs, repeated sub-laminates are collapsed
+MAX_3D_SLABS = 64
+
+
+def _format_block(angles):
+    """Format a run of ply angles as laminate code, e.g. [0/45/-45/90]"""
+    return "[" + "/".join(f"{a:g}" for a in angles) + "]"
+
+
+def collapse_ply_blocks(angles, z_coords, max_slabs=MAX_3D_SLABS):
+    """
+    Reduce a ply stack to a bounded list of drawable slabs
+
+    Adjacent plies with equal angle are merged first. If more than
+    max_slabs blocks remain, tandem repeats of sub-laminates are collapsed
+    so that only the first repeat is drawn ply by ply, and the remaining
+    repeats become one grey slab. As a last resort the middle of the stack
+    is collapsed, keeping the outer plies (which dominate bending) visible.
+
+    Parameters:
+    -----------
+    angles : array_like
+        Ply angles (degrees), bottom to top
+    z_coords : array_like
+        Ply interface z-coordinates (n_plies + 1)
+    max_slabs : int
+        Slab budget for the rendered figure
+
+    Returns:
+    --------
+    slabs : list of tuple
+        (z_bottom, z_top, angle or None, label); angle is None for
+        collapsed slabs
+    """
+    angles = np.asarray(angles, dtype=float)
+    z_coords = np.asarray(z_coords, dtype=float)
+
+    # Run-length merge of equal adjacent angles (lossless for display)
+    starts = np.flatnonzero(np.r_[True, angles[1:] != angles[:-1]])
+    ends = np.r_[starts[1:], len(angles)]
+    blocks = [(z_coords[a], z_coords[b], angles[a], b - a)
+              for a, b in zip(starts, ends)]
+
+    def slab(block):
+        z_bot, z_top, theta, count = block
+        text = f"{theta:g}°" if count == 1 else f"{theta:g}° × {count} plies"
+        return (z_bot, z_top, theta, text)
+
+    if len(blocks) <= max_slabs:
+        return [slab(b) for b in blocks]
+
+    # Collapse tandem repeats of sub-laminates (periods up to max_slabs / 2)
+    key = [(theta, round(zt - zb, 12)) for zb, zt, theta, _ in blocks]
+    slabs = []
+    i, n = 0, len(blocks)
+    max_period = max(1, max_slabs // 2)
+    while i < n:
+        best_p, best_r = 0, 1
+        for p in range(1, min(max_period, (n - i) // 2) + 1):
+            r = 1
+            while i + (r + 1) * p <= n and key[i + r*p:i + (r+1)*p] == key[i:i + p]:
+                r += 1
+            if r > 1 and (r - 1) * p > (best_r - 1) * best_p:
+                best_p, best_r = p, r
+        if best_r > 1:
+            unit = blocks[i:i + best_p]
+            slabs.extend(slab(b) for b in unit)
+            last = blocks[i + best_r*best_p - 1]
+            plies = sum(b[3] for b in unit)
+            code = _format_block([b[2] for b in unit for _ in range(b[3])])
+            slabs.append((unit[-1][1], last[1], None,
+                          f"{code} × {best_r - 1} more ({plies * (best_r - 1)} plies)"))
+            i += best_r * best_p
+        else:
+            slabs.append(slab(blocks[i]))
+            i += 1
+
+    if len(slabs) > max_slabs:
+        keep = max_slabs // 2
+        hidden = slabs[keep:len(slabs) - keep]
+        slabs = (slabs[:keep]
+                 + [(hidden[0][0], hidden[-1][1], None,
+                     f"{len(hidden)} inner blocks collapsed")]
+                 + slabs[len(slabs) - keep:])
+
+    return slabs
 
+
+def create_3d_laminate_plot(lam, max_slabs=MAX_3D_SLABS):
+    """
+    Create 3D visualization of laminate layers
+
+    All ply slabs are merged into a single Mesh3d (per-face color by angle)
+    and all fiber-direction arrows into a single line trace, so the figure
+    carries two traces regardless of ply count.
+    """
     # Color map for angles
     colors = px.colors.qualitative.Set3
+    collapsed_color = 'lightgray'
 
-    # Create each ply as a 3D surface
     width = 50  # mm
     length = 50  # mm
 
-    for i, theta in enumerate(lam.stacking_sequence):
-        z_bottom = lam.z_coords[i]
-        z_top = lam.z_coords[i+1]
-
-        # Create ply surfaces
-        x = np.array([[0, length], [0, length]])
-        y = np.array([[0, 0], [width, width]])
-        z = np.array([[z_bottom, z_bottom], [z_bottom, z_bottom]])
-
-        # Color based on angle
-        color_idx = int((theta + 90) / 30) % len(colors)
-
-        # Bottom surface
-        fig.add_trace(go.Surface(
-            x=x, y=y, z=z,
-            colorscale=[[0, colors[color_idx]], [1, colors[color_idx]]],
-            showscale=False,
-            name=f"Ply {i+1} ({theta}°)",
-            hovertemplate=f"Ply {i+1}<br>Angle: {theta}°<br>z: %{{z:.4f}} mm<extra></extra>"
-        ))
+    slabs = collapse_ply_blocks(lam.stacking_sequence, lam.z_coords, max_slabs)
+    n_slabs = len(slabs)
+    z_bottom = np.array([s[0] for s in slabs])
+    z_top = np.array([s[1] for s in slabs])
+
+    # Slab vertices: 4 bottom corners then 4 top corners per slab
+    corner_x = np.array([0, length, length, 0] * 2, dtype=float)
+    corner_y = np.array([0, 0, width, width] * 2, dtype=float)
+    x = np.tile(corner_x, n_slabs)
+    y = np.tile(corner_y, n_slabs)
+    z = np.column_stack([np.repeat(z_bottom[:, None], 4, axis=1),
+                         np.repeat(z_top[:, None], 4, axis=1)]).ravel()
+
+    offsets = 8 * np.arange(n_slabs)[:, None]
+    i_idx = (_SLAB_I + offsets).ravel()
+    j_idx = (_SLAB_J + offsets).ravel()
+    k_idx = (_SLAB_K + offsets).ravel()
+
+    slab_colors = [collapsed_color if theta is None
+                   else colors[int((theta + 90) / 30) % len(colors)]
+                   for _, _, theta, _ in slabs]
+    facecolor = np.repeat(slab_colors, len(_SLAB_I))
+    hovertext = np.repeat([text for _, _, _, text in slabs], 8)
 
-        # Top surface
-        z = np.array([[z_top, z_top], [z_top, z_top]])
-        fig.add_trace(go.Surface(
-            x=x, y=y, z=z,
-            colorscale=[[0, colors[color_idx]], [1, colors[color_idx]]],
-            showscale=False,
-            showlegend=False,
-            hovertemplate=f"Ply {i+1}<br>Angle: {theta}°<br>z: %{{z:.4f}} mm<extra></extra>"
-        ))
+    fig = go.Figure()
+    fig.add_trace(go.Mesh3d(
+        x=x, y=y, z=z,
+        i=i_idx, j=j_idx, k=k_idx,
+        facecolor=facecolor,
+        flatshading=True,
+        hovertext=hovertext,
+        hovertemplate="%{hovertext}<br>z: %{z:.4f} mm<extra></extra>",
+        name="Plies"
+    ))
 
-        # Draw fiber direction arrows
-        mid_z = (z_bottom + z_top) / 2
+    # Fiber direction arrows, one segment per drawn slab, separated by None
+    drawn = [(zb, zt, theta) for zb, zt, theta, _ in slabs if theta is not None]
+    if drawn:
+        theta = np.radians([d[2] for d in drawn])
+        mid_z = np.array([(d[0] + d[1]) / 2 for d in drawn])
         arrow_length = 15
         cx, cy = length/2, width/2
-        dx = arrow_length * np.cos(np.radians(theta))
-        dy = arrow_length * np.sin(np.radians(theta))
+        dx = arrow_length * np.cos(theta)
+        dy = arrow_length * np.sin(theta)
+        gap = np.full(len(drawn), None)
+
+        line_x = np.column_stack([cx - dx/2, cx + dx/2, gap]).ravel()
+        line_y = np.column_stack([cy - dy/2, cy + dy/2, gap]).ravel()
+        line_z = np.column_stack([mid_z, mid_z, gap]).ravel()
+        hover = np.repeat([f"Fiber direction: {d[2]:g}°" for d in drawn], 3)
 
-        # Draw line for fiber direction
         fig.add_trace(go.Scatter3d(
-            x=[cx - dx/2, cx + dx/2],
-            y=[cy - dy/2, cy + dy/2],
-            z=[mid_z, mid_z],
+            x=line_x, y=line_y, z=line_z,
             mode='lines+markers',
             line=dict(color='black', width=4),
-            marker=dict(size=[6, 10], color=['black', 'red'], symbol='diamond'),
-            name=f"Fiber direction {theta}°",
-            showlegend=False,
-            hovertemplate=f"Fiber direction: {theta}°<extra></extra>"
+            marker=dict(size=np.tile([6, 10, 0], len(drawn)),
+                        color=np.tile(['black', 'red', 'black'], len(drawn)),
+                        symbol='diamond'),
+            hovertext=hover,
+            hovertemplate="%{hovertext}<extra></extra>",
+            name="Fiber directions",
+            showlegend=False
         ))
 
     fig.update_layout(
@@ -285,9 +477,17 @@ def visualize_stiffness_analysis(material, stacking_input, ply_thickness):
             key="rotation_slider_stiffness"
         )
 
-        # Recalculate rotated laminate
+        # Look up the rotated laminate in the precomputed sweep, or compute
+        # it directly while the sweep is still running
         rotated_sequence = [(angle + rotation_angle) for angle in lam.stacking_sequence]
-        lam_rotated = Laminate(material, rotated_sequence, ply_thickness)
+        sweep = get_precomputer().rotation_sweep(
+            material, lam.stacking_sequence, ply_thickness, STIFFNESS_ROTATIONS
+        )
+        rotation_index = int(np.searchsorted(STIFFNESS_ROTATIONS, rotation_angle))
+        if sweep.done():
+            lam_rotated = sweep.point(rotation_index)
+        else:
+            lam_rotated = Laminate(material, rotated_sequence, ply_thickness)
 
         # Display current rotation prominently
         st.metric("Current Rotation Angle", f"{rotation_angle}°",
@@ -375,20 +575,12 @@ def visualize_stiffness_analysis(material, stacking_input, ply_thickness):
         with st.expander("Show continuous rotation analysis", expanded=False):
             st.write("This plot shows how stiffness matrix elements vary with rotation angle")
 
-            # Calculate for a range of angles
-            angles = np.linspace(-90, 90, 37)  # Every 5 degrees
-            A11_vals, A22_vals, A12_vals, A66_vals = [], [], [], []
-            A16_vals, A26_vals = [], []
-
-            for angle in angles:
-                temp_seq = [(a + angle) for a in lam.stacking_sequence]
-                temp_lam = Laminate(material, temp_seq, ply_thickness)
-                A11_vals.append(temp_lam.A[0, 0])
-                A22_vals.append(temp_lam.A[1, 1])
-                A12_vals.append(temp_lam.A[0, 1])
-                A66_vals.append(temp_lam.A[2, 2])
-                A16_vals.append(temp_lam.A[0, 2])
-                A26_vals.append(temp_lam.A[1, 2])
+            # Precomputed sweep over the slider range (every 5 degrees)
+            angles = STIFFNESS_ROTATIONS
+            A_sweep, _, _ = wait_for_sweep(sweep, "Computing rotation sweep")
+            A11_vals, A22_vals = A_sweep[:, 0, 0], A_sweep[:, 1, 1]
+            A12_vals, A66_vals = A_sweep[:, 0, 1], A_sweep[:, 2, 2]
+            A16_vals, A26_vals = A_sweep[:, 0, 2], A_sweep[:, 1, 2]
 
             # Create plot
             fig = go.Figure()
@@ -483,6 +675,61 @@ def create_matrix_heatmap(matrix, title, units):
     return fig
 
 
+def visualize_polar_diagrams(material, stacking_input, ply_thickness):
+    """Polar diagrams of effective laminate engineering constants"""
+    st.header("🧭 Polar Stiffness Diagrams")
+
+    st.write("""
+    Effective membrane and flexural engineering constants along every in-plane
+    direction, from the closed-form rotation of the laminate compliance.
+    """)
+
+    try:
+        lam = Laminate(material, stacking_input, ply_thickness)
+
+        n_directions = st.slider("Number of Directions", 36, 3600, 360, step=36)
+        directions = np.linspace(0, 360, n_directions + 1)
+        polar = lam.get_engineering_constants_polar(directions)
+
+        constants = lam.get_engineering_constants()
+        cols = st.columns(6)
+        for col, (key, label, unit) in zip(cols, [
+                ('E_x', 'Eₓ', 'GPa'), ('E_y', 'Eᵧ', 'GPa'), ('G_xy', 'Gₓᵧ', 'GPa'),
+                ('nu_xy', 'νₓᵧ', ''), ('E_fx', 'E_fx', 'GPa'), ('E_fy', 'E_fy', 'GPa')]):
+            col.metric(label, f"{constants[key]:.3f} {unit}".strip())
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            fig1 = go.Figure()
+            fig1.add_trace(go.Scatterpolar(r=polar['E_x'], theta=directions,
+                                           mode='lines', name='Eₓ(θ)'))
+            fig1.add_trace(go.Scatterpolar(r=polar['G_xy'], theta=directions,
+                                           mode='lines', name='Gₓᵧ(θ)'))
+            fig1.update_layout(title="Membrane Moduli (GPa)", height=500)
+            st.plotly_chart(fig1, use_container_width=True)
+
+        with col2:
+            fig2 = go.Figure()
+            fig2.add_trace(go.Scatterpolar(r=polar['E_fx'], theta=directions,
+                                           mode='lines', name='E_fx(θ)'))
+            fig2.add_trace(go.Scatterpolar(r=polar['G_fxy'], theta=directions,
+                                           mode='lines', name='G_fxy(θ)'))
+            fig2.update_layout(title="Flexural Moduli (GPa)", height=500)
+            st.plotly_chart(fig2, use_container_width=True)
+
+        fig3 = go.Figure()
+        fig3.add_trace(go.Scatterpolar(r=polar['nu_xy'], theta=directions,
+                                       mode='lines', name='νₓᵧ(θ)'))
+        fig3.add_trace(go.Scatterpolar(r=polar['nu_fxy'], theta=directions,
+                                       mode='lines', name='ν_fxy(θ)'))
+        fig3.update_layout(title="Poisson's Ratios", height=450)
+        st.plotly_chart(fig3, use_container_width=True)
+
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+
+
 def visualize_quasi_isotropic(material, ply_thickness):
     """Visualize quasi-isotropic laminate behavior"""
     st.header("🔄 Quasi-Isotropic Laminate Study")
@@ -493,32 +740,18 @@ def visualize_quasi_isotropic(material, ply_thickness):
     """)
 
     # Test different laminates
-    test_laminates = {
-        "[-45/0/45/90]": [-45, 0, 45, 90],
-        "[0/30/60/90]": [0, 30, 60, 90],
-        "[0/45/-45/90]": [0, 45, -45, 90],
-        "[0/60/-60]": [0, 60, -60]
-    }
+    selected_laminate = st.selectbox("Select Laminate", list(QUASI_ISO_CANDIDATES.keys()))
 
-    selected_laminate = st.selectbox("Select Laminate", list(test_laminates.keys()))
+    base_sequence = QUASI_ISO_CANDIDATES[selected_laminate]
 
-    base_sequence = test_laminates[selected_laminate]
-
-    # Calculate for different rotations
-    rotations = np.linspace(0, 360, 73)
-    results = {'A11': [], 'A22': [], 'A12': [], 'A66': [], 'A16': [], 'A26': []}
-
-    for rot in rotations:
-        rotated = [(angle + rot) % 360 for angle in base_sequence]
-        rotated = [a if a <= 180 else a - 360 for a in rotated]
-        lam = Laminate(material, rotated, ply_thickness)
-
-        results['A11'].append(lam.A[0, 0])
-        results['A22'].append(lam.A[1, 1])
-        results['A12'].append(lam.A[0, 1])
-        results['A66'].append(lam.A[2, 2])
-        results['A16'].append(lam.A[0, 2])
-        results['A26'].append(lam.A[1, 2])
+    # Look up the precomputed rotation sweep
+    rotations = QUASI_ISO_ROTATIONS
+    sweep = get_precomputer().rotation_sweep(material, base_sequence, ply_thickness,
+                                             rotations, wrap=True)
+    A_sweep, _, _ = wait_for_sweep(sweep, f"Rotating {selected_laminate}")
+    results = {'A11': A_sweep[:, 0, 0], 'A22': A_sweep[:, 1, 1],
+               'A12': A_sweep[:, 0, 1], 'A66': A_sweep[:, 2, 2],
+               'A16': A_sweep[:, 0, 2], 'A26': A_sweep[:, 1, 2]}
 
     # Check quasi-isotropy
     A11_range = max(results['A11']) - min(results['A11'])
@@ -566,6 +799,119 @@ def visualize_quasi_isotropic(material, ply_thickness):
     st.plotly_chart(fig2, use_container_width=True)
 
 
+@st.cache_resource(max_entries=8)
+def evaluate_layup_batch(material_items, layup_text, ply_thickness):
+    """
+    Parse pasted layups (one per line) and evaluate them in one batch pass
+
+    Cached on the inputs, so selecting or sorting never recomputes.
+
+    Returns:
+    --------
+    batch : LayupBatch
+    rejected : list of str
+        Lines that could not be parsed
+    """
+    layups, rejected = [], []
+    for line in layup_text.splitlines():
+        line = line.strip().strip(',;')
+        if not line or line.startswith('#'):
+            continue
+        try:
+            if not parse_layup(line):
+                raise ValueError
+            layups.append(line)
+        except Exception:
+            rejected.append(line)
+
+    return LayupBatch(dict(material_items), layups, ply_thickness), rejected
+
+
+def visualize_layup_comparison(material, ply_thickness):
+    """Compare many layups evaluated through one batch ABD pass"""
+    st.header("📋 Layup Comparison")
+
+    st.write("Paste or upload layups, one per line (e.g. `0/45/-45/90_s`).")
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        layup_text = st.text_area(
+            "Layups",
+            value="\n".join(["0/45/-45/90_s", "0/90/0_s", "45/-45/45/-45",
+                             "0/30/60/90", "0/60/-60_s", "0/0/90/90"]),
+            height=200
+        )
+    with col2:
+        uploaded = st.file_uploader("Upload layup file", type=["txt", "csv"])
+        if uploaded is not None:
+            layup_text = uploaded.getvalue().decode("utf-8")
+
+    batch, rejected = evaluate_layup_batch(tuple(sorted(material.items())),
+                                           layup_text, ply_thickness)
+    if rejected:
+        st.warning(f"Skipped {len(rejected)} unparseable line(s): "
+                   + ", ".join(rejected[:10]) + (" ..." if len(rejected) > 10 else ""))
+    if len(batch) == 0:
+        st.info("Enter at least one valid layup.")
+        return
+
+    metrics = batch.metrics()
+    st.write(f"**{len(batch)} layups evaluated**")
+
+    # Sortable table (click a column header to sort)
+    st.dataframe(metrics, use_container_width=True, height=350)
+
+    # Scatter plot of any two metrics
+    numeric = [k for k in metrics if k != 'Layup']
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x_key = st.selectbox("X Axis", numeric, index=numeric.index('A11'))
+    with col2:
+        y_key = st.selectbox("Y Axis", numeric, index=numeric.index('D66'))
+    with col3:
+        c_key = st.selectbox("Color", numeric, index=numeric.index('|B|'))
+
+    fig = go.Figure(go.Scattergl(
+        x=metrics[x_key], y=metrics[y_key],
+        mode='markers',
+        marker=dict(color=metrics[c_key], colorscale='Viridis', showscale=True,
+                    colorbar=dict(title=c_key), size=8),
+        text=metrics['Layup'],
+        hovertemplate="%{text}<br>" + x_key + ": %{x:.3f}<br>" + y_key
+                      + ": %{y:.3f}<extra></extra>"
+    ))
+    fig.update_layout(title=f"{y_key} vs. {x_key}", xaxis_title=x_key,
+                      yaxis_title=y_key, height=500)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Drill into one layup using the batch results
+    st.markdown("---")
+    st.subheader("🔍 Selected Layup")
+    index = st.selectbox("Layup", range(len(batch)),
+                         format_func=lambda i: batch.labels[i])
+    view = batch.view(index)
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.write(f"**Stacking Sequence:** {view.stacking_sequence}")
+        st.write(f"**Number of Plies:** {view.n_plies}")
+        st.write(f"**Total Thickness:** {view.total_thickness:.4f} mm")
+        st.write(f"**Max |B|:** {np.max(np.abs(view.B)):.3f} N")
+    with col2:
+        st.plotly_chart(create_3d_laminate_plot(view), use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.plotly_chart(create_matrix_heatmap(view.A, "[A] Extensional Stiffness", "N/mm"),
+                        use_container_width=True)
+    with col2:
+        st.plotly_chart(create_matrix_heatmap(view.B, "[B] Coupling Stiffness", "N"),
+                        use_container_width=True)
+    with col3:
+        st.plotly_chart(create_matrix_heatmap(view.D, "[D] Bending Stiffness", "N·mm"),
+                        use_container_width=True)
+
+
 def visualize_parametric_analysis(material, stacking_input, ply_thickness):
     """Interactive parametric analysis"""
     st.header("🎛️ Parametric Analysis")
@@ -622,33 +968,13 @@ def visualize_parametric_analysis(material, stacking_input, ply_thickness):
 
         property_to_vary = st.selectbox("Property to Vary", ["E1", "E2", "G12", "nu12"])
 
-        if property_to_vary == "E1":
-            values = np.linspace(50, 300, 50)
-            ylabel = "E₁ (GPa)"
-        elif property_to_vary == "E2":
-            values = np.linspace(5, 50, 50)
-            ylabel = "E₂ (GPa)"
-        elif property_to_vary == "G12":
-            values = np.linspace(2, 20, 50)
-            ylabel = "G₁₂ (GPa)"
-        else:
-            values = np.linspace(0.15, 0.45, 50)
-            ylabel = "ν₁₂"
-
-        A11_vals, A22_vals, D11_vals = [], [], []
+        values, ylabel = MATERIAL_SWEEP_RANGES[property_to_vary]
 
-        for val in values:
-            mat = material.copy()
-            mat[property_to_vary] = val
-            try:
-                lam = Laminate(mat, stacking_input, ply_thickness)
-                A11_vals.append(lam.A[0, 0])
-                A22_vals.append(lam.A[1, 1])
-                D11_vals.append(lam.D[0, 0])
-            except:
-                A11_vals.append(np.nan)
-                A22_vals.append(np.nan)
-                D11_vals.append(np.nan)
+        # Precomputed in the background; NaN marks invalid property values
+        sweep = get_precomputer().material_sweep(material, stacking_input, ply_thickness,
+                                                 property_to_vary, values)
+        A_sweep, _, D_sweep = wait_for_sweep(sweep, f"Varying {ylabel}")
+        A11_vals, A22_vals, D11_vals = A_sweep[:, 0, 0], A_sweep[:, 1, 1], D_sweep[:, 0, 0]
 
         col1, col2 = st.columns(2)
 
@@ -676,6 +1002,78 @@ def visualize_parametric_analysis(material, stacking_input, ply_thickness):
             st.plotly_chart(fig2, use_container_width=True)
 
 
+# Point budget per stress trace before decimation kicks in
+STRESS_POINT_BUDGET = 20000
+
+
+def decimated_stress_field(lam, strains, curvatures, points_per_ply=2,
+                           max_points=STRESS_POINT_BUDGET):
+    """
+    Through-thickness stress field reduced to at most max_points samples
+
+    Stresses are linear within each ply, so the per-ply sampling is reduced
+    first (down to the bottom/top pair, which is lossless). If the ply count
+    alone exceeds the budget, whole plies are strided over, always keeping
+    both surfaces of each kept ply so interface jumps stay visible.
+
+    Returns:
+    --------
+    z, stress_global, stress_local : ndarray
+        As returned by Laminate.calculate_stress_field
+    """
+    n_plies = lam.n_plies
+    points_per_ply = max(2, min(points_per_ply, max_points // max(n_plies, 1)))
+
+    z, stress_global, stress_local = lam.calculate_stress_field(
+        strains, curvatures, points_per_ply
+    )
+
+    if len(z) > max_points:
+        stride = int(np.ceil(n_plies * points_per_ply / max_points))
+        kept_plies = np.arange(0, n_plies, stride)
+        idx = (kept_plies[:, None] * points_per_ply
+               + np.array([0, points_per_ply - 1])[None, :]).ravel()
+        z, stress_global, stress_local = z[idx], stress_global[idx], stress_local[idx]
+
+    return z, stress_global, stress_local
+
+
+def create_ply_boundary_trace(z_coords, stresses, max_lines=STRESS_POINT_BUDGET // 3):
+    """
+    Draw all ply boundaries as one segment trace
+
+    Parameters:
+    -----------
+    z_coords : ndarray
+        Ply interface z-coordinates
+    stresses : ndarray
+        Plotted stress values, used for the horizontal extent of the lines
+    max_lines : int
+        Boundaries are strided over above this count
+    """
+    z_coords = np.asarray(z_coords)
+    if len(z_coords) > max_lines:
+        z_coords = z_coords[::int(np.ceil(len(z_coords) / max_lines))]
+
+    x_min, x_max = float(np.min(stresses)), float(np.max(stresses))
+    if x_min == x_max:
+        x_min, x_max = x_min - 1, x_max + 1
+
+    n = len(z_coords)
+    x = np.tile(np.array([x_min, x_max, None], dtype=object), n)
+    y = np.column_stack([z_coords, z_coords, np.full(n, None)]).ravel()
+
+    return go.Scattergl(
+        x=x, y=y,
+        mode='lines',
+        line=dict(color='gray', dash='dash', width=1),
+        opacity=0.3,
+        name='Ply boundaries',
+        hoverinfo='skip',
+        showlegend=False
+    )
+
+
 def visualize_stress_strain(material, stacking_input, ply_thickness):
     """Visualize stress and strain distributions"""
     st.header("📈 Stress/Strain Distribution")
@@ -719,50 +1117,25 @@ def visualize_stress_strain(material, stacking_input, ply_thickness):
         # Calculate stresses through thickness
         st.subheader("Through-Thickness Distribution")
 
-        z_plot = []
-        sigma_x_plot = []
-        sigma_y_plot = []
-        tau_xy_plot = []
-        sigma_1_plot = []
-        sigma_2_plot = []
-
-        for i in range(lam.n_plies):
-            z_bottom = lam.z_coords[i]
-            z_top = lam.z_coords[i+1]
+        points_per_ply = st.number_input(
+            "Sample Points per Ply", value=2, min_value=2, max_value=200, step=1,
+            help="Stresses are linear within a ply; more points only add markers"
+        )
 
-            # Bottom
-            stress_global_bot, stress_local_bot = lam.calculate_ply_stresses(
-                strains, curvatures, i, 'bottom'
-            )
-            z_plot.append(z_bottom)
-            sigma_x_plot.append(stress_global_bot[0])
-            sigma_y_plot.append(stress_global_bot[1])
-            tau_xy_plot.append(stress_global_bot[2])
-            sigma_1_plot.append(stress_local_bot[0])
-            sigma_2_plot.append(stress_local_bot[1])
-
-            # Top
-            stress_global_top, stress_local_top = lam.calculate_ply_stresses(
-                strains, curvatures, i, 'top'
-            )
-            z_plot.append(z_top)
-            sigma_x_plot.append(stress_global_top[0])
-            sigma_y_plot.append(stress_global_top[1])
-            tau_xy_plot.append(stress_global_top[2])
-            sigma_1_plot.append(stress_local_top[0])
-            sigma_2_plot.append(stress_local_top[1])
+        z_plot, stress_global, stress_local = decimated_stress_field(
+            lam, strains, curvatures, int(points_per_ply)
+        )
 
         col1, col2 = st.columns(2)
 
         with col1:
             fig1 = go.Figure()
-            fig1.add_trace(go.Scatter(x=sigma_x_plot, y=z_plot, name='σₓ', mode='lines+markers'))
-            fig1.add_trace(go.Scatter(x=sigma_y_plot, y=z_plot, name='σᵧ', mode='lines+markers'))
-            fig1.add_trace(go.Scatter(x=tau_xy_plot, y=z_plot, name='τₓᵧ', mode='lines+markers'))
+            fig1.add_trace(go.Scattergl(x=stress_global[:, 0], y=z_plot, name='σₓ', mode='lines+markers'))
+            fig1.add_trace(go.Scattergl(x=stress_global[:, 1], y=z_plot, name='σᵧ', mode='lines+markers'))
+            fig1.add_trace(go.Scattergl(x=stress_global[:, 2], y=z_plot, name='τₓᵧ', mode='lines+markers'))
 
             # Add ply boundaries
-            for z in lam.z_coords:
-                fig1.add_hline(y=z, line_dash="dash", line_color="gray", opacity=0.3)
+            fig1.add_trace(create_ply_boundary_trace(lam.z_coords, stress_global))
 
             fig1.update_layout(
                 title="Global Stresses",
@@ -774,12 +1147,11 @@ def visualize_stress_strain(material, stacking_input, ply_thickness):
 
         with col2:
             fig2 = go.Figure()
-            fig2.add_trace(go.Scatter(x=sigma_1_plot, y=z_plot, name='σ₁', mode='lines+markers'))
-            fig2.add_trace(go.Scatter(x=sigma_2_plot, y=z_plot, name='σ₂', mode='lines+markers'))
+            fig2.add_trace(go.Scattergl(x=stress_local[:, 0], y=z_plot, name='σ₁', mode='lines+markers'))
+            fig2.add_trace(go.Scattergl(x=stress_local[:, 1], y=z_plot, name='σ₂', mode='lines+markers'))
 
             # Add ply boundaries
-            for z in lam.z_coords:
-                fig2.add_hline(y=z, line_dash="dash", line_color="gray", opacity=0.3)
+            fig2.add_trace(create_ply_boundary_trace(lam.z_coords, stress_local[:, :2]))
 
             fig2.update_layout(
                 title="Material Stresses",
@@ -789,6 +1161,10 @@ def visualize_stress_strain(material, stacking_input, ply_thickness):
             )
             st.plotly_chart(fig2, use_container_width=True)
 
+        if len(z_plot) < lam.n_plies * points_per_ply:
+            st.caption(f"Showing {len(z_plot)} of {lam.n_plies * int(points_per_ply)} "
+                       f"points (decimated above {STRESS_POINT_BUDGET})")
+
     except Exception as e:
         st.error(f"Error: {str(e)}")
 
@@ -0,0 +1,171 @@
+"""
+Background Precomputation for the Visualizer
+Evaluate slider sweeps in a worker pool so slider moves become lookups
+"""
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from composite_lib import Laminate
+
+
+# Stiffness matrices of one sweep point, attribute-compatible with Laminate
+StiffnessPoint = namedtuple('StiffnessPoint', ['A', 'B', 'D'])
+
+# Number of laminates evaluated per submitted task
+CHUNK_SIZE = 16
+
+# Number of finished or running sweeps kept in memory
+MAX_JOBS = 32
+
+
+def evaluate_laminates(cases):
+    """
+    Evaluate A, B, D for a list of laminates (runs in a worker process)
+
+    Parameters:
+    -----------
+    cases : list of tuple
+        (material_props, stacking_sequence, ply_thickness) per laminate
+
+    Returns:
+    --------
+    A, B, D : ndarray (n, 3, 3)
+        Stiffness matrices; NaN where the laminate could not be built
+    """
+    out = np.full((3, len(cases), 3, 3), np.nan)
+    for i, (material, sequence, ply_thickness) in enumerate(cases):
+        try:
+            if not isinstance(sequence, str):
+                sequence = list(sequence)
+            lam = Laminate(material, sequence, ply_thickness)
+        except Exception:
+            continue
+        out[0, i], out[1, i], out[2, i] = lam.A, lam.B, lam.D
+    return out[0], out[1], out[2]
+
+
+class SweepJob:
+    """
+    A sweep of laminates split into chunks running in the background
+
+    Results are assembled in submission order, so index i of the arrays
+    always corresponds to cases[i] regardless of completion order.
+    """
+
+    def __init__(self, executor, cases, chunk_size=CHUNK_SIZE):
+        self.n = len(cases)
+        self._futures = [
+            executor.submit(evaluate_laminates, cases[i:i + chunk_size])
+            for i in range(0, self.n, chunk_size)
+        ]
+        self._result = None
+
+    @property
+    def progress(self):
+        """Fraction of chunks finished (0.0 to 1.0)"""
+        if not self._futures:
+            return 1.0
+        return sum(f.done() for f in self._futures) / len(self._futures)
+
+    def done(self):
+        return all(f.done() for f in self._futures)
+
+    def cancel(self):
+        """Cancel the chunks that have not started running yet"""
+        for f in self._futures:
+            f.cancel()
+
+    def result(self, timeout=None):
+        """
+        Block until finished and return (A, B, D) arrays of shape (n, 3, 3)
+        """
+        if self._result is None:
+            parts = [f.result(timeout) for f in self._futures]
+            if parts:
+                self._result = tuple(np.concatenate([p[k] for p in parts])
+                                     for k in range(3))
+            else:
+                self._result = tuple(np.empty((0, 3, 3)) for _ in range(3))
+        return self._result
+
+    def point(self, i):
+        """Stiffness matrices of sweep point i (requires done())"""
+        A, B, D = self.result()
+        return StiffnessPoint(A[i], B[i], D[i])
+
+
+class SweepPrecomputer:
+    """
+    Worker pool plus a bounded registry of sweeps keyed by their inputs
+
+    A sweep is submitted at most once per key; later requests for the same
+    key return the running or finished job.
+    """
+
+    def __init__(self, max_workers=None, max_jobs=MAX_JOBS):
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key, cases):
+        """Return the SweepJob for key, starting it if necessary"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                job = SweepJob(self.executor, cases)
+                self._jobs[key] = job
+                while len(self._jobs) > self.max_jobs:
+                    _, evicted = self._jobs.popitem(last=False)
+                    evicted.cancel()
+            else:
+                self._jobs.move_to_end(key)
+            return job
+
+    def rotation_sweep(self, material, sequence, ply_thickness, rotations,
+                       wrap=False):
+        """
+        Sweep of global laminate rotations
+
+        Parameters:
+        -----------
+        rotations : array_like
+            Rotation angles (degrees) added to every ply
+        wrap : bool
+            Map rotated angles into (-180, 180] as the quasi-isotropic study does
+        """
+        sequence = tuple(float(a) for a in sequence)
+        rotations = tuple(float(r) for r in rotations)
+        cases = []
+        for rot in rotations:
+            rotated = [a + rot for a in sequence]
+            if wrap:
+                rotated = [a % 360 for a in rotated]
+                rotated = [a if a <= 180 else a - 360 for a in rotated]
+            cases.append((material, tuple(rotated), ply_thickness))
+        key = ('rotation', _material_key(material), sequence, ply_thickness,
+               rotations, wrap)
+        return self.submit(key, cases)
+
+    def material_sweep(self, material, stacking_input, ply_thickness, prop, values):
+        """Sweep of one material property over the given values"""
+        values = tuple(float(v) for v in values)
+        cases = []
+        for val in values:
+            mat = dict(material)
+            mat[prop] = val
+            cases.append((mat, stacking_input, ply_thickness))
+        key = ('material', _material_key(material), stacking_input,
+               ply_thickness, prop, values)
+        return self.submit(key, cases)
+
+
+def _material_key(material):
+    return tuple(sorted((k, float(v)) for k, v in material.items()))